@@ -0,0 +1,83 @@
+import argparse
+import sys
+
+from core.batch import BatchProcessor
+from core.cache import ResultCache
+from core.profiling import Profiler
+
+def _print_progress(report: dict):
+    done = report["processed"] + report["skipped"] + report["failed"]
+    sys.stdout.write(f"\r{done} image(s) | {report['images_per_s']:.1f} img/s | "
+                     f"{report['mb_in_per_s']:.1f} Mo/s lus | {report['mb_out_per_s']:.1f} Mo/s écrits")
+    sys.stdout.flush()
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Traitement par lots VisionCore (sans interface graphique).",
+        epilog="Exemple : python batch.py photos/ -o sortie/ -p filter_median:size=5 -p threshold_otsu --format png")
+    parser.add_argument("inputs", nargs="+", help="Fichiers, dossiers ou motifs glob ('photos/*.jpg').")
+    parser.add_argument("-o", "--output", required=True, help="Dossier de sortie.")
+    parser.add_argument("-p", "--op", action="append", default=[], dest="operations",
+                        help="Opération 'nom:arg,cle=valeur' d'ImageProcessor (répétable, appliquées dans l'ordre).")
+    parser.add_argument("-f", "--format", default=None, help="Extension de sortie (png, jpg...). Par défaut : celle de l'entrée.")
+    parser.add_argument("--color", action="store_true", help="Conserve la couleur (RGB) au lieu des niveaux de gris.")
+    parser.add_argument("--frames", action="store_true",
+                        help="Traite chaque TIFF / GIF multi-trames comme une pile (un appel par opération).")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Parcourt les sous-dossiers.")
+    parser.add_argument("--decoders", type=int, default=2, help="Threads de décodage.")
+    parser.add_argument("--workers", type=int, default=None, help="Threads de calcul (défaut : tous les cœurs).")
+    parser.add_argument("--encoders", type=int, default=2, help="Threads d'encodage.")
+    parser.add_argument("--queue", type=int, default=BatchProcessor.DEFAULT_QUEUE_SIZE,
+                        help="Capacité des files entre étages (borne la mémoire).")
+    parser.add_argument("--overwrite", action="store_true", help="Retraite les images dont la sortie existe déjà.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Dossier du cache de résultats (.npy) partagé entre les relances.")
+    parser.add_argument("--cache-mb", type=int, default=256, help="Taille du cache en mémoire (Mo).")
+    parser.add_argument("--profile", default=None,
+                        help="Exporte le profil des opérations (.json, ou format Prometheus si .prom).")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Pas d'affichage de progression.")
+    args = parser.parse_args(argv)
+
+    try:
+        operations = [BatchProcessor.parse_operation(spec) for spec in args.operations]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.profile:
+        Profiler.enable()
+
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(max_bytes=args.cache_mb * 1024 * 1024, directory=args.cache_dir)
+
+    report = BatchProcessor.run(args.inputs, operations, args.output, extension=args.format,
+                                recursive=args.recursive, decoders=args.decoders, workers=args.workers,
+                                encoders=args.encoders, queue_size=args.queue, overwrite=args.overwrite,
+                                progress=None if args.quiet else _print_progress, cache=cache,
+                                mode="RGB" if args.color else "L", frames=args.frames)
+
+    if not args.quiet:
+        print()
+    for path, message in report["errors"]:
+        print(f"Échec : {path} : {message}", file=sys.stderr)
+    print(f"{report['processed']} traitée(s), {report['skipped']} déjà faite(s), {report['failed']} échec(s) "
+          f"en {report['elapsed']:.2f} s : {report['images_per_s']:.1f} images/s, "
+          f"{report['mb_in_per_s']:.1f} Mo/s lus, {report['mb_out_per_s']:.1f} Mo/s écrits")
+    if "cache" in report:
+        stats = report["cache"]
+        print(f"Cache : {stats['hits']} succès ({stats['disk_hits']} sur disque), {stats['misses']} échecs, "
+              f"{stats['evictions']} évictions")
+    if args.profile:
+        if args.profile.endswith(".prom"):
+            with open(args.profile, "w") as f:
+                f.write(Profiler.to_prometheus())
+        else:
+            Profiler.to_json(args.profile)
+        print(f"Profil enregistré : {args.profile}")
+    if report.get("interrupted"):
+        print("Interrompu : relancer la même commande pour reprendre.")
+        return 130
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
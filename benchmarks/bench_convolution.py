@@ -0,0 +1,55 @@
+import time
+import numpy as np
+
+from core.processor import ImageProcessor
+from benchmarks.reference import ReferenceProcessor
+
+# Tailles d'image testées (mégapixels) : côté carré arrondi
+SIZES_MP = [1, 4, 16]
+
+# La boucle d'origine est trop lente en pleine résolution :
+# on la mesure sur une fenêtre réduite et on extrapole au nombre de pixels.
+REFERENCE_CROP = 128
+
+GAUSSIAN_3X3 = np.array([[1, 2, 1],
+                         [2, 4, 2],
+                         [1, 2, 1]], dtype=np.float32) / 16.0
+
+def _timeit(func, *args, repeat: int = 3, **kwargs) -> float:
+    """Meilleur temps (secondes) sur plusieurs exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmark():
+    print("--- Benchmark du moteur de convolution ---")
+    rng = np.random.default_rng(0)
+
+    # 1. Coût par pixel de la boucle d'origine
+    crop = rng.integers(0, 256, (REFERENCE_CROP, REFERENCE_CROP), dtype=np.uint8)
+    ref_time = _timeit(ReferenceProcessor.apply_filter, crop, GAUSSIAN_3X3, repeat=1)
+    ref_per_pixel = ref_time / crop.size
+
+    # 2. Vérification de la justesse (zero-padding identique à l'ancienne version)
+    same = np.array_equal(ReferenceProcessor.apply_filter(crop, GAUSSIAN_3X3),
+                          ImageProcessor.apply_filter(crop, GAUSSIAN_3X3))
+    print(f"Sortie identique à la référence : {same}")
+
+    # 3. Mesures sur des images de 1, 4 et 16 MP
+    large_kernel = np.ones((21, 21), dtype=np.float32) / 441.0
+    print(f"{'Taille':>8} | {'Réf. (estimée)':>14} | {'3x3 direct':>10} | {'Gain':>8} | {'21x21 FFT':>10}")
+    for mp in SIZES_MP:
+        side = int(np.sqrt(mp * 1_000_000))
+        image = rng.integers(0, 256, (side, side), dtype=np.uint8)
+
+        ref_estimate = ref_per_pixel * image.size
+        t_small = _timeit(ImageProcessor.apply_filter, image, GAUSSIAN_3X3)
+        t_large = _timeit(ImageProcessor.apply_filter, image, large_kernel, repeat=1)
+
+        print(f"{mp:>6}MP | {ref_estimate:>13.1f}s | {t_small:>9.3f}s | {ref_estimate / t_small:>7.0f}x | {t_large:>9.3f}s")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,56 @@
+import os
+import time
+import numpy as np
+
+from core.parallel import ParallelExecutor
+from core.processor import ImageProcessor
+
+# Image de test (mégapixels) et opérations de voisinage mesurées
+SIZE_MP = 16
+
+OPERATIONS = [
+    ("filter_median", (7,), {}),
+    ("blur_gaussian", (5.0,), {}),
+    ("morpho_operation", ("opening", 15), {}),
+    ("detect_edges_sobel", (), {"mode": "l2"}),
+]
+
+def _worker_counts() -> list:
+    """1, 2, 4, ... jusqu'au nombre de cœurs (inclus)."""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def run_benchmark():
+    print("--- Benchmark de la mise à l'échelle multi-cœurs ---")
+    side = int(np.sqrt(SIZE_MP * 1_000_000))
+    image = np.random.default_rng(0).integers(0, 256, (side, side), dtype=np.uint8)
+    counts = _worker_counts()
+    print(f"Image {side}x{side}, cœurs disponibles : {os.cpu_count()}")
+
+    for backend in ParallelExecutor.BACKENDS:
+        print(f"\nBackend '{backend}'")
+        print(f"{'Opération':<20} | " + " | ".join(f"{w:>2} worker(s)" for w in counts))
+        for name, args, kwargs in OPERATIONS:
+            method = getattr(ImageProcessor, name)
+            reference, timings = None, []
+            for workers in counts:
+                start = time.perf_counter()
+                result = method(image, *args, workers=workers, backend=backend, **kwargs)
+                timings.append(time.perf_counter() - start)
+
+                # Déterminisme : même sortie quel que soit le nombre de workers
+                if reference is None:
+                    reference = result
+                elif not np.array_equal(reference, result):
+                    raise AssertionError(f"{name} : résultat différent avec {workers} workers")
+
+            cells = [f"{t:>6.2f}s x{timings[0] / t:>4.1f}" for t in timings]
+            print(f"{name:<20} | " + " | ".join(cells))
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import time
+
+import numpy as np
+
+from core.image_loader import ImageLoader
+from core.pipeline import Pipeline
+from core.service import ProcessingService
+
+# Requêtes concurrentes (connexions persistantes) et requêtes envoyées par connexion
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 16
+
+# Petites images (cas d'usage des micro-lots) et chaîne d'opérations appliquée
+SIDE = 128
+QUERY = "op=blur_gaussian:sigma=1.5&op=detect_edges_sobel&format=png"
+OPERATIONS = [("blur_gaussian", (), {"sigma": 1.5}), ("detect_edges_sobel", (), {})]
+
+async def _request(reader, writer, body: bytes) -> tuple:
+    """Envoie un POST /process sur une connexion persistante : (code HTTP, en-têtes, corps)."""
+    writer.write(f"POST /process?{QUERY} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    payload = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, payload
+
+async def _client(port: int, bodies: list, latencies: list, statuses: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            status, headers, _ = await _request(reader, writer, body)
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+            if headers.get("connection") == "close":
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    finally:
+        writer.close()
+
+async def _load_test(max_batch: int, bodies: list) -> dict:
+    service = ProcessingService(port=0, max_batch=max_batch, queue_size=CLIENTS * 2)
+    await service.start()
+    try:
+        # Contrôle : la réponse du service est celle d'un traitement local isolé
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        _, _, payload = await _request(reader, writer, bodies[0])
+        writer.close()
+        pipeline = Pipeline(ImageLoader.decode(bodies[0]))
+        for name, args, kwargs in OPERATIONS:
+            pipeline.apply(name, *args, **kwargs)
+        assert np.array_equal(ImageLoader.decode(payload), pipeline.compute()), "Résultat du service incorrect"
+
+        latencies, statuses = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(service.port, bodies[i::CLIENTS][:REQUESTS_PER_CLIENT], latencies, statuses)
+                               for i in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+        metrics = service.metrics()
+    finally:
+        await service.stop()
+    p50, p99 = np.percentile(latencies, (50, 99))
+    return {"rps": len(latencies) / elapsed, "p50": p50, "p99": p99, "batch": metrics["mean_batch_size"],
+            "rejected": statuses.count(503)}
+
+def run_benchmark():
+    print("--- Test de charge du service HTTP local ---")
+    rng = np.random.default_rng(0)
+    bodies = []
+    for _ in range(CLIENTS * REQUESTS_PER_CLIENT):
+        buffer = io.BytesIO()
+        ImageLoader.encode(rng.integers(0, 256, (SIDE, SIDE), dtype=np.uint8), buffer, "PNG", compress_level=1)
+        bodies.append(buffer.getvalue())
+    print(f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requêtes, images {SIDE}x{SIDE}, {QUERY}")
+    print(f"{'Micro-lots':<12} | {'req/s':>8} | {'p50':>9} | {'p99':>9} | {'lot moyen':>9} | {'503':>4}")
+    for max_batch in (1, ProcessingService.DEFAULT_MAX_BATCH):
+        r = asyncio.run(_load_test(max_batch, bodies))
+        print(f"{'max ' + str(max_batch):<12} | {r['rps']:>8.1f} | {r['p50'] * 1e3:>6.1f} ms | {r['p99'] * 1e3:>6.1f} ms | "
+              f"{r['batch']:>9.2f} | {r['rejected']:>4}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,241 @@
+import collections
+import itertools
+
+import numpy as np
+
+class ReferenceProcessor:
+    """
+    Implémentations d'origine (boucles Python pixel par pixel).
+    Conservées uniquement comme référence de justesse et de vitesse pour les benchmarks.
+    """
+
+    @staticmethod
+    def apply_filter(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+        """Convolution 2D d'origine, avec zero-padding."""
+        k_h, k_w = kernel.shape
+        pad_h, pad_w = k_h // 2, k_w // 2
+        padded_img = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='constant')
+        output = np.zeros_like(image, dtype=np.float32)
+
+        for i in range(image.shape[0]):
+            for j in range(image.shape[1]):
+                region = padded_img[i:i+k_h, j:j+k_w]
+                output[i, j] = np.sum(region * kernel)
+
+        return np.clip(output, 0, 255).astype(np.uint8)
+
+
+    @staticmethod
+    def filter_median(image: np.ndarray, size: int = 3) -> np.ndarray:
+        """Filtre médian d'origine, avec bords répliqués."""
+        pad = size // 2
+        padded = np.pad(image, pad, mode='edge')
+        output = np.zeros_like(image)
+
+        for i in range(image.shape[0]):
+            for j in range(image.shape[1]):
+                window = padded[i:i+size, j:j+size]
+                output[i, j] = np.median(window)
+        return output
+
+
+    @staticmethod
+    def morpho_operation(image: np.ndarray, op_type: str = "erosion") -> np.ndarray:
+        """Érosion / dilatation 3x3 d'origine, avec bords à zéro."""
+        size = 3
+        pad = size // 2
+        padded = np.pad(image, pad, mode='constant', constant_values=0)
+        output = np.zeros_like(image)
+
+        for i in range(image.shape[0]):
+            for j in range(image.shape[1]):
+                window = padded[i:i+size, j:j+size]
+                if op_type == "erosion":
+                    output[i, j] = np.min(window)
+                else:
+                    output[i, j] = np.max(window)
+        return output
+
+
+    @staticmethod
+    def correlate(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+        """Corrélation 2D en float32 non tronquée (boucle d'origine sans le clip final)."""
+        k_h, k_w = kernel.shape
+        pad_h, pad_w = k_h // 2, k_w // 2
+        padded_img = np.pad(image.astype(np.float32), ((pad_h, pad_h), (pad_w, pad_w)), mode='constant')
+        output = np.zeros(image.shape, dtype=np.float32)
+
+        for i in range(image.shape[0]):
+            for j in range(image.shape[1]):
+                output[i, j] = np.sum(padded_img[i:i+k_h, j:j+k_w] * kernel)
+        return output
+
+
+    @staticmethod
+    def get_stats(image: np.ndarray) -> dict:
+        """Statistiques d'origine (une réduction NumPy par valeur)."""
+        return {
+            "dimensions": image.shape,
+            "pixels_total": image.size,
+            "min_val": np.min(image),
+            "max_val": np.max(image),
+            "moyenne_luminance": float(np.mean(image)),
+            "std_dev": float(np.std(image))
+        }
+
+
+    @staticmethod
+    def get_histogram(image: np.ndarray) -> np.ndarray:
+        """Histogramme d'origine (np.histogram)."""
+        counts, _ = np.histogram(image, bins=256, range=(0, 256))
+        return counts
+
+
+    @staticmethod
+    def apply_gamma(image: np.ndarray, gamma: float) -> np.ndarray:
+        """Correction gamma d'origine (table construite en compréhension de liste)."""
+        inv_gamma = 1.0 / gamma
+        table = np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8")
+        return np.take(table, image)
+
+
+    @staticmethod
+    def stretch_contrast(image: np.ndarray) -> np.ndarray:
+        """
+        Étirement d'origine, calculé en flottants : la version d'origine multipliait
+        des uint8 par 255 et débordait (seul écart volontaire avec l'historique).
+        """
+        i_min = int(np.min(image))
+        i_max = int(np.max(image))
+        if i_max == i_min: return image
+        return (255.0 * (image.astype(np.float64) - i_min) / (i_max - i_min)).astype(np.uint8)
+
+
+    @staticmethod
+    def equalize_histogram(image: np.ndarray) -> np.ndarray:
+        """Égalisation d'origine (CDF masquée)."""
+        hist, _ = np.histogram(image.flatten(), 256, [0, 256])
+        cdf = hist.cumsum()
+        cdf_m = np.ma.masked_equal(cdf, 0)
+        cdf_m = (cdf_m - cdf_m.min()) * 255 / (cdf_m.max() - cdf_m.min())
+        cdf = np.ma.filled(cdf_m, 0).astype('uint8')
+        return cdf[image]
+
+
+    @staticmethod
+    def threshold_otsu(image: np.ndarray) -> np.ndarray:
+        """Seuillage d'Otsu d'origine (recherche du seuil par boucle sur 256 niveaux)."""
+        hist = ReferenceProcessor.get_histogram(image)
+        total = image.size
+
+        current_max = 0
+        threshold = 0
+        sum_total = np.dot(np.arange(256), hist)
+        sum_back, weight_back = 0, 0
+
+        for t in range(256):
+            weight_back += hist[t]
+            if weight_back == 0: continue
+            weight_fore = total - weight_back
+            if weight_fore == 0: break
+            sum_back += t * hist[t]
+            mean_back = sum_back / weight_back
+            mean_fore = (sum_total - sum_back) / weight_fore
+            var_between = weight_back * weight_fore * (mean_back - mean_fore)**2
+            if var_between > current_max:
+                current_max = var_between
+                threshold = t
+
+        return (image > threshold).astype(np.uint8) * 255
+
+
+    @staticmethod
+    def threshold_multiotsu(image: np.ndarray, classes: int = 3) -> np.ndarray:
+        """Otsu multi-niveaux par recherche exhaustive de toutes les combinaisons de seuils."""
+        hist = ReferenceProcessor.get_histogram(image).astype(np.float64)
+        levels = np.arange(256)
+        mean_total = np.dot(levels, hist) / hist.sum()
+
+        best, best_thresholds = -1.0, None
+        for thresholds in itertools.combinations(range(255), classes - 1):
+            bounds = (-1,) + thresholds + (255,)
+            variance = 0.0
+            for low, high in zip(bounds[:-1], bounds[1:]):
+                weight = hist[low + 1:high + 1].sum()
+                if weight == 0:
+                    break
+                mean = np.dot(levels[low + 1:high + 1], hist[low + 1:high + 1]) / weight
+                variance += weight * (mean - mean_total) ** 2
+            else:
+                if variance > best:
+                    best, best_thresholds = variance, thresholds
+
+        output = np.zeros_like(image)
+        for index, threshold in enumerate(best_thresholds):
+            output[image > threshold] = (index + 1) * 255 // (classes - 1)
+        return output
+
+
+    @staticmethod
+    def threshold_adaptive(image: np.ndarray, method: str = "sauvola", size: int = 15, k: float = None,
+                           c: float = 5.0, r: float = 128.0) -> np.ndarray:
+        """Seuillage local : moyenne et écart-type recalculés sur chaque fenêtre (tronquée aux bords)."""
+        if k is None:
+            k = -0.2 if method == "niblack" else 0.2
+        radius = size // 2
+        output = np.zeros_like(image)
+        for i in range(image.shape[0]):
+            for j in range(image.shape[1]):
+                window = image[max(0, i - radius):i + radius + 1, max(0, j - radius):j + radius + 1].astype(np.float64)
+                mean, std = window.mean(), window.std()
+                if method == "mean":
+                    threshold = mean - c
+                elif method == "niblack":
+                    threshold = mean + k * std
+                else:
+                    threshold = mean * (1 + k * (std / r - 1))
+                output[i, j] = 255 if image[i, j] > threshold else 0
+        return output
+
+
+    @staticmethod
+    def label_components(image: np.ndarray, connectivity: int = 8) -> np.ndarray:
+        """Étiquetage par parcours en largeur depuis chaque pixel non visité (ordre de balayage)."""
+        if connectivity == 8:
+            neighbors = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+        else:
+            neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        h, w = image.shape
+        labels = np.zeros((h, w), dtype=np.int32)
+        current = 0
+        for i in range(h):
+            for j in range(w):
+                if image[i, j] == 0 or labels[i, j]:
+                    continue
+                current += 1
+                labels[i, j] = current
+                queue = collections.deque([(i, j)])
+                while queue:
+                    y, x = queue.popleft()
+                    for dy, dx in neighbors:
+                        ny, nx = y + dy, x + dx
+                        if 0 <= ny < h and 0 <= nx < w and image[ny, nx] and not labels[ny, nx]:
+                            labels[ny, nx] = current
+                            queue.append((ny, nx))
+        return labels
+
+
+    @staticmethod
+    def region_stats(image: np.ndarray, intensity: np.ndarray, connectivity: int = 8) -> dict:
+        """Mesures par région relues pixel par pixel dans l'image des étiquettes de référence."""
+        labels = ReferenceProcessor.label_components(image, connectivity)
+        count = int(labels.max())
+        area, bbox, centroid, mean_intensity = [], [], [], []
+        for label in range(1, count + 1):
+            ys, xs = np.nonzero(labels == label)
+            area.append(ys.size)
+            bbox.append((ys.min(), xs.min(), ys.max() + 1, xs.max() + 1))
+            centroid.append((ys.mean(), xs.mean()))
+            mean_intensity.append(intensity[ys, xs].mean())
+        return {"count": count, "area": np.array(area), "bbox": np.array(bbox).reshape(-1, 4),
+                "centroid": np.array(centroid).reshape(-1, 2), "mean_intensity": np.array(mean_intensity)}
@@ -0,0 +1,411 @@
+import argparse
+import inspect
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.batch import BatchProcessor
+from core.image_loader import ImageLoader
+from core.layout import ImageLayout
+from core.pipeline import Pipeline
+from core.processor import ImageProcessor
+from benchmarks.reference import ReferenceProcessor
+from benchmarks.synthetic import SyntheticImages
+
+# Côtés des images carrées mesurées (256² à 8k²)
+SIZES = [256, 512, 1024, 2048, 4096, 8192]
+
+# Une mesure est répétée jusqu'à MIN_TIME secondes cumulées (au plus MAX_REPEAT fois)
+MIN_TIME = 0.2
+MAX_REPEAT = 20
+
+# Seuil par défaut du mode comparaison : +10 % de temps = régression
+REGRESSION_THRESHOLD = 0.10
+
+GAUSSIAN_3X3 = np.array([[1, 2, 1],
+                         [2, 4, 2],
+                         [1, 2, 1]], dtype=np.float32) / 16.0
+SOBEL_X = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float32)
+SOBEL_Y = SOBEL_X.T.copy()
+BOX_21 = np.ones((21, 21), dtype=np.float32) / 441.0
+
+# Cas mesurés : (libellé, méthode d'ImageProcessor, type d'image, args, kwargs)
+CASES = [
+    ("get_stats", "get_stats", "noise", (), {}),
+    ("get_histogram", "get_histogram", "noise", (), {}),
+    ("inverse", "inverse", "noise", (), {}),
+    ("apply_gamma", "apply_gamma", "noise", (0.5,), {}),
+    ("stretch_contrast", "stretch_contrast", "gradient", (), {}),
+    ("equalize_histogram", "equalize_histogram", "gradient", (), {}),
+    ("threshold", "threshold", "noise", (127,), {}),
+    ("threshold_otsu", "threshold_otsu", "gradient", (), {}),
+    ("threshold_multiotsu[4]", "threshold_multiotsu", "gradient", (4,), {}),
+    ("threshold_adaptive[sauvola 15]", "threshold_adaptive", "gradient", ("sauvola", 15), {}),
+    ("threshold_adaptive[mean 101]", "threshold_adaptive", "gradient", ("mean", 101), {}),
+    ("apply_filter[3x3]", "apply_filter", "noise", (GAUSSIAN_3X3,), {}),
+    ("apply_filter[21x21]", "apply_filter", "noise", (BOX_21,), {}),
+    ("apply_separable_filter[1x9]", "apply_separable_filter", "noise", (np.full(9, 1 / 9), np.full(9, 1 / 9)), {}),
+    ("blur_gaussian", "blur_gaussian", "noise", (), {}),
+    ("blur_gaussian[sigma=3]", "blur_gaussian", "noise", (3.0,), {}),
+    ("filter_mean[15]", "filter_mean", "noise", (15,), {}),
+    ("detect_edges_sobel[l1]", "detect_edges_sobel", "noise", (), {}),
+    ("detect_edges_sobel[nms]", "detect_edges_sobel", "noise", (), {"mode": "nms"}),
+    ("filter_median[3]", "filter_median", "salt_pepper", (3,), {}),
+    ("filter_median[15]", "filter_median", "salt_pepper", (15,), {}),
+    ("morpho_operation[erosion 3]", "morpho_operation", "binary", ("erosion", 3), {}),
+    ("morpho_operation[opening 15]", "morpho_operation", "binary", ("opening", 15), {}),
+    ("morpho_operation[gradient 7 gris]", "morpho_operation", "noise", ("gradient", 7), {}),
+    ("label_components[8]", "label_components", "binary", (), {}),
+    ("label_components[4]", "label_components", "binary", (4,), {}),
+    ("region_stats", "region_stats", "binary", (), {}),
+    ("remove_small_components[64]", "remove_small_components", "binary", (64,), {}),
+    # Lots : 16 trames (side / 4)² ou une image RGB, traitées en un seul appel
+    ("equalize_histogram[pile]", "equalize_histogram", "frames", (), {}),
+    ("apply_filter[3x3 pile]", "apply_filter", "frames", (GAUSSIAN_3X3,), {}),
+    ("apply_filter[21x21 pile]", "apply_filter", "frames", (BOX_21,), {}),
+    ("blur_gaussian[sigma=3 couleur]", "blur_gaussian", "color", (3.0,), {}),
+    ("detect_edges_sobel[l1 couleur]", "detect_edges_sobel", "color", (), {}),
+    ("filter_median[3 pile]", "filter_median", "frames", (3,), {}),
+    ("filter_median[15 pile]", "filter_median", "frames", (15,), {}),
+    ("threshold_adaptive[sauvola 15 pile]", "threshold_adaptive", "frames", ("sauvola", 15), {}),
+    ("morpho_operation[gradient 7 couleur]", "morpho_operation", "color", ("gradient", 7), {}),
+]
+
+def _per_plane(func):
+    """Référence d'un lot : func appliquée plan par plan (trame, canal), puis réempilée."""
+    def apply(images: np.ndarray) -> np.ndarray:
+        planes = ImageLayout.planes(images)
+        flat = planes.reshape((-1,) + planes.shape[-2:])
+        results = np.stack([func(plane) for plane in flat]).reshape(planes.shape)
+        return ImageLayout.restore(results, images)
+    return apply
+
+# Côté des images des contrôles de justesse (les références bouclent pixel par pixel)
+CHECK_SIDE = 96
+
+# Contrôles : (libellé, type d'image, optimisé(img), référence(img), tolérance en niveaux)
+CHECKS = [
+    ("get_histogram", "noise", ImageProcessor.get_histogram, ReferenceProcessor.get_histogram, 0),
+    ("inverse", "noise", ImageProcessor.inverse, lambda img: 255 - img, 0),
+    ("apply_gamma[0.5]", "noise", lambda img: ImageProcessor.apply_gamma(img, 0.5),
+     lambda img: ReferenceProcessor.apply_gamma(img, 0.5), 0),
+    ("apply_gamma[2.2]", "gradient", lambda img: ImageProcessor.apply_gamma(img, 2.2),
+     lambda img: ReferenceProcessor.apply_gamma(img, 2.2), 0),
+    ("stretch_contrast", "gradient", ImageProcessor.stretch_contrast, ReferenceProcessor.stretch_contrast, 0),
+    ("equalize_histogram", "gradient", ImageProcessor.equalize_histogram, ReferenceProcessor.equalize_histogram, 0),
+    ("threshold_otsu", "gradient", ImageProcessor.threshold_otsu, ReferenceProcessor.threshold_otsu, 0),
+    ("threshold_otsu[bruit]", "noise", ImageProcessor.threshold_otsu, ReferenceProcessor.threshold_otsu, 0),
+    # Images non uint8 (gradient float32, uint16) : hors du chemin LUT, mêmes résultats que la référence
+    # La référence tronque min et max à l'entier : au plus un niveau d'écart
+    ("stretch_contrast[float32]", "gradient", lambda img: ImageProcessor.stretch_contrast(img * np.float32(0.8)),
+     lambda img: ReferenceProcessor.stretch_contrast(img * np.float32(0.8)), 1),
+    ("stretch_contrast[uint16]", "gradient", lambda img: ImageProcessor.stretch_contrast(img.astype(np.uint16) * 64),
+     lambda img: ReferenceProcessor.stretch_contrast(img.astype(np.uint16) * 64), 0),
+    ("equalize_histogram[float32]", "gradient", lambda img: ImageProcessor.equalize_histogram(img + np.float32(0.5)),
+     ReferenceProcessor.equalize_histogram, 0),
+    ("equalize_histogram[uint16]", "gradient", lambda img: ImageProcessor.equalize_histogram(img.astype(np.uint16)),
+     lambda img: ReferenceProcessor.equalize_histogram(img.astype(np.uint16)), 0),
+    ("threshold_otsu[float32]", "noise", lambda img: ImageProcessor.threshold_otsu(img + np.float32(0.5)),
+     lambda img: ReferenceProcessor.threshold_otsu(img + np.float32(0.5)), 0),
+    ("threshold_otsu[uint16]", "gradient", lambda img: ImageProcessor.threshold_otsu(img.astype(np.uint16) * 4),
+     lambda img: ReferenceProcessor.threshold_otsu(img.astype(np.uint16) * 4), 0),
+    ("threshold_multiotsu[3]", "gradient", ImageProcessor.threshold_multiotsu, ReferenceProcessor.threshold_multiotsu, 0),
+    ("threshold_multiotsu[3 float32]", "gradient",
+     lambda img: ImageProcessor.threshold_multiotsu(img + np.float32(0.5)),
+     lambda img: ReferenceProcessor.threshold_multiotsu(img + np.float32(0.5)), 0),
+    ("threshold_multiotsu[3 uint16]", "gradient",
+     lambda img: ImageProcessor.threshold_multiotsu(img.astype(np.uint16) * 2),
+     lambda img: ReferenceProcessor.threshold_multiotsu(img.astype(np.uint16) * 2), 0),
+    ("threshold_adaptive[mean]", "gradient", lambda img: ImageProcessor.threshold_adaptive(img, "mean", 7),
+     lambda img: ReferenceProcessor.threshold_adaptive(img, "mean", 7), 0),
+    ("threshold_adaptive[niblack]", "noise", lambda img: ImageProcessor.threshold_adaptive(img, "niblack", 9),
+     lambda img: ReferenceProcessor.threshold_adaptive(img, "niblack", 9), 0),
+    ("threshold_adaptive[sauvola]", "gradient", lambda img: ImageProcessor.threshold_adaptive(img, "sauvola", 15),
+     lambda img: ReferenceProcessor.threshold_adaptive(img, "sauvola", 15), 0),
+    ("apply_filter[3x3]", "noise", lambda img: ImageProcessor.apply_filter(img, GAUSSIAN_3X3),
+     lambda img: ReferenceProcessor.apply_filter(img, GAUSSIAN_3X3), 0),
+    # Noyaux non dyadiques : le chemin direct somme dans l'ordre de l'ancienne boucle (aucun écart)
+    ("apply_filter[3x3 moyenne]", "noise", lambda img: ImageProcessor.apply_filter(img, np.full((3, 3), 1 / 9)),
+     lambda img: ReferenceProcessor.apply_filter(img, np.full((3, 3), 1 / 9)), 0),
+    ("apply_filter[7x7 moyenne]", "noise",
+     lambda img: ImageProcessor.apply_filter(img, np.full((7, 7), 1 / 49, dtype=np.float32)),
+     lambda img: ReferenceProcessor.apply_filter(img, np.full((7, 7), 1 / 49, dtype=np.float32)), 0),
+    # FFT : arrondi flottant différent, au plus un niveau d'écart sur un pixel limite
+    ("apply_filter[21x21 fft]", "noise", lambda img: ImageProcessor.apply_filter(img, BOX_21, method="fft"),
+     lambda img: ReferenceProcessor.apply_filter(img, BOX_21), 1),
+    ("apply_separable_filter[1x9]", "noise",
+     lambda img: ImageProcessor.apply_separable_filter(img, np.full(9, 1 / 9), np.full(9, 1 / 9)),
+     lambda img: ReferenceProcessor.apply_filter(img, np.full((9, 9), 1 / 81, dtype=np.float32)), 1),
+    ("blur_gaussian", "noise", ImageProcessor.blur_gaussian,
+     lambda img: ReferenceProcessor.apply_filter(img, GAUSSIAN_3X3), 0),
+    ("filter_mean[5]", "noise", lambda img: ImageProcessor.filter_mean(img, 5),
+     lambda img: ReferenceProcessor.apply_filter(img, np.full((5, 5), 1 / 25, dtype=np.float32)), 1),
+    ("detect_edges_sobel[l1]", "noise", ImageProcessor.detect_edges_sobel,
+     lambda img: np.clip(np.abs(ReferenceProcessor.correlate(img, SOBEL_X))
+                         + np.abs(ReferenceProcessor.correlate(img, SOBEL_Y)), 0, 255).astype(np.uint8), 0),
+    ("filter_median[3]", "salt_pepper", lambda img: ImageProcessor.filter_median(img, 3),
+     lambda img: ReferenceProcessor.filter_median(img, 3), 0),
+    ("filter_median[7]", "noise", lambda img: ImageProcessor.filter_median(img, 7),
+     lambda img: ReferenceProcessor.filter_median(img, 7), 0),
+    ("filter_median[11 histogramme]", "noise", lambda img: ImageProcessor.filter_median(img, 11),
+     lambda img: ReferenceProcessor.filter_median(img, 11), 0),
+    ("morpho_operation[erosion binaire]", "binary", lambda img: ImageProcessor.morpho_operation(img, "erosion"),
+     lambda img: ReferenceProcessor.morpho_operation(img, "erosion"), 0),
+    ("morpho_operation[dilatation binaire]", "binary", lambda img: ImageProcessor.morpho_operation(img, "dilatation"),
+     lambda img: ReferenceProcessor.morpho_operation(img, "dilatation"), 0),
+    ("morpho_operation[erosion gris]", "noise", lambda img: ImageProcessor.morpho_operation(img, "erosion"),
+     lambda img: ReferenceProcessor.morpho_operation(img, "erosion"), 0),
+    ("morpho_operation[dilatation gris]", "noise", lambda img: ImageProcessor.morpho_operation(img, "dilatation"),
+     lambda img: ReferenceProcessor.morpho_operation(img, "dilatation"), 0),
+    ("label_components[8]", "binary", ImageProcessor.label_components, ReferenceProcessor.label_components, 0),
+    ("label_components[4]", "binary", lambda img: ImageProcessor.label_components(img, 4),
+     lambda img: ReferenceProcessor.label_components(img, 4), 0),
+    ("remove_small_components[5]", "binary", lambda img: ImageProcessor.remove_small_components(img, 5),
+     lambda img: _remove_small_reference(img, 5), 0),
+    ("region_stats", "binary",
+     lambda img: _region_table(ImageProcessor.region_stats(img, SyntheticImages.make("noise", img.shape[0]))),
+     lambda img: _region_table(ReferenceProcessor.region_stats(img, SyntheticImages.make("noise", img.shape[0]))), 0),
+    # Traitement par lots : sorties écrites sans encodeur (.npy, .raw) puis relues
+    ("batch[apply_gamma npy]", "noise", lambda img: _batch_output(img, "npy", [("apply_gamma", (1.5,), {})]),
+     lambda img: ReferenceProcessor.apply_gamma(img, 1.5), 0),
+    ("batch[inverse raw]", "noise", lambda img: _batch_output(img, "raw", [("inverse", (), {})]),
+     lambda img: 255 - img, 0),
+    # Multi-cœurs : bandes de 2 workers sur une image de 3 x CHECK_SIDE lignes, par backend
+    ("filter_median[7 x2 thread]", "noise",
+     lambda img: ImageProcessor.filter_median(np.tile(img, (3, 1)), 7, workers=2, backend="thread"),
+     lambda img: ImageProcessor.filter_median(np.tile(img, (3, 1)), 7), 0),
+    ("filter_median[7 x2 process]", "noise",
+     lambda img: ImageProcessor.filter_median(np.tile(img, (3, 1)), 7, workers=2, backend="process"),
+     lambda img: ImageProcessor.filter_median(np.tile(img, (3, 1)), 7), 0),
+    ("detect_edges_sobel[nms x2 process]", "noise",
+     lambda img: ImageProcessor.detect_edges_sobel(np.tile(img, (3, 1)), mode="nms", workers=2, backend="process"),
+     lambda img: ImageProcessor.detect_edges_sobel(np.tile(img, (3, 1)), mode="nms"), 0),
+    # Lots : un appel sur la pile (ou l'image RGB) = les appels image par image, canal par canal
+    ("stretch_contrast[pile]", "frames", ImageProcessor.stretch_contrast,
+     _per_plane(ReferenceProcessor.stretch_contrast), 0),
+    ("equalize_histogram[pile]", "frames", ImageProcessor.equalize_histogram,
+     _per_plane(ReferenceProcessor.equalize_histogram), 0),
+    ("equalize_histogram[pile float32]", "frames", lambda img: ImageProcessor.equalize_histogram(img + np.float32(0.5)),
+     _per_plane(ReferenceProcessor.equalize_histogram), 0),
+    ("threshold_otsu[pile]", "frames", ImageProcessor.threshold_otsu, _per_plane(ReferenceProcessor.threshold_otsu), 0),
+    ("pipeline[inverse + equalize pile]", "frames",
+     lambda img: Pipeline(img).inverse().equalize_histogram().compute(),
+     _per_plane(lambda img: ReferenceProcessor.equalize_histogram(255 - img)), 0),
+    ("apply_filter[3x3 pile]", "frames", lambda img: ImageProcessor.apply_filter(img, GAUSSIAN_3X3),
+     _per_plane(lambda img: ReferenceProcessor.apply_filter(img, GAUSSIAN_3X3)), 0),
+    ("apply_filter[21x21 fft couleur]", "color", lambda img: ImageProcessor.apply_filter(img, BOX_21, method="fft"),
+     _per_plane(lambda img: ImageProcessor.apply_filter(img, BOX_21, method="fft")), 0),
+    ("blur_gaussian[sigma=2 couleur]", "color", lambda img: ImageProcessor.blur_gaussian(img, 2.0),
+     _per_plane(lambda img: ImageProcessor.blur_gaussian(img, 2.0)), 0),
+    ("filter_mean[5 couleur]", "color", lambda img: ImageProcessor.filter_mean(img, 5),
+     _per_plane(lambda img: ImageProcessor.filter_mean(img, 5)), 0),
+    ("detect_edges_sobel[nms pile]", "frames", lambda img: ImageProcessor.detect_edges_sobel(img, mode="nms"),
+     _per_plane(lambda img: ImageProcessor.detect_edges_sobel(img, mode="nms")), 0),
+    ("filter_median[3 pile]", "frames", lambda img: ImageProcessor.filter_median(img, 3),
+     _per_plane(lambda img: ReferenceProcessor.filter_median(img, 3)), 0),
+    ("filter_median[11 histogramme couleur]", "color", lambda img: ImageProcessor.filter_median(img, 11),
+     _per_plane(lambda img: ReferenceProcessor.filter_median(img, 11)), 0),
+    ("threshold_adaptive[sauvola pile]", "frames", lambda img: ImageProcessor.threshold_adaptive(img, "sauvola", 7),
+     _per_plane(lambda img: ReferenceProcessor.threshold_adaptive(img, "sauvola", 7)), 0),
+    ("threshold_adaptive[otsu pile]", "frames", lambda img: ImageProcessor.threshold_adaptive(img, "otsu"),
+     _per_plane(ReferenceProcessor.threshold_otsu), 0),
+    ("threshold_adaptive[otsu pile couleur]", "color",
+     lambda img: ImageProcessor.threshold_adaptive(np.stack([img, img[::-1]]), "otsu"),
+     lambda img: np.stack([ImageProcessor.threshold_otsu(img), ImageProcessor.threshold_otsu(img[::-1])]), 0),
+    ("morpho_operation[opening pile]", "frames", lambda img: ImageProcessor.morpho_operation(img, "opening", 5),
+     _per_plane(lambda img: ImageProcessor.morpho_operation(img, "opening", 5)), 0),
+    ("morpho_operation[erosion couleur]", "color", lambda img: ImageProcessor.morpho_operation(img, "erosion"),
+     _per_plane(lambda img: ReferenceProcessor.morpho_operation(img, "erosion")), 0),
+]
+
+def _region_table(regions: dict) -> np.ndarray:
+    """Mesures par région en un tableau entier (centroïdes et moyennes au millionième près)."""
+    return np.column_stack((regions["area"], regions["bbox"], np.round(regions["centroid"] * 1e6),
+                            np.round(regions["mean_intensity"] * 1e6))).astype(np.int64)
+
+def _batch_output(image: np.ndarray, extension: str, operations: list) -> np.ndarray:
+    """Image traitée par BatchProcessor.run (entrée PNG, sortie au format demandé), relue."""
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.png")
+        ImageLoader.save(image, source)
+        report = BatchProcessor.run([source], operations, os.path.join(directory, "out"), extension=extension)
+        if report["failed"]:
+            raise RuntimeError(f"Traitement par lots en échec : {report['errors']}")
+        target = os.path.join(directory, "out", "source." + extension)
+        if extension == "raw":
+            return np.array(ImageLoader.open_memmap(target, shape=image.shape))
+        return ImageLoader.load(target)
+
+def _remove_small_reference(image: np.ndarray, min_area: int) -> np.ndarray:
+    labels = ReferenceProcessor.label_components(image)
+    area = np.bincount(labels.ravel())
+    return (((area >= min_area)[labels]) & (labels > 0)).astype(np.uint8) * 255
+
+def _measure(func, *args, **kwargs) -> tuple:
+    """(meilleur temps en secondes, pic mémoire alloué en octets) d'un appel."""
+    best, total, runs = float("inf"), 0.0, 0
+    while runs < MAX_REPEAT and (runs == 0 or total < MIN_TIME):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best, total, runs = min(best, elapsed), total + elapsed, runs + 1
+
+    # Passe séparée pour la mémoire : tracemalloc ralentit l'exécution mesurée
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def uncovered_methods() -> list:
+    """Méthodes publiques d'ImageProcessor absentes de CASES."""
+    covered = {method for _, method, _, _, _ in CASES}
+    public = [name for name, _ in inspect.getmembers(ImageProcessor, inspect.isfunction) if not name.startswith("_")]
+    return sorted(set(public) - covered)
+
+def run_benchmark(sizes: list = SIZES, cases: list = None, verbose: bool = True) -> dict:
+    """
+    Mesure chaque cas (et ImageLoader.load / save) à chaque taille.
+
+    Returns:
+        dict: {"meta": {...}, "results": {"libellé@côté": {"seconds", "mp_per_s", "peak_bytes"}}}
+    """
+    selected = [case for case in CASES if cases is None or case[0] in cases or case[1] in cases]
+    results = {}
+
+    def record(label, side, seconds, peak):
+        megapixels = side * side / 1e6
+        results[f"{label}@{side}"] = {"seconds": seconds, "mp_per_s": megapixels / seconds, "peak_bytes": peak}
+        if verbose:
+            print(f"{label:<36} {side:>5}² | {seconds * 1e3:>10.2f} ms | {megapixels / seconds:>9.1f} MP/s "
+                  f"| {peak / 2**20:>8.1f} Mo")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for side in sizes:
+            images = {}
+            for label, method, kind, args, kwargs in selected:
+                if kind not in images:
+                    images[kind] = SyntheticImages.make(kind, side)
+                seconds, peak = _measure(getattr(ImageProcessor, method), images[kind], *args, **kwargs)
+                record(label, side, seconds, peak)
+
+            # Entrées / sorties : image de bruit (pire cas de compression)
+            if cases is None or "load" in cases or "save" in cases:
+                image = images.get("noise", SyntheticImages.make("noise", side))
+                for extension in ("png", "jpg", "pgm", "npy"):
+                    path = os.path.join(directory, f"bench_{side}.{extension}")
+                    seconds, peak = _measure(ImageLoader.save, image, path)
+                    record(f"ImageLoader.save[{extension}]", side, seconds, peak)
+                    seconds, peak = _measure(ImageLoader.load, path)
+                    record(f"ImageLoader.load[{extension}]", side, seconds, peak)
+                    if extension == "jpg": # Décodage réduit (mode draft) pour un aperçu 512 px
+                        seconds, peak = _measure(ImageLoader.load, path, target_size=(512, 512))
+                        record("ImageLoader.load[jpg,draft]", side, seconds, peak)
+
+    meta = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sizes": list(sizes),
+    }
+    return {"meta": meta, "results": results}
+
+def compare(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Compare deux séries de mesures (mêmes clés uniquement).
+
+    Returns:
+        list: Régressions (clé, temps de référence, temps actuel, rapport) au-delà du seuil.
+    """
+    regressions = []
+    print(f"{'Mesure':<44} | {'Référence':>11} | {'Actuel':>11} | {'Rapport':>7}")
+    for key in sorted(set(baseline["results"]) & set(current["results"])):
+        before = baseline["results"][key]["seconds"]
+        after = current["results"][key]["seconds"]
+        ratio = after / before
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append((key, before, after, ratio))
+            flag = "  <-- RÉGRESSION"
+        print(f"{key:<44} | {before * 1e3:>8.2f} ms | {after * 1e3:>8.2f} ms | {ratio:>6.2f}x{flag}")
+    return regressions
+
+def run_checks(side: int = CHECK_SIDE) -> list:
+    """
+    Compare la sortie des moteurs optimisés aux implémentations de référence.
+
+    Returns:
+        list: Libellés des contrôles en échec.
+    """
+    failures = []
+    print(f"{'Contrôle':<40} | {'Écart max':>9} | {'Tolérance':>9}")
+    for label, kind, optimized, reference, tolerance in CHECKS:
+        image = SyntheticImages.make(kind, side)
+        got, expected = optimized(image), reference(image)
+        if got.shape != expected.shape:
+            error = float("inf")
+        else:
+            error = int(np.max(np.abs(got.astype(np.int64) - expected.astype(np.int64)), initial=0))
+        ok = error <= tolerance
+        if not ok:
+            failures.append(label)
+        print(f"{label:<40} | {error:>9} | {tolerance:>9} {'OK' if ok else 'ÉCHEC'}")
+
+    # Statistiques : valeurs flottantes, comparées en relatif
+    image = SyntheticImages.make("noise", side)
+    got, expected = ImageProcessor.get_stats(image), ReferenceProcessor.get_stats(image)
+    for key, value in expected.items():
+        same = np.allclose(got[key], value, rtol=1e-9, atol=0)
+        if not same:
+            failures.append(f"get_stats[{key}]")
+        print(f"{'get_stats[' + key + ']':<40} | {'':>9} | {'1e-9':>9} {'OK' if same else 'ÉCHEC'}")
+    return failures
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark et non-régression des opérations VisionCore.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Côtés des images (pixels).")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Libellés ou méthodes à mesurer ('load' / 'save' pour les entrées-sorties).")
+    parser.add_argument("--output", help="Enregistre les mesures (JSON) comme nouvelle référence.")
+    parser.add_argument("--baseline", help="Référence JSON à comparer aux mesures courantes.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Ralentissement relatif toléré avant de signaler une régression.")
+    parser.add_argument("--check", action="store_true", help="Contrôles de justesse uniquement.")
+    args = parser.parse_args(argv)
+
+    status = 0
+    if args.check:
+        failures = run_checks()
+        print(f"{len(failures)} contrôle(s) en échec" + (f" : {', '.join(failures)}" if failures else ""))
+        return 1 if failures else 0
+
+    missing = uncovered_methods()
+    if missing:
+        print(f"Attention : méthodes d'ImageProcessor non mesurées : {', '.join(missing)}")
+
+    current = run_benchmark(args.sizes, args.cases)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Mesures enregistrées : {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        print(f"{len(regressions)} régression(s) au-delà de +{args.threshold:.0%}")
+        status = 1 if regressions else 0
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import numpy as np
+
+class SyntheticImages:
+    """
+    Images de test générées (déterministes pour une graine donnée) : aucune image
+    externe n'est nécessaire pour mesurer ou vérifier les opérations.
+    """
+
+    KINDS = ("noise", "gradient", "salt_pepper", "binary", "frames", "color")
+
+    # Nombre de trames de la pile "frames" (même nombre de pixels qu'une image side x side)
+    FRAMES = 16
+
+    @staticmethod
+    def make(kind: str, side: int, seed: int = 0) -> np.ndarray:
+        """Image carrée uint8 du type demandé (pile (N, H, W) ou image (H, W, 3) pour frames / color)."""
+        if kind not in SyntheticImages.KINDS:
+            raise ValueError(f"Type d'image inconnu : {kind} (attendu : {', '.join(SyntheticImages.KINDS)})")
+        return getattr(SyntheticImages, kind)(side, np.random.default_rng(seed))
+
+    @staticmethod
+    def noise(side: int, rng) -> np.ndarray:
+        """Bruit uniforme sur [0, 255] : pire cas pour les filtres (aucune redondance)."""
+        return rng.integers(0, 256, (side, side), dtype=np.uint8)
+
+    @staticmethod
+    def gradient(side: int, rng) -> np.ndarray:
+        """Dégradé diagonal peu contrasté [64, 191] avec un léger bruit (étirement, égalisation)."""
+        ramp = np.add.outer(np.arange(side), np.arange(side)) * (127.0 / max(1, 2 * side - 2)) + 64
+        return np.clip(ramp + rng.normal(0, 2, (side, side)), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def salt_pepper(side: int, rng, amount: float = 0.1) -> np.ndarray:
+        """Dégradé corrompu par du bruit impulsionnel (cas d'usage du filtre médian)."""
+        image = SyntheticImages.gradient(side, rng)
+        mask = rng.random((side, side))
+        image[mask < amount / 2] = 0
+        image[mask > 1 - amount / 2] = 255
+        return image
+
+    @staticmethod
+    def binary(side: int, rng) -> np.ndarray:
+        """Masque binaire {0, 255} de taches (sortie typique d'un seuillage)."""
+        coarse = rng.random((max(1, side // 16), max(1, side // 16))) > 0.5
+        blobs = np.kron(coarse, np.ones((16, 16), dtype=bool))[:side, :side]
+        blobs = np.pad(blobs, ((0, side - blobs.shape[0]), (0, side - blobs.shape[1])))
+        # Quelques pixels isolés inversés : cibles de l'ouverture et de la fermeture
+        blobs ^= rng.random((side, side)) < 0.01
+        return blobs.astype(np.uint8) * 255
+
+    @staticmethod
+    def frames(side: int, rng) -> np.ndarray:
+        """Pile de FRAMES trames (side / 4)² de bruit impulsionnel (séquence vidéo, traitement par lot)."""
+        frame_side = max(1, side // 4)
+        return np.stack([SyntheticImages.salt_pepper(frame_side, rng) for _ in range(SyntheticImages.FRAMES)])
+
+    @staticmethod
+    def color(side: int, rng) -> np.ndarray:
+        """Image RGB (side, side, 3) : un dégradé, du bruit et un masque, un par canal."""
+        return np.dstack((SyntheticImages.gradient(side, rng), SyntheticImages.noise(side, rng),
+                          SyntheticImages.binary(side, rng)))
@@ -0,0 +1,253 @@
+import ast
+import glob
+import os
+import queue
+import threading
+import time
+
+from core.cache import ResultCache
+from core.image_loader import ImageLoader
+from core.parallel import ParallelExecutor
+from core.pipeline import Pipeline
+from core.processor import ImageProcessor
+
+# Marqueur de fin de flux entre deux étages du pipeline
+_STOP = object()
+
+class BatchProcessor:
+    """
+    Traitement par lots sans interface graphique.
+    Les fichiers circulent dans un pipeline producteur/consommateur à trois étages
+    (décodage -> calcul -> encodage) reliés par des files bornées : lectures disque,
+    calcul NumPy et écritures se recouvrent, et la mémoire reste bornée par la taille
+    des files quel que soit le nombre d'images.
+    Chaque sortie est écrite dans un fichier temporaire puis renommée : une sortie
+    présente est toujours complète, ce qui permet de reprendre un lot interrompu.
+    """
+
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif", ".webp", ".pgm", ".ppm")
+
+    DEFAULT_QUEUE_SIZE = 8
+
+    @staticmethod
+    def parse_operation(spec: str) -> tuple:
+        """
+        Analyse une opération écrite 'nom:arg,cle=valeur,...' (arguments facultatifs).
+        Les valeurs sont des littéraux Python ; un mot nu est lu comme une chaîne.
+
+        Exemples : 'filter_median:size=5', 'apply_gamma:0.8', 'morpho_operation:opening,size=7',
+        'filter_median:size=15,workers=4,backend=process'
+
+        Returns:
+            tuple: (nom, args, kwargs)
+        """
+        name, _, params = spec.partition(":")
+        name = name.strip()
+        if name not in Pipeline.POINT_OPERATIONS and not callable(getattr(ImageProcessor, name, None)):
+            raise ValueError(f"Opération inconnue : {name}")
+        if not params.strip():
+            return name, (), {}
+
+        try:
+            call = ast.parse(f"f({params})", mode="eval").body
+        except SyntaxError:
+            raise ValueError(f"Paramètres invalides pour {name} : {params}")
+        args = tuple(BatchProcessor._literal(node) for node in call.args)
+        kwargs = {kw.arg: BatchProcessor._literal(kw.value) for kw in call.keywords}
+        return name, args, kwargs
+
+    @staticmethod
+    def _literal(node):
+        if isinstance(node, ast.Name):
+            return node.id # 'opening' plutôt que "'opening'" en ligne de commande
+        return ast.literal_eval(node)
+
+    @staticmethod
+    def collect_inputs(inputs: list, recursive: bool = False):
+        """
+        Générateur des fichiers image à traiter : (chemin, racine).
+        Chaque entrée est un fichier, un dossier ou un motif glob ; la racine sert à
+        reproduire l'arborescence relative dans le dossier de sortie.
+        """
+        for entry in inputs:
+            if os.path.isdir(entry):
+                root = entry
+                pattern = os.path.join(entry, "**", "*") if recursive else os.path.join(entry, "*")
+            elif glob.has_magic(entry):
+                # Racine d'un motif : partie du chemin avant le premier élément générique
+                parts = []
+                for part in entry.split(os.sep):
+                    if glob.has_magic(part):
+                        break
+                    parts.append(part)
+                root = os.sep.join(parts)
+                pattern = entry
+            else:
+                root = os.path.dirname(entry)
+                pattern = glob.escape(entry)
+            for path in sorted(glob.iglob(pattern, recursive=recursive)):
+                if os.path.isfile(path) and path.lower().endswith(BatchProcessor.IMAGE_EXTENSIONS):
+                    yield path, root or "."
+
+    @staticmethod
+    def output_path(path: str, root: str, output_dir: str, extension: str = None) -> str:
+        """Chemin de sortie : même chemin relatif à la racine, extension éventuellement changée."""
+        relative = os.path.relpath(path, root)
+        if extension:
+            relative = os.path.splitext(relative)[0] + "." + extension.lstrip(".").lower()
+        return os.path.join(output_dir, relative)
+
+    @staticmethod
+    def run(inputs: list, operations: list, output_dir: str, extension: str = None,
+            recursive: bool = False, decoders: int = 2, workers: int = None, encoders: int = 2,
+            queue_size: int = DEFAULT_QUEUE_SIZE, overwrite: bool = False, progress=None,
+            cache: ResultCache = None, mode: str = "L", frames: bool = False) -> dict:
+        """
+        Traite un lot d'images.
+
+        Args:
+            inputs (list): Fichiers, dossiers ou motifs glob.
+            operations (list): Étapes (nom, args, kwargs) d'ImageProcessor, dans l'ordre.
+            output_dir (str): Dossier de sortie.
+            extension (str): Format de sortie ('png', 'jpg'...) ; sinon celui de l'entrée.
+            recursive (bool): Parcourt les sous-dossiers (et '**' dans les motifs).
+            decoders, workers, encoders (int): Threads par étage (workers=None : tous les cœurs).
+            queue_size (int): Capacité de chaque file entre deux étages.
+            overwrite (bool): Retraite les images dont la sortie existe déjà.
+            progress: Fonction appelée (depuis le thread appelant) avec le rapport courant
+                après chaque image.
+            cache (ResultCache): Résultats mémoïsés ; avec un niveau disque, une relance
+                (ou une chaîne prolongée d'une étape) réutilise les calculs précédents.
+            mode (str): 'L' (niveaux de gris) ou 'RGB' (couleur conservée, voir ImageLoader.load).
+            frames (bool): Chaque fichier multi-trames (TIFF, GIF) est traité comme une seule
+                pile, en un appel par opération, et réécrit en multi-trames.
+
+        Returns:
+            dict: Rapport (traitées, ignorées, échecs, débits en images/s et Mo/s).
+        """
+        workers = ParallelExecutor.resolve_workers(workers)
+        report = {"processed": 0, "skipped": 0, "failed": 0, "errors": [],
+                  "bytes_in": 0, "bytes_out": 0, "elapsed": 0.0}
+        stop = threading.Event()
+        paths, decoded, computed = (queue.Queue(maxsize=queue_size) for _ in range(3))
+        results = queue.Queue() # Non bornée : le thread appelant ne bloque jamais un étage
+
+        def feed():
+            for path, root in BatchProcessor.collect_inputs(inputs, recursive):
+                if stop.is_set():
+                    break
+                target = BatchProcessor.output_path(path, root, output_dir, extension)
+                if not overwrite and os.path.exists(target):
+                    results.put(("skipped", path, None))
+                    continue
+                paths.put((path, target))
+            for _ in range(decoders):
+                paths.put(_STOP)
+
+        def decode(item):
+            path, target = item
+            # Lecture seule : pas de copie après décodage (le pipeline ne modifie pas son entrée)
+            return path, target, ImageLoader.load(path, writable=False, mode=mode, frames=frames)
+
+        def compute(item):
+            path, target, image = item
+            steps = operations
+            if cache is not None:
+                # Clés de tous les préfixes de la chaîne : reprise au plus long préfixe en cache
+                keys = [ResultCache.fingerprint(image)]
+                for name, args, kwargs in operations:
+                    keys.append(ResultCache.key(keys[-1], name, *args, **kwargs))
+                for done in range(len(operations), 0, -1):
+                    cached = cache.get(keys[done])
+                    if cached is not None:
+                        image, steps = cached, operations[done:]
+                        break
+
+            pipeline = Pipeline(image)
+            for name, args, kwargs in steps:
+                pipeline.apply(name, *args, **kwargs)
+            result = pipeline.compute()
+            if cache is not None and steps:
+                result = cache.put(keys[-1], result)
+            return path, target, result
+
+        def encode(item):
+            path, target, image = item
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            # Écriture atomique (fichier temporaire renommé) assurée par ImageLoader.save
+            ImageLoader.save(image, target)
+            return "processed", path, (os.path.getsize(path), os.path.getsize(target))
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += BatchProcessor._stage(decode, paths, decoded, results, decoders, workers, stop)
+        threads += BatchProcessor._stage(compute, decoded, computed, results, workers, encoders, stop)
+        threads += BatchProcessor._stage(encode, computed, results, results, encoders, 1, stop)
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _STOP:
+                    break
+                status, path, detail = item
+                if status == "processed":
+                    report["processed"] += 1
+                    report["bytes_in"] += detail[0]
+                    report["bytes_out"] += detail[1]
+                elif status == "skipped":
+                    report["skipped"] += 1
+                else:
+                    report["failed"] += 1
+                    report["errors"].append((path, detail))
+                BatchProcessor._update_rates(report, time.perf_counter() - start)
+                if progress is not None:
+                    progress(report)
+        except KeyboardInterrupt:
+            # Les sorties déjà renommées sont complètes : une relance reprendra la suite
+            stop.set()
+            report["interrupted"] = True
+        if cache is not None:
+            cache.flush()
+            report["cache"] = cache.stats()
+        BatchProcessor._update_rates(report, time.perf_counter() - start)
+        return report
+
+    @staticmethod
+    def _stage(work, inbox, outbox, results, count, downstream, stop) -> list:
+        """
+        Crée les `count` threads d'un étage. Un échec sur une image est envoyé directement
+        au rapport sans interrompre le lot ; le dernier thread à s'arrêter transmet un
+        marqueur de fin à chacun des `downstream` consommateurs de l'étage suivant.
+        """
+        remaining = [count]
+        lock = threading.Lock()
+
+        def loop():
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    break
+                if stop.is_set():
+                    continue # Vidange des files après une interruption
+                try:
+                    outbox.put(work(item))
+                except Exception as e:
+                    results.put(("failed", item[0], str(e)))
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(downstream):
+                    outbox.put(_STOP)
+
+        return [threading.Thread(target=loop, daemon=True) for _ in range(count)]
+
+    @staticmethod
+    def _update_rates(report: dict, elapsed: float):
+        report["elapsed"] = elapsed
+        elapsed = max(elapsed, 1e-9)
+        report["images_per_s"] = report["processed"] / elapsed
+        report["mb_in_per_s"] = report["bytes_in"] / 1e6 / elapsed
+        report["mb_out_per_s"] = report["bytes_out"] / 1e6 / elapsed
@@ -0,0 +1,201 @@
+import collections
+import hashlib
+import inspect
+import os
+import threading
+
+import numpy as np
+
+from core.processor import ImageProcessor
+
+class ResultCache:
+    """
+    Cache des résultats d'ImageProcessor adressé par le contenu.
+    La clé d'un résultat est l'empreinte de l'entrée (hachage BLAKE2b de ses octets,
+    de sa forme et de son type) combinée au nom de l'opération et à ses paramètres
+    normalisés. La clé d'un résultat sert d'empreinte pour l'étape suivante : une
+    chaîne rejouée ne hache que l'image d'origine.
+
+    - Niveau mémoire : LRU borné en octets.
+    - Niveau disque (optionnel) : les entrées évincées sont écrites en .npy dans
+      `directory` et relues en np.memmap lors d'un succès ; l'index est reconstruit
+      à l'ouverture, ce qui profite aux relances d'un traitement par lots.
+
+    Les tableaux stockés sont rendus non modifiables (flags.writeable = False) :
+    un résultat partagé ne peut pas être altéré par un appelant.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    # Paramètres sans effet sur le résultat (exclus des clés)
+    IGNORED_PARAMETERS = ("workers",)
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: str = None, max_disk_bytes: int = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = collections.OrderedDict() # clé -> tableau, du moins au plus récemment utilisé
+        self._disk = collections.OrderedDict() # clé -> taille du fichier .npy
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            entries = [entry for entry in os.scandir(directory) if entry.name.endswith(".npy")]
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                size = entry.stat().st_size
+                self._disk[entry.name[:-4]] = size
+                self._disk_bytes += size
+
+    # --- CLÉS ---
+
+    @staticmethod
+    def fingerprint(image: np.ndarray) -> str:
+        """Empreinte du contenu d'un tableau (octets, forme et type)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.shape}{image.dtype.str}".encode())
+        digest.update(memoryview(np.ascontiguousarray(image)).cast("B"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(source: str, name: str, *args, **kwargs) -> str:
+        """
+        Clé du résultat de ImageProcessor.<name>(source, *args, **kwargs).
+        Les paramètres sont normalisés par la signature de la méthode (positionnels ou
+        nommés, valeurs par défaut explicites) : filter_median(img, 5) et
+        filter_median(img, size=5) partagent la même entrée.
+        """
+        method = getattr(ImageProcessor, name, None)
+        if method is None:
+            raise ValueError(f"Opération inconnue : {name}")
+        params = inspect.signature(method).bind(None, *args, **kwargs)
+        params.apply_defaults()
+        tokens = [ResultCache._token(value) for param, value in list(params.arguments.items())[1:]
+                  if param not in ResultCache.IGNORED_PARAMETERS]
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{source}|{name}|{tokens}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _token(value):
+        if isinstance(value, np.ndarray):
+            return ("ndarray", ResultCache.fingerprint(value))
+        if isinstance(value, (list, tuple)):
+            return tuple(ResultCache._token(v) for v in value)
+        return repr(value)
+
+    # --- ACCÈS ---
+
+    def run(self, name: str, image: np.ndarray, *args, key: str = None, **kwargs) -> tuple:
+        """
+        ImageProcessor.<name>(image, *args, **kwargs) mémoïsé.
+
+        Args:
+            key (str): Empreinte déjà connue de image (clé du résultat précédent d'une
+                chaîne) ; sinon calculée par fingerprint().
+
+        Returns:
+            tuple: (résultat, clé du résultat)
+        """
+        if key is None:
+            key = ResultCache.fingerprint(image)
+        result_key = ResultCache.key(key, name, *args, **kwargs)
+        result = self.get(result_key)
+        if result is None:
+            result = self.put(result_key, getattr(ImageProcessor, name)(image, *args, **kwargs))
+        return result, result_key
+
+    def get(self, key: str):
+        """Résultat en cache (mémoire, sinon np.memmap du niveau disque), ou None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                self.hits += 1
+                self.disk_hits += 1
+                return np.load(self._path(key), mmap_mode="r")
+            self.misses += 1
+            return None
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """
+        Ajoute un résultat (évinçant les moins récemment utilisés) et le renvoie en lecture seule.
+        Le cache conserve une vue en lecture seule, sans copie : le tableau de l'appelant
+        garde ses drapeaux, mais ne doit plus être modifié en place.
+        """
+        array = array.view()
+        array.flags.writeable = False
+        with self._lock:
+            if key in self._memory:
+                self._bytes -= self._memory.pop(key).nbytes
+            self._memory[key] = array
+            self._bytes += array.nbytes
+            while self._bytes > self.max_bytes and len(self._memory) > 1:
+                evicted_key, evicted = self._memory.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+                self._spill(evicted_key, evicted)
+        return array
+
+    def flush(self):
+        """Écrit sur disque toutes les entrées du niveau mémoire (fin d'un traitement par lots)."""
+        with self._lock:
+            for key, array in self._memory.items():
+                self._spill(key, array)
+
+    def clear(self):
+        """Vide le niveau mémoire (le niveau disque est conservé)."""
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Compteurs d'utilisation du cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    # --- NIVEAU DISQUE ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npy")
+
+    def _spill(self, key: str, array: np.ndarray):
+        """Écrit une entrée évincée sur disque (écriture atomique), puis borne le niveau disque."""
+        if self.directory is None or key in self._disk:
+            return
+        path = self._path(key)
+        temporary = path + ".part"
+        with open(temporary, "wb") as f:
+            np.save(f, np.asarray(array))
+        os.replace(temporary, path)
+        size = os.path.getsize(path)
+        self._disk[key] = size
+        self._disk_bytes += size
+
+        while self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            old_key, old_size = self._disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass # Fichier encore ouvert en np.memmap (Windows) : il sera réécrit au besoin
@@ -0,0 +1,225 @@
+import numpy as np
+
+from core.profiling import Profiler
+
+class ComponentEngine:
+    """
+    Étiquetage en composantes connexes d'un masque binaire (pixels non nuls) et
+    mesures par région, sans boucle Python sur les pixels.
+
+    1. Codage par plages (RLE) : chaque ligne est réduite à ses segments de pixels
+       allumés, repérés par une clé globale ligne * (largeur + 2) + colonne. Les sommes
+       d'intensité par plage sont relevées dans la même passe.
+    2. Union-find sur les plages : deux plages de lignes consécutives se touchent si leurs
+       intervalles se chevauchent (4-connexité) ou se touchent en diagonale (8-connexité) ;
+       ces paires sont trouvées par recherche dichotomique, puis fusionnées par
+       accrochage au plus petit représentant et compression de chemins, vectorisés.
+    3. Mesures : aire, boîte englobante, centroïde et intensité moyenne se cumulent par
+       plage (np.bincount), sans relire l'image.
+
+    La mémoire de travail dépend du nombre de plages, pas du nombre de pixels : l'image
+    est parcourue par bandes de BAND_ROWS lignes.
+    """
+
+    CONNECTIVITIES = (4, 8)
+
+    # Lignes traitées à la fois lors du codage et du rendu (borne les temporaires)
+    BAND_ROWS = 1024
+
+    # --- CODAGE PAR PLAGES ---
+
+    @staticmethod
+    def runs(image: np.ndarray, intensity: np.ndarray = None) -> dict:
+        """
+        Plages de pixels non nuls, dans l'ordre de balayage.
+
+        Returns:
+            dict: starts / ends (clés globales, fin exclue), stride (largeur + 2), shape,
+                et sums (somme d'intensité par plage) si intensity est fourni.
+        """
+        if image.ndim != 2:
+            raise ValueError("L'étiquetage attend un masque 2D.")
+        if intensity is not None and intensity.shape != image.shape:
+            raise ValueError("L'image d'intensité doit avoir la taille du masque.")
+        h, w = image.shape
+        stride = w + 2
+        starts, ends, sums = [], [], []
+
+        with Profiler.stage("rle"):
+            for r0 in range(0, h, ComponentEngine.BAND_ROWS):
+                r1 = min(h, r0 + ComponentEngine.BAND_ROWS)
+                # Une colonne éteinte de chaque côté : aucune plage ne déborde sur la ligne suivante
+                padded = np.zeros((r1 - r0, stride), dtype=np.int8)
+                padded[:, 1:-1] = image[r0:r1] != 0
+                edges = np.flatnonzero(np.diff(padded.ravel())) + 1 + r0 * stride
+                band_starts, band_ends = edges[0::2], edges[1::2]
+                starts.append(band_starts)
+                ends.append(band_ends)
+
+                if intensity is not None:
+                    # Sommes cumulées par ligne : somme d'une plage = 2 lectures
+                    acc_type = np.int64 if np.issubdtype(intensity.dtype, np.integer) else np.float64
+                    cumulative = np.zeros((r1 - r0, stride), dtype=acc_type)
+                    np.cumsum(intensity[r0:r1], axis=1, dtype=acc_type, out=cumulative[:, 2:])
+                    cumulative = cumulative.ravel()
+                    offset = r0 * stride
+                    sums.append(cumulative[band_ends - offset] - cumulative[band_starts - offset])
+
+        runs = {"starts": np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64),
+                "ends": np.concatenate(ends) if ends else np.zeros(0, dtype=np.int64),
+                "stride": stride, "shape": (h, w)}
+        if intensity is not None:
+            runs["sums"] = np.concatenate(sums) if sums else np.zeros(0)
+        return runs
+
+    # --- ÉTIQUETAGE ---
+
+    @staticmethod
+    def label_runs(runs: dict, connectivity: int = 8) -> tuple:
+        """
+        Étiquette de chaque plage (1..N, dans l'ordre de balayage de leur premier pixel).
+
+        Returns:
+            tuple: (étiquettes par plage, nombre de composantes N)
+        """
+        if connectivity not in ComponentEngine.CONNECTIVITIES:
+            raise ValueError(f"Connexité inconnue : {connectivity} (attendu : 4 ou 8)")
+        starts, ends, stride = runs["starts"], runs["ends"], runs["stride"]
+        n = starts.size
+        if n == 0:
+            return np.zeros(0, dtype=np.int64), 0
+
+        with Profiler.stage("pairs"):
+            # Plages de la ligne précédente qui touchent chaque plage : un intervalle contigu
+            # de la liste triée, borné par deux recherches dichotomiques
+            reach = 1 if connectivity == 8 else 0
+            first = np.searchsorted(ends, starts - stride - reach, side="right")
+            last = np.searchsorted(starts, ends - stride + reach, side="left")
+            counts = np.maximum(last - first, 0)
+            total = int(counts.sum())
+            lower = np.repeat(np.arange(n), counts)
+            offsets = np.cumsum(counts) - counts
+            upper = np.arange(total) - np.repeat(offsets - first, counts)
+
+        with Profiler.stage("union"):
+            parent = np.arange(n)
+            while upper.size:
+                root_a, root_b = parent[upper], parent[lower]
+                pending = root_a != root_b
+                if not pending.any():
+                    break
+                upper, lower = upper[pending], lower[pending]
+                root_a, root_b = root_a[pending], root_b[pending]
+                # Accrochage : chaque racine pointe vers le plus petit représentant voisin
+                np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+                # Compression : les pointeurs décroissent strictement, pas de cycle possible
+                while True:
+                    grand = parent[parent]
+                    if np.array_equal(grand, parent):
+                        break
+                    parent = grand
+
+        is_root = parent == np.arange(n)
+        return np.cumsum(is_root)[parent], int(np.count_nonzero(is_root))
+
+    # --- MESURES ---
+
+    @staticmethod
+    def analyze(image: np.ndarray, intensity: np.ndarray = None, connectivity: int = 8,
+                min_area: int = 0, with_labels: bool = True) -> dict:
+        """
+        Étiquetage et mesures par région en une passe.
+
+        Args:
+            image (np.ndarray): Masque (pixels non nuls = objets), ex. sortie d'Otsu.
+            intensity (np.ndarray): Image dont on mesure l'intensité moyenne par région.
+            connectivity (int): 4 ou 8.
+            min_area (int): Les composantes plus petites sont écartées (et renumérotées).
+            with_labels (bool): Produit aussi l'image des étiquettes (int32).
+
+        Returns:
+            dict: count, area (N,), bbox (N, 4 : haut, gauche, bas, droite exclus),
+                centroid (N, 2 : ligne, colonne), mean_intensity (N,) si intensity,
+                labels (H, W) si with_labels.
+        """
+        runs = ComponentEngine.runs(image, intensity)
+        labels, count = ComponentEngine.label_runs(runs, connectivity)
+        starts, ends, stride = runs["starts"], runs["ends"], runs["stride"]
+
+        with Profiler.stage("measure"):
+            rows = starts // stride
+            left = starts - rows * stride - 1
+            right = ends - rows * stride - 1
+            lengths = ends - starts
+            size = count + 1
+
+            area = np.bincount(labels, weights=lengths, minlength=size).astype(np.int64)
+            keep = area >= max(1, min_area)
+            keep[0] = False
+            if not keep[1:].all():
+                # Renumérotation des composantes conservées (0 pour les autres)
+                renumber = np.cumsum(keep) * keep
+                labels = renumber[labels]
+                count = int(np.count_nonzero(keep))
+                size = count + 1
+                area = area[keep]
+            else:
+                area = area[1:]
+
+            bbox = np.empty((count, 4), dtype=np.int64)
+            top = np.full(size, np.iinfo(np.int64).max)
+            np.minimum.at(top, labels, rows)
+            bottom = np.zeros(size, dtype=np.int64)
+            np.maximum.at(bottom, labels, rows + 1)
+            first = np.full(size, np.iinfo(np.int64).max)
+            np.minimum.at(first, labels, left)
+            last = np.zeros(size, dtype=np.int64)
+            np.maximum.at(last, labels, right)
+            bbox[:, 0], bbox[:, 1], bbox[:, 2], bbox[:, 3] = top[1:], first[1:], bottom[1:], last[1:]
+
+            # Somme des colonnes d'une plage [a, b[ : longueur x (a + b - 1) / 2
+            sum_y = np.bincount(labels, weights=rows * lengths, minlength=size)[1:]
+            sum_x = np.bincount(labels, weights=lengths * (left + right - 1) / 2.0, minlength=size)[1:]
+            regions = {
+                "count": count,
+                "area": area,
+                "bbox": bbox,
+                "centroid": np.column_stack((sum_y / np.maximum(area, 1), sum_x / np.maximum(area, 1))),
+            }
+            if intensity is not None:
+                totals = np.bincount(labels, weights=runs["sums"], minlength=size)[1:]
+                regions["mean_intensity"] = totals / np.maximum(area, 1)
+
+        if with_labels:
+            regions["labels"] = ComponentEngine.paint(runs, labels, np.int32)
+        return regions
+
+    @staticmethod
+    def remove_small(image: np.ndarray, min_area: int, connectivity: int = 8) -> np.ndarray:
+        """Masque uint8 (0 / 255) sans les composantes de moins de min_area pixels."""
+        runs = ComponentEngine.runs(image)
+        labels, count = ComponentEngine.label_runs(runs, connectivity)
+        area = np.bincount(labels, weights=runs["ends"] - runs["starts"], minlength=count + 1)
+        keep = (area >= min_area).astype(np.uint8) * 255
+        keep[0] = 0
+        return ComponentEngine.paint(runs, keep[labels], np.uint8)
+
+    @staticmethod
+    def paint(runs: dict, values: np.ndarray, dtype) -> np.ndarray:
+        """Image (H, W) où chaque plage est remplie de sa valeur (0 hors des plages)."""
+        h, w = runs["shape"]
+        stride = runs["stride"]
+        starts, ends = runs["starts"], runs["ends"]
+        output = np.zeros((h, w), dtype=dtype)
+        with Profiler.stage("paint"):
+            for r0 in range(0, h, ComponentEngine.BAND_ROWS):
+                r1 = min(h, r0 + ComponentEngine.BAND_ROWS)
+                lo, hi = np.searchsorted(starts, [r0 * stride, r1 * stride])
+                # Marches +v au début et -v à la fin de chaque plage, puis somme cumulée
+                steps = np.zeros((r1 - r0) * stride, dtype=np.int64)
+                values_band = values[lo:hi].astype(np.int64)
+                steps[starts[lo:hi] - r0 * stride] = values_band
+                steps[ends[lo:hi] - r0 * stride] = -values_band
+                np.cumsum(steps, out=steps)
+                output[r0:r1] = steps.reshape(r1 - r0, stride)[:, 1:-1]
+        return output
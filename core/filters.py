@@ -0,0 +1,319 @@
+import numpy as np
+
+from core.profiling import Profiler
+
+class FilterEngine:
+    """
+    Moteur de convolution 2D vectorisé.
+    Remplace la double boucle Python par des opérations sur des tableaux entiers :
+    accumulation de tranches décalées pour les petits noyaux, deux passes 1D pour
+    les noyaux séparables, FFT pour les grands.
+    Les axes spatiaux sont toujours les deux derniers : une pile (..., H, W) est filtrée
+    par les mêmes opérations qu'une image seule, sans boucle sur ses plans.
+    """
+
+    # Correspondance entre les modes de bord exposés et les modes de np.pad
+    BORDER_MODES = {
+        "zero": "constant",
+        "edge": "edge",
+        "reflect": "reflect",
+        "wrap": "wrap",
+    }
+
+    # Nombre de coefficients du noyau à partir duquel la FFT devient plus rentable
+    # que l'accumulation directe (environ un noyau 11x11).
+    FFT_THRESHOLD = 121
+
+    @staticmethod
+    def pad(image: np.ndarray, pad_h: int, pad_w: int, border: str = "zero") -> np.ndarray:
+        """
+        Ajoute une bordure autour de l'image selon le mode demandé.
+
+        Args:
+            image (np.ndarray): Matrice 2D ou pile de plans (..., H, W) : seuls les deux
+                derniers axes sont complétés.
+            pad_h (int): Nombre de lignes ajoutées en haut et en bas.
+            pad_w (int): Nombre de colonnes ajoutées à gauche et à droite.
+            border (str): 'zero', 'edge', 'reflect' ou 'wrap'.
+
+        Returns:
+            np.ndarray: Matrice agrandie de (2*pad_h, 2*pad_w).
+        """
+        if border not in FilterEngine.BORDER_MODES:
+            raise ValueError(f"Mode de bord inconnu : {border} "
+                             f"(attendu : {', '.join(FilterEngine.BORDER_MODES)})")
+        widths = ((0, 0),) * (image.ndim - 2) + ((pad_h, pad_h), (pad_w, pad_w))
+        return np.pad(image, widths, mode=FilterEngine.BORDER_MODES[border])
+
+    @staticmethod
+    def correlate(image: np.ndarray, kernel: np.ndarray, border: str = "zero",
+                  method: str = "auto") -> np.ndarray:
+        """
+        Corrélation 2D (même convention que l'ancienne boucle : le noyau n'est pas retourné).
+
+        Args:
+            image (np.ndarray): Matrice 2D, ou pile (..., H, W) filtrée plan par plan
+                en une seule série d'opérations.
+            kernel (np.ndarray): Noyau 2D de taille quelconque.
+            border (str): Mode de gestion des bords.
+            method (str): 'direct', 'separable', 'fft' ou 'auto' (direct, ou FFT pour les
+                grands noyaux). 'direct' reproduit bit à bit l'ancienne boucle ;
+                'separable' (noyau de rang 1) est plus rapide mais somme dans un autre
+                ordre : jusqu'à un niveau d'écart après troncature en uint8.
+
+        Returns:
+            np.ndarray: Résultat brut en float32, de la même taille que l'image.
+        """
+        kernel = np.asarray(kernel)
+        if kernel.ndim != 2:
+            raise ValueError("Le noyau doit être une matrice 2D.")
+
+        k_h, k_w = kernel.shape
+        with Profiler.stage("pad"):
+            padded = FilterEngine.pad(image, k_h // 2, k_w // 2, border)
+
+        if method == "auto":
+            method = FilterEngine._choose_method(kernel)
+        if method != "direct":
+            kernel = kernel.astype(np.float32)
+
+        if method == "separable":
+            factors = FilterEngine.separate(kernel)
+            if factors is None:
+                raise ValueError("Le noyau n'est pas séparable (rang > 1).")
+            column, row = factors
+            with Profiler.stage("correlate_separable"):
+                return FilterEngine._correlate_separable(padded, row, column, image.shape)
+        if method == "direct":
+            with Profiler.stage("correlate_direct"):
+                return FilterEngine._correlate_direct(padded, kernel, image.shape)
+        if method == "fft":
+            with Profiler.stage("correlate_fft"):
+                return FilterEngine._correlate_fft(padded, kernel, image.shape)
+        raise ValueError(f"Méthode de convolution inconnue : {method}")
+
+    @staticmethod
+    def correlate_separable(image: np.ndarray, row: np.ndarray, column: np.ndarray,
+                            border: str = "zero") -> np.ndarray:
+        """
+        Corrélation par un noyau séparable donné sous forme de deux vecteurs 1D.
+        Équivaut à correlate(image, np.outer(column, row)) en O(2k) par pixel au lieu de O(k²).
+
+        Args:
+            image (np.ndarray): Matrice 2D ou pile (..., H, W).
+            row (np.ndarray): Vecteur appliqué le long des lignes (axe horizontal).
+            column (np.ndarray): Vecteur appliqué le long des colonnes (axe vertical).
+            border (str): Mode de gestion des bords.
+
+        Returns:
+            np.ndarray: Résultat brut en float32.
+        """
+        row = np.asarray(row, dtype=np.float32).ravel()
+        column = np.asarray(column, dtype=np.float32).ravel()
+        with Profiler.stage("pad"):
+            padded = FilterEngine.pad(image, column.size // 2, row.size // 2, border)
+        with Profiler.stage("correlate_separable"):
+            return FilterEngine._correlate_separable(padded, row, column, image.shape)
+
+    @staticmethod
+    def separate(kernel: np.ndarray):
+        """
+        Détecte si un noyau est de rang 1 (séparable).
+
+        Returns:
+            tuple | None: (colonne, ligne) tels que np.outer(colonne, ligne) == kernel,
+            ou None si le noyau n'est pas séparable.
+        """
+        kernel = np.asarray(kernel, dtype=np.float32)
+        if not kernel.any():
+            return None
+
+        # Le pivot (plus grand coefficient) donne des facteurs exacts pour les
+        # noyaux usuels (binomial, Sobel...), contrairement à une SVD.
+        i, j = np.unravel_index(np.argmax(np.abs(kernel)), kernel.shape)
+        column = kernel[:, j].copy()
+        row = kernel[i, :] / kernel[i, j]
+
+        if not np.allclose(np.outer(column, row), kernel, rtol=1e-5, atol=1e-7):
+            return None
+        return column, row.astype(np.float32)
+
+    @staticmethod
+    def box_sum(image: np.ndarray, size: int, border: str = "zero") -> np.ndarray:
+        """
+        Somme sur une fenêtre carrée size x size par sommes cumulées (table de sommes).
+        Le coût par pixel est constant, quelle que soit la taille de la fenêtre.
+
+        Returns:
+            np.ndarray: Sommes exactes (int64 pour une image entière, float64 sinon).
+        """
+        if size < 1:
+            raise ValueError("La taille de la fenêtre doit être >= 1.")
+        with Profiler.stage("pad"):
+            padded = FilterEngine.pad(image, size // 2, size // 2, border)
+        acc_type = np.int64 if np.issubdtype(padded.dtype, np.integer) else np.float64
+        h, w = image.shape[-2:]
+
+        # Somme glissante le long des lignes puis des colonnes :
+        # somme[j : j+size] = S[j+size-1] - S[j-1], avec S la somme cumulée
+        cum = np.cumsum(padded, axis=-1, dtype=acc_type)
+        sums = cum[..., size - 1:size - 1 + w].copy()
+        sums[..., 1:] -= cum[..., :w - 1]
+
+        cum = np.cumsum(sums, axis=-2)
+        sums = cum[..., size - 1:size - 1 + h, :].copy()
+        sums[..., 1:, :] -= cum[..., :h - 1, :]
+        return sums
+
+    @staticmethod
+    def gaussian_kernel_1d(sigma: float, radius: int = None) -> np.ndarray:
+        """
+        Noyau gaussien 1D échantillonné et normalisé (somme = 1).
+
+        Args:
+            sigma (float): Écart-type en pixels.
+            radius (int): Demi-largeur du noyau (par défaut ceil(3 * sigma)).
+        """
+        if sigma <= 0:
+            raise ValueError("sigma doit être strictement positif.")
+        if radius is None:
+            radius = max(1, int(np.ceil(3 * sigma)))
+        x = np.arange(-radius, radius + 1, dtype=np.float64)
+        kernel = np.exp(-0.5 * (x / sigma) ** 2)
+        return (kernel / kernel.sum()).astype(np.float32)
+
+    @staticmethod
+    def _choose_method(kernel: np.ndarray) -> str:
+        """
+        Choix automatique : direct (résultat exact) ou FFT selon la taille. Le chemin
+        séparable reste explicite (method='separable', apply_separable_filter).
+        """
+        return "fft" if kernel.size >= FilterEngine.FFT_THRESHOLD else "direct"
+
+    @staticmethod
+    def _correlate_separable(padded: np.ndarray, row: np.ndarray, column: np.ndarray,
+                             out_shape: tuple) -> np.ndarray:
+        """Deux passes 1D : le long des lignes sur la hauteur complétée, puis des colonnes."""
+        h, w = out_shape[-2:]
+        src = padded.astype(np.float32, copy=False)
+        horizontal = FilterEngine._correlate_1d(src, row, axis=-1, length=w)
+        return FilterEngine._correlate_1d(horizontal, column, axis=-2, length=h)
+
+    @staticmethod
+    def _correlate_1d(src: np.ndarray, taps: np.ndarray, axis: int, length: int) -> np.ndarray:
+        """Accumulation de tranches décalées le long d'un axe spatial (-1 : lignes, -2 : colonnes)."""
+        out_shape = list(src.shape)
+        out_shape[axis] = length
+        output = np.zeros(out_shape, dtype=np.float32)
+        tmp = np.empty(out_shape, dtype=np.float32)
+
+        for offset, coef in enumerate(taps):
+            if coef == 0:
+                continue
+            window = src[..., offset:offset + length] if axis == -1 else src[..., offset:offset + length, :]
+            np.multiply(window, coef, out=tmp)
+            output += tmp
+        return output
+
+    @staticmethod
+    def _correlate_direct(padded: np.ndarray, kernel: np.ndarray, out_shape: tuple) -> np.ndarray:
+        """
+        Accumulation des tranches décalées : une passe vectorisée par coefficient non nul.
+        Les produits sont sommés dans l'ordre de np.sum(region * kernel) de l'ancienne
+        boucle (voir _pairwise_sum), dans la précision du noyau (float32, sinon float64) :
+        le résultat est identique bit à bit, troncature en uint8 comprise.
+        """
+        h, w = out_shape[-2:]
+        dtype = np.float32 if kernel.dtype == np.float32 else np.float64
+        src = padded.astype(dtype, copy=False)
+        coefs = kernel.astype(dtype).ravel()
+        k_w = kernel.shape[1]
+        tmp = np.empty(out_shape, dtype=dtype)
+
+        def accumulate(total, index):
+            """total + produit du coefficient `index` (None : somme vide)."""
+            coef = coefs[index]
+            if coef == 0:
+                return total # Les zéros (fréquents dans Sobel) ne coûtent rien
+            di, dj = divmod(index, k_w)
+            window = src[..., di:di + h, dj:dj + w]
+            if total is None:
+                return window * coef
+            np.multiply(window, coef, out=tmp)
+            total += tmp
+            return total
+
+        output = FilterEngine._pairwise_sum(accumulate, 0, coefs.size)
+        if output is None:
+            return np.zeros(out_shape, dtype=np.float32)
+        return output.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _pairwise_sum(accumulate, start: int, n: int):
+        """
+        Somme des termes [start, start + n) dans l'ordre de la sommation par paires de
+        NumPy (np.sum) : moins de 8 termes dans l'ordre ; jusqu'à 128, 8 sommes partielles
+        de pas 8 combinées en arbre puis le reste dans l'ordre ; au-delà, deux moitiés
+        (multiples de 8). accumulate(total, i) renvoie total + terme i (None : somme vide).
+        """
+        def add(a, b):
+            if a is None:
+                return b
+            if b is not None:
+                a += b
+            return a
+
+        if n < 8:
+            total = None
+            for i in range(start, start + n):
+                total = accumulate(total, i)
+            return total
+        if n <= 128:
+            body = n - n % 8
+
+            def lane(j):
+                total = None
+                for i in range(start + j, start + body, 8):
+                    total = accumulate(total, i)
+                return total
+
+            # ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7)) : au plus quatre sommes vivantes
+            total = add(add(add(lane(0), lane(1)), add(lane(2), lane(3))),
+                        add(add(lane(4), lane(5)), add(lane(6), lane(7))))
+            for i in range(start + body, start + n):
+                total = accumulate(total, i)
+            return total
+        half = n // 2
+        half -= half % 8
+        return add(FilterEngine._pairwise_sum(accumulate, start, half),
+                   FilterEngine._pairwise_sum(accumulate, start + half, n - half))
+
+    @staticmethod
+    def _correlate_fft(padded: np.ndarray, kernel: np.ndarray, out_shape: tuple) -> np.ndarray:
+        """Produit dans le domaine fréquentiel : coût indépendant de la taille du noyau."""
+        h, w = out_shape[-2:]
+        k_h, k_w = kernel.shape
+        fft_shape = (FilterEngine._fft_size(padded.shape[-2]), FilterEngine._fft_size(padded.shape[-1]))
+
+        # Corrélation = convolution avec le noyau retourné.
+        # La convolution circulaire est exacte sur la zone 'valide' qui nous intéresse.
+        # rfft2 opère sur les deux derniers axes : le spectre du noyau est diffusé sur le lot.
+        spectrum = np.fft.rfft2(padded, s=fft_shape) * np.fft.rfft2(kernel[::-1, ::-1], s=fft_shape)
+        full = np.fft.irfft2(spectrum, s=fft_shape)
+        output = full[..., k_h - 1:k_h - 1 + h, k_w - 1:k_w - 1 + w]
+
+        # Suppression du bruit d'arrondi de la FFT (~1e-10) pour que la troncature
+        # en uint8 donne le même résultat que le calcul direct.
+        return np.round(output, 4).astype(np.float32)
+
+    @staticmethod
+    def _fft_size(n: int) -> int:
+        """Plus petite taille >= n dont les facteurs premiers sont 2, 3 ou 5 (FFT rapide)."""
+        while True:
+            m = n
+            for p in (2, 3, 5):
+                while m % p == 0:
+                    m //= p
+            if m == 1:
+                return n
+            n += 1
@@ -0,0 +1,141 @@
+import numpy as np
+
+from core.filters import FilterEngine
+from core.profiling import Profiler
+
+class GradientEngine:
+    """
+    Calcul du gradient spatial en précision flottante.
+    Les deux dérivées (Gx, Gy) sont évaluées en une seule passe sur un unique buffer
+    complété, sans troncature intermédiaire en uint8 : les gradients négatifs sont conservés.
+    """
+
+    # Noyaux de dérivation horizontale (Gx). Le noyau vertical (Gy) est leur transposée.
+    KERNELS = {
+        "sobel": np.array([[-1, 0, 1],
+                           [-2, 0, 2],
+                           [-1, 0, 1]], dtype=np.float32),
+        "scharr": np.array([[-3, 0, 3],
+                            [-10, 0, 10],
+                            [-3, 0, 3]], dtype=np.float32),
+        "prewitt": np.array([[-1, 0, 1],
+                             [-1, 0, 1],
+                             [-1, 0, 1]], dtype=np.float32),
+    }
+
+    # Sorties disponibles : normes L1 et L2, orientation (radians), contours affinés (NMS)
+    MODES = ("l1", "l2", "orientation", "nms")
+
+    @staticmethod
+    def kernels(operator: str = "sobel") -> tuple:
+        """Retourne le couple de noyaux (kx, ky) de l'opérateur demandé."""
+        if operator not in GradientEngine.KERNELS:
+            raise ValueError(f"Opérateur inconnu : {operator} "
+                             f"(attendu : {', '.join(GradientEngine.KERNELS)})")
+        kx = GradientEngine.KERNELS[operator]
+        return kx, kx.T
+
+    @staticmethod
+    def compute(image: np.ndarray, operator: str = "sobel", modes: tuple = MODES,
+                border: str = "zero") -> dict:
+        """
+        Calcule le gradient et toutes les sorties demandées en un seul appel.
+
+        Args:
+            image (np.ndarray): Matrice 2D ou pile (..., H, W).
+            operator (str): 'sobel', 'scharr' ou 'prewitt'.
+            modes (tuple): Sous-ensemble de MODES à produire.
+            border (str): Mode de gestion des bords (voir FilterEngine.BORDER_MODES).
+
+        Returns:
+            dict: 'gx', 'gy' et une entrée par mode demandé, tous en float32 brut.
+        """
+        unknown = set(modes) - set(GradientEngine.MODES)
+        if unknown:
+            raise ValueError(f"Mode(s) de gradient inconnu(s) : {', '.join(sorted(unknown))}")
+
+        kx, ky = GradientEngine.kernels(operator)
+        gx, gy = GradientEngine._derivatives(image, kx, ky, border)
+        result = {"gx": gx, "gy": gy}
+
+        with Profiler.stage("magnitude"):
+            if "l1" in modes:
+                result["l1"] = np.abs(gx) + np.abs(gy)
+            if "l2" in modes or "nms" in modes:
+                magnitude = np.hypot(gx, gy)
+                if "l2" in modes:
+                    result["l2"] = magnitude
+        if "orientation" in modes or "nms" in modes:
+            with Profiler.stage("orientation"):
+                orientation = np.arctan2(gy, gx)
+            if "orientation" in modes:
+                result["orientation"] = orientation
+        if "nms" in modes:
+            with Profiler.stage("nms"):
+                result["nms"] = GradientEngine.non_max_suppression(magnitude, orientation)
+        return result
+
+    @staticmethod
+    def non_max_suppression(magnitude: np.ndarray, orientation: np.ndarray) -> np.ndarray:
+        """
+        Affinage des contours : un pixel n'est conservé que s'il est maximal
+        le long de la direction du gradient (quantifiée sur 4 directions).
+        """
+        h, w = magnitude.shape[-2:]
+        padded = FilterEngine.pad(magnitude, 1, 1, "zero")
+
+        # Direction quantifiée : 0 = horizontale, 1 = 45°, 2 = verticale, 3 = 135°
+        sector = np.round(orientation / (np.pi / 4)).astype(np.int8) % 4
+
+        # Voisins (di, dj) de part et d'autre du pixel pour chaque direction (axe y vers le bas)
+        offsets = ((0, 1), (1, 1), (1, 0), (1, -1))
+        keep = np.zeros(magnitude.shape, dtype=bool)
+        for direction, (di, dj) in enumerate(offsets):
+            forward = padded[..., 1 + di:1 + di + h, 1 + dj:1 + dj + w]
+            backward = padded[..., 1 - di:1 - di + h, 1 - dj:1 - dj + w]
+            # Inégalité stricte d'un côté : un plateau de 2 pixels ne garde qu'un seul pixel
+            is_max = (magnitude >= forward) & (magnitude > backward)
+            keep |= (sector == direction) & is_max
+
+        return np.where(keep, magnitude, np.float32(0))
+
+    @staticmethod
+    def quantize(values: np.ndarray, value_range: tuple = None) -> np.ndarray:
+        """
+        Conversion finale explicite en uint8.
+
+        Args:
+            values (np.ndarray): Résultat flottant brut.
+            value_range (tuple): (min, max) ramené linéairement sur [0, 255].
+                Sans plage, les valeurs sont simplement saturées dans [0, 255].
+        """
+        with Profiler.stage("clip"):
+            if value_range is not None:
+                low, high = value_range
+                values = (values - low) * (255.0 / (high - low))
+            return np.clip(values, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def _derivatives(image: np.ndarray, kx: np.ndarray, ky: np.ndarray, border: str) -> tuple:
+        """Évalue kx et ky ensemble : chaque tranche décalée n'est lue qu'une fois."""
+        h, w = image.shape[-2:]
+        k_h, k_w = kx.shape
+        with Profiler.stage("pad"):
+            padded = FilterEngine.pad(image.astype(np.float32, copy=False), k_h // 2, k_w // 2, border)
+
+        with Profiler.stage("convolution"):
+            gx = np.zeros(image.shape, dtype=np.float32)
+            gy = np.zeros(image.shape, dtype=np.float32)
+            tmp = np.empty(image.shape, dtype=np.float32)
+            for (di, dj), cx in np.ndenumerate(kx):
+                cy = ky[di, dj]
+                if cx == 0 and cy == 0:
+                    continue
+                window = padded[..., di:di + h, dj:dj + w]
+                if cx != 0:
+                    np.multiply(window, cx, out=tmp)
+                    gx += tmp
+                if cy != 0:
+                    np.multiply(window, cy, out=tmp)
+                    gy += tmp
+        return gx, gy
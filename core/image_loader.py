@@ -1,6 +1,14 @@
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageSequence
+import io
+import logging
 import os
+import secrets
+import stat
+
+from core.layout import ImageLayout
+
+logger = logging.getLogger(__name__)
 
 class ImageLoader:
     """
@@ -8,49 +16,411 @@ class ImageLoader:
     Fait l'interface entre le système de fichiers et les matrices NumPy.
     """
 
+    # Modes de chargement : niveaux de gris (historique) ou couleur conservée
+    MODES = ("L", "RGB")
+
+    # Formats lus sans décodage : les pixels sont projetés en mémoire (np.memmap)
+    MAPPED_EXTENSIONS = (".npy", ".pgm", ".ppm")
+
+    # Formats écrits sans encodeur Pillow (en-tête + pixels bruts)
+    UNCOMPRESSED_EXTENSIONS = (".npy", ".pgm", ".ppm", ".raw")
+
+    # Formats explicites (format=...) écrits par le même chemin sans encodeur
+    UNCOMPRESSED_FORMATS = {"NPY": ".npy", "RAW": ".raw"}
+
+    # Tampon d'écriture des fichiers encodés (une seule série de gros appels système)
+    WRITE_BUFFER = 1 << 20
+
     @staticmethod
-    def load(filepath: str) -> np.ndarray:
+    def load(filepath: str, target_size: tuple = None, writable: bool = True, mode: str = "L",
+             frames: bool = False) -> np.ndarray:
         """
-        Charge une image depuis un chemin et la convertit en matrice Niveaux de Gris.
-        
+        Charge une image depuis un chemin et la convertit en matrice Niveaux de Gris
+        (ou RGB avec mode='RGB').
+
         Args:
             filepath (str): Chemin complet vers l'image.
-            
+            target_size (tuple): (Largeur, Hauteur) maximales pour un aperçu. Les JPEG sont
+                alors réduits pendant le décodage (mode draft de Pillow, dans le domaine DCT).
+            writable (bool): False évite la copie finale (matrice en lecture seule) : décodage
+                Pillow sans copie, et les formats projetés (.npy, PGM, PPM) sont renvoyés en
+                np.memmap lecture seule, sans lecture ni copie. Par défaut, la matrice est
+                toujours un tableau en mémoire, indépendant du fichier.
+            mode (str): 'L' (niveaux de gris) ou 'RGB' (trois canaux, axe en dernier).
+            frames (bool): Lit toutes les trames (TIFF multipage, GIF / WebP animé, pile
+                .npy) dans une seule pile contiguë (N, H, W) ou (N, H, W, 3), traitable
+                en un appel par ImageProcessor.
+
         Returns:
-            np.ndarray: Matrice 2D (uint8) représentant l'image.
+            np.ndarray: Matrice uint8 (H, W), (H, W, 3), (N, H, W) ou (N, H, W, 3).
         """
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Fichier introuvable : {filepath}")
+        if mode not in ImageLoader.MODES:
+            raise ValueError(f"Mode inconnu : {mode} (attendu : {', '.join(ImageLoader.MODES)})")
+
+        if filepath.lower().endswith(ImageLoader.MAPPED_EXTENSIONS):
+            matrix = ImageLoader._load_mapped(filepath, target_size, mode, frames, writable)
+            if matrix is not None:
+                return matrix
 
         try:
             # 1. Ouverture avec Pillow (gère tous les formats : jpg, png, etc.)
             with Image.open(filepath) as img:
-                # 2. Conversion explicite en Niveaux de Gris ('L' = Luminance)
-                img_gray = img.convert('L')
-                
-                # 3. Transformation en matrice NumPy
-                # dtype=uint8 est CRUCIAL pour économiser la mémoire (0-255)
-                matrix = np.array(img_gray, dtype=np.uint8)
-                
-                return matrix
+                return ImageLoader._decode_pillow(img, target_size, mode, frames, writable)
         except Exception as e:
             raise ValueError(f"Erreur lors du chargement de l'image : {e}")
 
     @staticmethod
-    def save(matrix: np.ndarray, filepath: str):
+    def decode(source, target_size: tuple = None, mode: str = "L", frames: bool = False,
+               writable: bool = True) -> np.ndarray:
+        """
+        Décode une image reçue en mémoire ou en flux (octets ou objet fichier binaire
+        positionnable, ex. tempfile.SpooledTemporaryFile) : mêmes options et même résultat
+        que load(). Les tableaux .npy sont reconnus à leur signature.
+        """
+        if mode not in ImageLoader.MODES:
+            raise ValueError(f"Mode inconnu : {mode} (attendu : {', '.join(ImageLoader.MODES)})")
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        try:
+            start = source.tell()
+            is_npy = source.read(len(np.lib.format.MAGIC_PREFIX)) == np.lib.format.MAGIC_PREFIX
+            source.seek(start)
+            if is_npy:
+                array = np.load(source, allow_pickle=False)
+                if array.dtype != np.uint8 or array.ndim not in (2, 3, 4):
+                    raise ValueError(f"tableau {array.dtype} de forme {array.shape} (attendu : uint8, 2 à 4 axes)")
+                return ImageLoader._as_mode(array, target_size, mode, frames, "le tableau reçu")
+            with Image.open(source) as img:
+                return ImageLoader._decode_pillow(img, target_size, mode, frames, writable)
+        except Exception as e:
+            raise ValueError(f"Erreur lors du décodage de l'image : {e}")
+
+    @staticmethod
+    def info(filepath: str) -> dict:
+        """
+        Dimensions et mode d'une image sans décoder ses pixels (lecture de l'en-tête).
+
+        Returns:
+            dict: width, height, mode, format et frames (nombre de trames).
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Fichier introuvable : {filepath}")
+
+        lower = filepath.lower()
+        if lower.endswith(".npy"):
+            with open(filepath, "rb") as f:
+                if np.lib.format.read_magic(f) == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+            layout = ImageLayout.classify(shape)
+            color = layout in ("channels", "stack_channels")
+            count = shape[0] if layout in ("stack", "stack_channels") else 1
+            height, width = shape[-3:-1] if color else shape[-2:]
+            return {"width": width, "height": height, "mode": "RGB" if color else "L", "format": "NPY",
+                    "dtype": dtype.str, "frames": count}
+        if lower.endswith((".pgm", ".ppm")):
+            header = ImageLoader._read_pnm_header(filepath)
+            if header is not None:
+                magic, width, height, maxval, _ = header
+                mode = ("L" if magic == b"P5" else "RGB") if maxval < 256 else "I;16"
+                return {"width": width, "height": height, "mode": mode, "format": "PPM", "frames": 1}
+        try:
+            with Image.open(filepath) as img: # Pillow ne lit que l'en-tête à l'ouverture
+                return {"width": img.width, "height": img.height, "mode": img.mode, "format": img.format,
+                        "frames": getattr(img, "n_frames", 1)}
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture de l'en-tête : {e}")
+
+    @staticmethod
+    def save(matrix: np.ndarray, filepath: str, format: str = None, quality: int = None,
+             compress_level: int = None, optimize: bool = False):
         """
         Sauvegarde une matrice NumPy en fichier image.
-        
+
         Args:
             matrix (np.ndarray): La matrice de pixels.
             filepath (str): Chemin de destination.
+            format (str): Format Pillow explicite ('PNG', 'JPEG'...), sinon déduit de l'extension.
+            quality (int): Qualité JPEG / WebP (1-95) : plus bas = plus petit et plus rapide.
+            compress_level (int): Niveau zlib PNG (0 : aucun, 1 : rapide ... 9 : plus petit).
+            optimize (bool): Passe d'optimisation de l'encodeur (plus petit, plus lent).
+
+        Les extensions .npy, .pgm, .ppm et .raw sont écrites sans encodeur (en-tête + pixels).
+        Une pile (N, H, W[, 3]) est écrite en un seul fichier multi-trames (TIFF, GIF, WebP...).
+        L'image est écrite dans un fichier temporaire du même dossier, puis renommée sur la
+        destination : réécrire le fichier source d'une matrice projetée (load(...,
+        writable=False)) ou interrompre l'écriture ne corrompt jamais le fichier existant.
         """
+        extension = os.path.splitext(filepath)[1].lower()
+        if format is None and extension in ImageLoader.UNCOMPRESSED_EXTENSIONS:
+            uncompressed = extension
+        else:
+            uncompressed = ImageLoader.UNCOMPRESSED_FORMATS.get((format or "").upper())
+        temporary = None
         try:
-            # 1. Conversion de NumPy vers Objet Image Pillow
-            img = Image.fromarray(matrix)
-            
-            # 2. Sauvegarde (le format est déduit de l'extension du fichier)
-            img.save(filepath)
-            print(f"Image sauvegardée : {filepath}")
+            descriptor, temporary = ImageLoader._create_temporary(filepath)
+            # Lecture-écriture : l'écriture TIFF multipage relit les en-têtes déjà écrits
+            with os.fdopen(descriptor, "w+b", buffering=ImageLoader.WRITE_BUFFER) as f:
+                if uncompressed is not None:
+                    ImageLoader._save_uncompressed(matrix, f, uncompressed)
+                else:
+                    # Le format est déduit de l'extension du fichier si non précisé.
+                    format = format or Image.registered_extensions().get(extension)
+                    if format is None:
+                        raise ValueError(f"format inconnu pour l'extension '{extension}'")
+                    ImageLoader._encode_pillow(matrix, f, format, quality, compress_level, optimize)
+            if os.path.exists(filepath):
+                # Réécriture : le fichier garde ses droits, comme avec open(filepath, "wb")
+                os.chmod(temporary, stat.S_IMODE(os.stat(filepath).st_mode))
+            os.replace(temporary, filepath)
         except Exception as e:
-            print(f"Erreur sauvegarde : {e}")
\ No newline at end of file
+            if temporary is not None and os.path.exists(temporary):
+                os.remove(temporary)
+            raise ValueError(f"Erreur lors de la sauvegarde de l'image : {e}")
+        logger.info("Image sauvegardée : %s", filepath)
+
+    @staticmethod
+    def encode(matrix: np.ndarray, target, format: str = "PNG", quality: int = None,
+               compress_level: int = None, optimize: bool = False):
+        """
+        Encode une matrice dans un objet fichier binaire (réponse réseau, fichier temporaire),
+        avec les options de save(). format='NPY' écrit le tableau (np.save), 'RAW' les
+        pixels bruts. Une pile est encodée en multi-trames : la cible doit alors être
+        lisible et positionnable.
+        """
+        try:
+            uncompressed = ImageLoader.UNCOMPRESSED_FORMATS.get(format.upper())
+            if uncompressed is not None:
+                ImageLoader._save_uncompressed(matrix, target, uncompressed)
+            else:
+                ImageLoader._encode_pillow(matrix, target, format, quality, compress_level, optimize)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de l'encodage de l'image : {e}")
+
+    @staticmethod
+    def open_memmap(filepath: str, shape: tuple = None, dtype=np.uint8, offset: int = 0) -> np.ndarray:
+        """
+        Ouvre une image stockée en .npy, PGM / PPM binaire ou brut sans la charger en mémoire.
+
+        Args:
+            filepath (str): Fichier .npy, .pgm / .ppm, ou fichier brut (shape obligatoire).
+            shape (tuple): (Hauteur, Largeur) pour un fichier brut.
+            dtype: Type des pixels d'un fichier brut.
+            offset (int): Octets d'en-tête à ignorer dans un fichier brut.
+
+        Returns:
+            np.ndarray: np.memmap en lecture seule ; les pixels sont lus à la demande.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Fichier introuvable : {filepath}")
+
+        lower = filepath.lower()
+        if lower.endswith(".npy"):
+            return np.load(filepath, mmap_mode='r')
+        if lower.endswith((".pgm", ".ppm")):
+            mapped = ImageLoader._map_pnm(filepath, mode='r')
+            if mapped is None:
+                raise ValueError(f"Fichier PGM / PPM non projetable (format ASCII) : {filepath}")
+            return mapped
+        if shape is None:
+            raise ValueError("La forme (hauteur, largeur) est requise pour un fichier brut.")
+        return np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+
+    @staticmethod
+    def create_memmap(filepath: str, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """
+        Crée une image de sortie adossée à un fichier (.npy, sinon binaire brut).
+        Les écritures vont directement sur le disque : seules les pages touchées
+        occupent la mémoire.
+        """
+        if filepath.lower().endswith(".npy"):
+            return np.lib.format.open_memmap(filepath, mode='w+', dtype=dtype, shape=tuple(shape))
+        return np.memmap(filepath, dtype=dtype, mode='w+', shape=tuple(shape))
+
+    # --- DÉCODAGE / ENCODAGE PILLOW ---
+
+    @staticmethod
+    def _decode_pillow(img, target_size: tuple, mode: str, frames: bool, writable: bool) -> np.ndarray:
+        if frames:
+            return ImageLoader._read_frames(img, target_size, mode)
+
+        # 2. Conversion explicite en Niveaux de Gris ('L' = Luminance) ou en RGB
+        converted = ImageLoader._convert(img, target_size, mode)
+
+        # 3. Transformation en matrice NumPy
+        # dtype=uint8 est CRUCIAL pour économiser la mémoire (0-255)
+        if writable:
+            return np.array(converted, dtype=np.uint8)
+        return np.asarray(converted, dtype=np.uint8)
+
+    @staticmethod
+    def _encode_pillow(matrix: np.ndarray, target, format: str, quality: int, compress_level: int,
+                       optimize: bool):
+        # 1. Conversion de NumPy vers Objet(s) Image Pillow (une par trame d'une pile)
+        if ImageLayout.is_stack(matrix):
+            img, *others = [Image.fromarray(frame) for frame in matrix]
+            options = {"save_all": True, "append_images": others}
+        else:
+            img = Image.fromarray(matrix)
+            options = {}
+
+        # 2. Écriture avec les options de l'encodeur
+        if quality is not None:
+            options["quality"] = quality
+        if compress_level is not None:
+            options["compress_level"] = compress_level
+        if optimize:
+            options["optimize"] = True
+        img.save(target, format=format, **options)
+
+    @staticmethod
+    def _convert(img, target_size: tuple, mode: str, keep_source: bool = False):
+        """Image Pillow dans le mode demandé, réduite à target_size (aperçu) si donné."""
+        if target_size is not None:
+            # JPEG : décodage directement dans le mode voulu à l'échelle 1/2, 1/4 ou 1/8
+            img.draft(mode, tuple(target_size))
+        converted = img if img.mode == mode else img.convert(mode)
+        if target_size is not None:
+            if keep_source and converted is img:
+                # thumbnail() travaille en place : la trame courante d'une séquence doit rester intacte
+                converted = img.copy()
+            converted.thumbnail(tuple(target_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return converted
+
+    @staticmethod
+    def _read_frames(img, target_size: tuple, mode: str) -> np.ndarray:
+        """Toutes les trames dans une pile contiguë pré-allouée (une seule allocation)."""
+        count = getattr(img, "n_frames", 1)
+        stack = None
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            pixels = np.asarray(ImageLoader._convert(frame, target_size, mode, keep_source=True),
+                                dtype=np.uint8)
+            if stack is None:
+                stack = np.empty((count,) + pixels.shape, dtype=np.uint8)
+            elif pixels.shape != stack.shape[1:]:
+                raise ValueError(f"La trame {index} ({pixels.shape}) n'a pas la taille de la première "
+                                 f"({stack.shape[1:]}).")
+            stack[index] = pixels
+        return stack
+
+    # --- FORMATS PROJETÉS ---
+
+    @staticmethod
+    def _load_mapped(filepath: str, target_size: tuple, mode: str = "L", frames: bool = False,
+                     writable: bool = True):
+        """
+        Chargement sans décodage : np.memmap en lecture seule, sous-échantillonné par un pas
+        entier si target_size est donné, puis copié en mémoire si writable (seuls les pixels
+        retenus sont lus). None si le fichier doit passer par Pillow.
+        """
+        if filepath.lower().endswith(".npy"):
+            mapped = np.load(filepath, mmap_mode='r')
+        else:
+            mapped = ImageLoader._map_pnm(filepath, mode='r')
+        if mapped is None or mapped.dtype != np.uint8 or mapped.ndim not in (2, 3, 4):
+            return None
+        matrix = ImageLoader._as_mode(mapped, target_size, mode, frames, filepath)
+        if writable and np.may_share_memory(matrix, mapped):
+            # Tableau indépendant du fichier : il peut être modifié, et le fichier réécrit
+            matrix = np.array(matrix)
+        return matrix
+
+    @staticmethod
+    def _as_mode(mapped: np.ndarray, target_size: tuple, mode: str, frames: bool, name: str) -> np.ndarray:
+        """Tableau uint8 déjà en mémoire (ou projeté) ramené au mode, à la pile et à la taille demandés."""
+        layout = ImageLayout.classify(mapped.shape)
+        if frames and layout in ("image", "channels"):
+            mapped = mapped[np.newaxis] # Image seule : pile d'une trame
+        elif not frames and layout in ("stack", "stack_channels"):
+            raise ValueError(f"{name} contient une pile de {mapped.shape[0]} images : charger avec frames=True.")
+        color = ImageLayout.channels_last(mapped)
+
+        if target_size is not None:
+            h, w = mapped.shape[-3:-1] if color else mapped.shape[-2:]
+            step = max(1, -(-w // target_size[0]), -(-h // target_size[1]))
+            mapped = mapped[..., ::step, ::step, :] if color else mapped[..., ::step, ::step]
+        if color and mode == "L":
+            return ImageLoader._luminance(mapped)
+        if not color and mode == "RGB":
+            return np.repeat(mapped[..., np.newaxis], 3, axis=-1)
+        if color:
+            mapped = mapped[..., :3]
+        return mapped.view(np.ndarray)
+
+    @staticmethod
+    def _luminance(rgb: np.ndarray) -> np.ndarray:
+        """Conversion RGB -> L identique à Pillow (ITU-R 601-2, arithmétique entière 16 bits)."""
+        rgb = rgb[..., :3]
+        weighted = rgb[..., 0] * np.uint32(19595)
+        weighted += rgb[..., 1] * np.uint32(38470)
+        weighted += rgb[..., 2] * np.uint32(7471)
+        weighted += np.uint32(0x8000)
+        return (weighted >> 16).astype(np.uint8)
+
+    @staticmethod
+    def _read_pnm_header(filepath: str):
+        """En-tête d'un PGM (P5) / PPM (P6) binaire : (magic, largeur, hauteur, maxval, offset)."""
+        with open(filepath, "rb") as f:
+            data = f.read(512)
+        if data[:2] not in (b"P5", b"P6"):
+            return None
+        fields, position = [], 2
+        while len(fields) < 3:
+            # Blancs et commentaires (# ... fin de ligne) entre les champs
+            while position < len(data) and (data[position:position + 1].isspace() or data[position:position + 1] == b"#"):
+                if data[position:position + 1] == b"#":
+                    position = data.find(b"\n", position)
+                    if position < 0:
+                        return None
+                position += 1
+            start = position
+            while position < len(data) and data[position:position + 1].isdigit():
+                position += 1
+            if start == position:
+                return None
+            fields.append(int(data[start:position]))
+        # Un seul blanc sépare maxval des pixels
+        width, height, maxval = fields
+        return data[:2], width, height, maxval, position + 1
+
+    @staticmethod
+    def _map_pnm(filepath: str, mode: str):
+        header = ImageLoader._read_pnm_header(filepath)
+        if header is None:
+            return None
+        magic, width, height, maxval, offset = header
+        dtype = np.uint8 if maxval < 256 else np.dtype(">u2")
+        shape = (height, width) if magic == b"P5" else (height, width, 3)
+        return np.memmap(filepath, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+    @staticmethod
+    def _create_temporary(filepath: str) -> tuple:
+        """
+        Fichier temporaire caché à côté de filepath : (descripteur, chemin). Créé en 0666
+        comme par open() : le masque de création (umask) du processus s'applique.
+        """
+        directory, name = os.path.split(os.path.abspath(filepath))
+        flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        while True:
+            temporary = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+            try:
+                return os.open(temporary, flags, 0o666), temporary
+            except FileExistsError:
+                continue
+
+    @staticmethod
+    def _save_uncompressed(matrix: np.ndarray, f, extension: str):
+        if extension == ".npy":
+            np.save(f, matrix)
+            return
+        matrix = np.ascontiguousarray(matrix)
+        if extension in (".pgm", ".ppm"):
+            if matrix.dtype != np.uint8 or ImageLayout.classify(matrix.shape) not in ("image", "channels") \
+                    or (matrix.ndim == 3 and matrix.shape[2] != 3):
+                raise ValueError("Le PGM / PPM brut attend une image uint8 (2D ou RGB).")
+            magic = b"P5" if matrix.ndim == 2 else b"P6"
+            f.write(magic + f"\n{matrix.shape[1]} {matrix.shape[0]}\n255\n".encode())
+        f.write(memoryview(matrix).cast("B"))
@@ -0,0 +1,58 @@
+import numpy as np
+
+class ImageLayout:
+    """
+    Disposition des axes d'une image ou d'un lot d'images.
+
+    Les moteurs travaillent sur des plans : les deux derniers axes sont spatiaux (H, W),
+    tous les axes qui les précèdent sont des axes de lot, traités ensemble par les mêmes
+    opérations vectorisées. Formes acceptées par ImageProcessor :
+    - (H, W)          image en niveaux de gris ;
+    - (H, W, C)       image multicanal (RGB, RGBA...), C <= MAX_CHANNELS ;
+    - (N, H, W)       pile d'images ou de trames vidéo ;
+    - (N, H, W, C)    pile d'images multicanal.
+
+    Un tableau 3D dont le dernier axe compte au plus MAX_CHANNELS éléments est lu comme
+    une image multicanal (une pile de trames de 4 pixels de large n'a pas de sens) ; une
+    pile d'images monocanal ambiguë s'écrit (N, H, W, 1).
+    """
+
+    # Nombre maximal de canaux d'un axe couleur (RGBA)
+    MAX_CHANNELS = 4
+
+    @staticmethod
+    def classify(shape: tuple) -> str:
+        """'image', 'channels', 'stack' ou 'stack_channels' selon la forme."""
+        ndim = len(shape)
+        if ndim == 2:
+            return "image"
+        if ndim == 3:
+            return "channels" if shape[-1] <= ImageLayout.MAX_CHANNELS else "stack"
+        if ndim == 4:
+            return "stack_channels"
+        raise ValueError(f"Forme d'image non prise en charge : {tuple(shape)} "
+                         f"(attendu : (H, W), (H, W, C), (N, H, W) ou (N, H, W, C))")
+
+    @staticmethod
+    def channels_last(image: np.ndarray) -> bool:
+        """Vrai si le dernier axe est un axe de canaux."""
+        return ImageLayout.classify(image.shape) in ("channels", "stack_channels")
+
+    @staticmethod
+    def is_stack(image: np.ndarray) -> bool:
+        """Vrai si le premier axe énumère des images indépendantes (N)."""
+        return ImageLayout.classify(image.shape) in ("stack", "stack_channels")
+
+    @staticmethod
+    def planes(image: np.ndarray) -> np.ndarray:
+        """Vue (..., H, W) de l'image : l'axe des canaux passe devant les axes spatiaux, sans copie."""
+        if ImageLayout.channels_last(image):
+            return np.moveaxis(image, -1, -3)
+        return image
+
+    @staticmethod
+    def restore(result: np.ndarray, image: np.ndarray) -> np.ndarray:
+        """Remet un résultat calculé sur planes(image) dans la disposition de l'image (contiguë)."""
+        if ImageLayout.channels_last(image) and result.ndim == image.ndim:
+            return np.ascontiguousarray(np.moveaxis(result, -3, -1))
+        return result
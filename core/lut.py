@@ -0,0 +1,120 @@
+import numpy as np
+
+class PointLUT:
+    """
+    Tables de correspondance (LUT) à 256 entrées des transformations ponctuelles.
+    Une transformation ponctuelle uint8 -> uint8 est entièrement décrite par sa LUT :
+    deux LUT se composent en une seule, et l'histogramme de sortie se déduit de
+    l'histogramme d'entrée sans relire l'image.
+    """
+
+    LEVELS = np.arange(256)
+
+    @staticmethod
+    def histogram(image: np.ndarray) -> np.ndarray:
+        """Histogramme 256 niveaux d'une image uint8 en une seule passe (np.bincount)."""
+        return np.bincount(image.ravel(), minlength=256)
+
+    @staticmethod
+    def frame_levels(image: np.ndarray) -> np.ndarray:
+        """
+        Niveaux d'une pile uint8 (N, ...) décalés de 256 * i dans la trame i : un seul
+        index sert aux N histogrammes (frame_histograms) et aux N LUT empilées
+        (np.take(luts.ravel(), levels)).
+        """
+        n = image.shape[0]
+        return image + (np.arange(n, dtype=np.intp) * 256).reshape((n,) + (1,) * (image.ndim - 1))
+
+    @staticmethod
+    def frame_histograms(levels: np.ndarray) -> np.ndarray:
+        """Histogrammes (N, 256) des N trames en un seul np.bincount (niveaux de frame_levels)."""
+        n = levels.shape[0]
+        return np.bincount(levels.ravel(), minlength=n * 256).reshape(n, 256)
+
+    @staticmethod
+    def remap_histogram(hist: np.ndarray, lut: np.ndarray) -> np.ndarray:
+        """Histogramme de lut[image] calculé à partir de l'histogramme de image (256 opérations)."""
+        return np.bincount(lut, weights=hist, minlength=256).astype(np.int64)
+
+    @staticmethod
+    def compose(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """LUT équivalente à appliquer `first` puis `second`."""
+        return second[first]
+
+    @staticmethod
+    def identity() -> np.ndarray:
+        return PointLUT.LEVELS.astype(np.uint8)
+
+    @staticmethod
+    def inverse() -> np.ndarray:
+        """Négatif : s = 255 - r."""
+        return (255 - PointLUT.LEVELS).astype(np.uint8)
+
+    @staticmethod
+    def gamma(gamma: float) -> np.ndarray:
+        """Correction gamma : s = 255 * (r / 255) ^ (1 / gamma)."""
+        inv_gamma = 1.0 / gamma
+        return (((PointLUT.LEVELS / 255.0) ** inv_gamma) * 255).astype(np.uint8)
+
+    @staticmethod
+    def stretch(hist: np.ndarray) -> np.ndarray:
+        """Étirement linéaire : s = 255 * (r - min) / (max - min), min et max lus dans l'histogramme."""
+        present = np.flatnonzero(hist)
+        if present.size == 0 or present[0] == present[-1]:
+            return PointLUT.identity() # Image unie
+        i_min, i_max = present[0], present[-1]
+        stretched = 255.0 * (PointLUT.LEVELS - i_min) / (i_max - i_min)
+        return np.clip(stretched, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def equalize(hist: np.ndarray) -> np.ndarray:
+        """Égalisation : CDF normalisée sur [0, 255], en ignorant les niveaux absents en tête."""
+        cdf = hist.cumsum()
+        present = cdf > 0
+        if not present.any():
+            return np.zeros(256, dtype=np.uint8)
+        cdf_min, cdf_max = cdf[present][0], cdf[-1]
+        if cdf_max == cdf_min:
+            # Même comportement que la version masquée d'origine : division par zéro -> 0
+            return np.zeros(256, dtype=np.uint8)
+        lut = (cdf - cdf_min) * 255 / (cdf_max - cdf_min)
+        return np.where(present, lut, 0).astype(np.uint8)
+
+    @staticmethod
+    def threshold(value: int) -> np.ndarray:
+        """Binarisation : 255 au-dessus du seuil, 0 sinon."""
+        return np.where(PointLUT.LEVELS > value, 255, 0).astype(np.uint8)
+
+    @staticmethod
+    def otsu_threshold(hist: np.ndarray) -> int:
+        """
+        Seuil d'Otsu (maximisation de la variance inter-classe) lu sur l'histogramme.
+        Les 256 seuils candidats sont évalués d'un coup à partir des sommes cumulées
+        (poids et moments des pixels <= t) ; en cas d'égalité, le plus petit seuil l'emporte.
+        """
+        hist = np.asarray(hist, dtype=np.int64)
+        weight_back = np.cumsum(hist)
+        sum_back = np.cumsum(PointLUT.LEVELS * hist)
+        weight_fore = weight_back[-1] - weight_back
+        sum_fore = sum_back[-1] - sum_back
+
+        valid = (weight_back > 0) & (weight_fore > 0)
+        if not valid.any():
+            return 0 # Image unie : aucun seuil ne sépare deux classes
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_back = sum_back / weight_back
+            mean_fore = sum_fore / weight_fore
+            # Variance inter-classe (Formule d'Otsu)
+            var_between = weight_back * weight_fore * (mean_back - mean_fore) ** 2
+        var_between = np.where(valid, var_between, 0.0)
+        threshold = int(np.argmax(var_between))
+        return threshold if var_between[threshold] > 0 else 0
+
+    @staticmethod
+    def classes(thresholds) -> np.ndarray:
+        """
+        Quantification en len(thresholds) + 1 classes réparties sur [0, 255] :
+        la classe i regroupe les niveaux de ]t(i-1), t(i)].
+        """
+        index = np.searchsorted(np.asarray(thresholds), PointLUT.LEVELS, side="left")
+        return (index * 255 // max(1, len(thresholds))).astype(np.uint8)
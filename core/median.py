@@ -0,0 +1,182 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.filters import FilterEngine
+from core.profiling import Profiler
+
+class MedianEngine:
+    """
+    Filtre médian vectorisé.
+    - Petites fenêtres : vues glissantes + np.partition (sélection sans tri complet).
+    - Grandes fenêtres (uint8) : histogrammes de colonnes glissants à la Perreault-Hébert,
+      dont le coût par pixel ne dépend pas du rayon.
+    Le résultat est identique, bit à bit, à np.median appliqué fenêtre par fenêtre.
+    Une pile (..., H, W) est traitée d'un bloc : les plans partagent les mêmes appels.
+    """
+
+    # Taille de fenêtre maximale traitée par np.partition en mode 'auto'
+    PARTITION_MAX_SIZE = 9
+
+    # Nombre d'éléments maximal matérialisé à la fois par le chemin np.partition
+    PARTITION_CHUNK_ELEMENTS = 1 << 24
+
+    # Nombre de compteurs d'histogrammes de colonnes (plans x colonnes x 256) alloués à la fois
+    HISTOGRAM_CHUNK_BINS = 1 << 24
+
+    @staticmethod
+    def median(image: np.ndarray, size: int = 3, border: str = "edge",
+               method: str = "auto") -> np.ndarray:
+        """
+        Applique un filtre médian size x size.
+
+        Args:
+            image (np.ndarray): Matrice 2D ou pile (..., H, W).
+            size (int): Côté de la fenêtre (pair ou impair).
+            border (str): Mode de gestion des bords (voir FilterEngine.BORDER_MODES).
+            method (str): 'partition', 'histogram' ou 'auto'.
+
+        Returns:
+            np.ndarray: Image filtrée, de même type que l'entrée.
+        """
+        if size < 1:
+            raise ValueError("La taille de la fenêtre doit être >= 1.")
+        with Profiler.stage("pad"):
+            padded = FilterEngine.pad(image, size // 2, size // 2, border)
+
+        if method == "auto":
+            use_histogram = image.dtype == np.uint8 and size > MedianEngine.PARTITION_MAX_SIZE
+            method = "histogram" if use_histogram else "partition"
+
+        # Axes de lot regroupés en un seul : (plans, H + 2r, W + 2r), sans copie après np.pad
+        planes = padded.reshape((-1,) + padded.shape[-2:])
+        if method == "partition":
+            with Profiler.stage("partition"):
+                output = MedianEngine._median_partition(planes, size, image.shape[-2:])
+        elif method == "histogram":
+            if image.dtype != np.uint8:
+                raise ValueError("Le médian par histogramme n'accepte que des images uint8.")
+            with Profiler.stage("histogram"):
+                output = MedianEngine._median_histogram(planes, size, image.shape[-2:])
+        else:
+            raise ValueError(f"Méthode de médian inconnue : {method}")
+        return output.reshape(image.shape)
+
+    @staticmethod
+    def _ranks(size: int) -> tuple:
+        """Rangs des deux éléments centraux (identiques si la fenêtre est impaire)."""
+        n = size * size
+        return (n - 1) // 2, n // 2
+
+    @staticmethod
+    def _combine(low: np.ndarray, high: np.ndarray, dtype) -> np.ndarray:
+        """Moyenne des deux éléments centraux, tronquée comme l'affectation de np.median."""
+        if np.issubdtype(dtype, np.integer):
+            return ((low.astype(np.int64) + high) // 2).astype(dtype)
+        return ((low + high) / 2).astype(dtype)
+
+    @staticmethod
+    def _median_partition(padded: np.ndarray, size: int, out_shape: tuple) -> np.ndarray:
+        """
+        Sélection par np.partition sur des blocs (mémoire bornée) : plusieurs plans entiers
+        par bloc pour les petites images, des groupes de lignes d'un plan pour les grandes.
+        """
+        h, w = out_shape
+        n_planes = padded.shape[0]
+        low_rank, high_rank = MedianEngine._ranks(size)
+        windows = sliding_window_view(padded, (size, size), axis=(1, 2))[:, :h, :w]
+        output = np.empty((n_planes, h, w), dtype=padded.dtype)
+
+        rows_per_chunk = max(1, MedianEngine.PARTITION_CHUNK_ELEMENTS // (w * size * size))
+        planes_per_chunk = max(1, rows_per_chunk // h)
+        for first in range(0, n_planes, planes_per_chunk):
+            last = min(first + planes_per_chunk, n_planes)
+            for start in range(0, h, rows_per_chunk):
+                stop = min(start + rows_per_chunk, h)
+                block = windows[first:last, start:stop].reshape(last - first, stop - start, w, size * size)
+                block = np.partition(block, (low_rank, high_rank), axis=-1)
+                if low_rank == high_rank:
+                    output[first:last, start:stop] = block[..., low_rank]
+                else:
+                    output[first:last, start:stop] = MedianEngine._combine(block[..., low_rank],
+                                                                           block[..., high_rank], padded.dtype)
+        return output
+
+    @staticmethod
+    def _median_histogram(padded: np.ndarray, size: int, out_shape: tuple) -> np.ndarray:
+        """
+        Histogrammes de colonnes glissants (Perreault-Hébert).
+        Chaque colonne garde l'histogramme de ses `size` pixels courants : descendre d'une
+        ligne ne coûte qu'un retrait et un ajout par colonne. L'histogramme de chaque fenêtre
+        est ensuite la somme de `size` histogrammes de colonnes, obtenue pour toute la ligne
+        par une somme cumulée : le coût par pixel est constant, indépendant du rayon.
+        Les plans d'une pile descendent ensemble : la ligne i de tous les plans d'un groupe
+        est traitée par les mêmes appels.
+        """
+        h, w = out_shape
+        n_planes, _, padded_w = padded.shape
+        output = np.empty((n_planes, h, w), dtype=np.uint8)
+        group = max(1, MedianEngine.HISTOGRAM_CHUNK_BINS // (padded_w * 256))
+        for first in range(0, n_planes, group):
+            last = min(first + group, n_planes)
+            MedianEngine._median_histogram_planes(padded[first:last], size, output[first:last])
+        return output
+
+    @staticmethod
+    def _median_histogram_planes(padded: np.ndarray, size: int, output: np.ndarray):
+        """Médian par histogrammes glissants d'un groupe de plans (P, H + 2r, W + 2r), écrit dans output."""
+        n_planes, h, w = output.shape
+        padded_w = padded.shape[2]
+        low_rank, high_rank = MedianEngine._ranks(size)
+        # Une fenêtre par (plan, colonne) : les deux axes sont fusionnés pour la sélection
+        columns = np.arange(n_planes * w)
+
+        # Arithmétique modulaire : les différences de sommes cumulées restent exactes tant que
+        # l'effectif d'une fenêtre (size²) tient dans le type, même si les cumuls débordent.
+        count_type = MedianEngine._count_type(size * size)
+
+        col_hist = np.zeros((n_planes, padded_w, 256), dtype=count_type)
+        all_planes = np.arange(n_planes)[:, None]
+        all_columns = np.arange(padded_w)
+        for r in range(size):
+            # une seule mise à jour par (plan, colonne) : pas de doublon
+            col_hist[all_planes, all_columns, padded[:, r]] += 1
+
+        prefix = np.zeros((n_planes, padded_w + 1, 256), dtype=count_type)
+        coarse_cdf = np.zeros((n_planes * w, 17), dtype=count_type)
+
+        for i in range(h):
+            if i > 0:
+                col_hist[all_planes, all_columns, padded[:, i - 1]] -= 1
+                col_hist[all_planes, all_columns, padded[:, i + size - 1]] += 1
+
+            # Histogramme de chaque fenêtre de la ligne : différence de sommes cumulées
+            np.cumsum(col_hist, axis=1, dtype=count_type, out=prefix[:, 1:])
+            window_hist = (prefix[:, size:size + w] - prefix[:, :w]).reshape(n_planes * w, 16, 16)
+
+            # Recherche grossière (16 paquets de 16 niveaux) puis fine dans le paquet retenu
+            np.cumsum(window_hist.sum(axis=2, dtype=count_type), axis=1, dtype=count_type,
+                      out=coarse_cdf[:, 1:])
+            low = MedianEngine._select(window_hist, coarse_cdf, columns, low_rank, count_type)
+            if low_rank == high_rank:
+                output[:, i] = low.reshape(n_planes, w)
+            else:
+                high = MedianEngine._select(window_hist, coarse_cdf, columns, high_rank, count_type)
+                output[:, i] = ((low + high) // 2).reshape(n_planes, w)
+
+    @staticmethod
+    def _select(window_hist: np.ndarray, coarse_cdf: np.ndarray, columns: np.ndarray,
+                rank: int, count_type) -> np.ndarray:
+        """Niveau de gris de rang `rank` dans chaque histogramme de fenêtre (w, 16, 16)."""
+        coarse_bin = np.count_nonzero(coarse_cdf[:, 1:] <= rank, axis=1)
+        below = coarse_cdf[columns, coarse_bin]
+        fine_cdf = np.cumsum(window_hist[columns, coarse_bin], axis=1, dtype=count_type)
+        fine_cdf += below[:, None]
+        return coarse_bin * 16 + np.count_nonzero(fine_cdf <= rank, axis=1)
+
+    @staticmethod
+    def _count_type(max_count: int):
+        """Plus petit type non signé capable de représenter un effectif de fenêtre."""
+        for dtype in (np.uint8, np.uint16, np.uint32):
+            if max_count <= np.iinfo(dtype).max:
+                return dtype
+        return np.uint64
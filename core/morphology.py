@@ -0,0 +1,322 @@
+import numpy as np
+
+from core.filters import FilterEngine
+from core.profiling import Profiler
+
+class MorphologyEngine:
+    """
+    Morphologie mathématique vectorisée.
+    - Élément structurant rectangulaire : deux passes 1D de van Herk / Gil-Werman,
+      soit trois comparaisons par pixel quelle que soit la taille.
+    - Autres éléments (croix, disque, masque libre) : décomposition en segments
+      horizontaux, chacun traité par van Herk / Gil-Werman puis combiné verticalement.
+    - Masques binaires (0 / valeur max) : chemin compacté 8 pixels par octet
+      (np.packbits) où min/max deviennent des ET/OU bit à bit.
+    Les axes spatiaux sont les deux derniers : une pile (..., H, W) passe par les mêmes
+    opérations qu'une image seule.
+    """
+
+    OPERATIONS = ("erosion", "dilation", "opening", "closing", "gradient", "tophat", "blackhat")
+
+    # Opérations enchaînant deux passes : leur rayon d'influence est doublé
+    CHAINED_OPERATIONS = ("opening", "closing", "tophat", "blackhat")
+
+    # Anciens noms acceptés par morpho_operation et l'interface
+    ALIASES = {"dilatation": "dilation"}
+
+    SHAPES = ("rect", "cross", "disk")
+
+    @staticmethod
+    def structuring_element(shape: str = "rect", size: int = 3) -> np.ndarray:
+        """
+        Construit un élément structurant booléen size x size centré.
+
+        Args:
+            shape (str): 'rect', 'cross' ou 'disk'.
+            size (int): Côté de l'élément.
+        """
+        if size < 1:
+            raise ValueError("La taille de l'élément structurant doit être >= 1.")
+        if shape == "rect":
+            return np.ones((size, size), dtype=bool)
+        center = (size - 1) / 2
+        y, x = np.ogrid[:size, :size]
+        if shape == "cross":
+            return (np.abs(y - center) < 1) | (np.abs(x - center) < 1)
+        if shape == "disk":
+            return (y - center) ** 2 + (x - center) ** 2 <= (size / 2) ** 2
+        raise ValueError(f"Forme inconnue : {shape} (attendu : {', '.join(MorphologyEngine.SHAPES)})")
+
+    @staticmethod
+    def apply(image: np.ndarray, operation: str, element=3, border: str = "zero",
+              binary: bool = None) -> np.ndarray:
+        """
+        Applique une opération morphologique.
+
+        Args:
+            image (np.ndarray): Matrice 2D ou pile (..., H, W).
+            operation (str): Une des OPERATIONS (ou 'dilatation').
+            element (int | np.ndarray): Côté d'un carré, ou masque booléen quelconque.
+            border (str): Mode de gestion des bords (voir FilterEngine.BORDER_MODES).
+            binary (bool): Force ou interdit le chemin binaire compacté.
+                Par défaut, il est choisi si l'image ne contient que 0 et sa valeur max.
+
+        Returns:
+            np.ndarray: Résultat de même forme et de même type que l'image.
+        """
+        operation = MorphologyEngine.ALIASES.get(operation, operation)
+        if operation not in MorphologyEngine.OPERATIONS:
+            raise ValueError(f"Opération morphologique inconnue : {operation}")
+        mask = MorphologyEngine._as_mask(element)
+
+        if binary is None:
+            binary = border == "zero" and MorphologyEngine._is_binary(image)
+        if binary:
+            if border != "zero":
+                raise ValueError("Le chemin binaire ne gère que les bords 'zero'.")
+            with Profiler.stage("binary"):
+                return MorphologyEngine._apply_binary(image, operation, mask)
+        with Profiler.stage("gray"):
+            return MorphologyEngine._apply_gray(image, operation, mask, border)
+
+    @staticmethod
+    def erode(image: np.ndarray, element=3, border: str = "zero") -> np.ndarray:
+        """Érosion : minimum sur le voisinage défini par l'élément structurant."""
+        return MorphologyEngine.apply(image, "erosion", element, border)
+
+    @staticmethod
+    def dilate(image: np.ndarray, element=3, border: str = "zero") -> np.ndarray:
+        """Dilatation : maximum sur le voisinage défini par l'élément structurant réfléchi."""
+        return MorphologyEngine.apply(image, "dilation", element, border)
+
+    # --- OUTILS COMMUNS ---
+
+    @staticmethod
+    def _as_mask(element) -> np.ndarray:
+        """Normalise l'élément structurant en masque booléen 2D non vide."""
+        if np.isscalar(element):
+            return MorphologyEngine.structuring_element("rect", int(element))
+        mask = np.asarray(element, dtype=bool)
+        if mask.ndim != 2 or not mask.any():
+            raise ValueError("L'élément structurant doit être un masque 2D non vide.")
+        return mask
+
+    @staticmethod
+    def _is_binary(image: np.ndarray) -> bool:
+        """Vrai si l'image ne contient que 0 et une seule autre valeur (ex. 0/255 d'Otsu)."""
+        high = image.max()
+        return high != 0 and np.count_nonzero((image != 0) & (image != high)) == 0
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> list:
+        """Découpe le masque en segments horizontaux (ligne, colonne de départ, longueur)."""
+        runs = []
+        for row, line in enumerate(mask):
+            # Fronts montants / descendants de la ligne complétée par des zéros
+            edges = np.diff(np.concatenate(([0], line.astype(np.int8), [0])))
+            starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+            runs.extend((row, int(s), int(e - s)) for s, e in zip(starts, stops))
+        return runs
+
+    # --- CHEMIN NIVEAUX DE GRIS ---
+
+    @staticmethod
+    def _apply_gray(image: np.ndarray, operation: str, mask: np.ndarray, border: str) -> np.ndarray:
+        erode = lambda img: MorphologyEngine._extremum(img, mask, border, np.minimum)
+        # La dilatation utilise l'élément réfléchi (ouverture/fermeture restent idempotentes)
+        dilate = lambda img: MorphologyEngine._extremum(img, mask[::-1, ::-1], border, np.maximum)
+
+        if operation == "erosion":
+            return erode(image)
+        if operation == "dilation":
+            return dilate(image)
+        if operation == "opening":
+            return dilate(erode(image))
+        if operation == "closing":
+            return erode(dilate(image))
+        if operation == "gradient":
+            return MorphologyEngine._saturated_difference(dilate(image), erode(image))
+        if operation == "tophat":
+            return MorphologyEngine._saturated_difference(image, dilate(erode(image)))
+        return MorphologyEngine._saturated_difference(erode(dilate(image)), image) # blackhat
+
+    @staticmethod
+    def _saturated_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """a - b ramené à 0 quand b > a (possible aux bords), sans débordement uint8."""
+        return a - np.minimum(a, b)
+
+    @staticmethod
+    def _extremum(image: np.ndarray, mask: np.ndarray, border: str, func) -> np.ndarray:
+        """Minimum (func=np.minimum) ou maximum sur le voisinage décrit par le masque."""
+        h, w = image.shape[-2:]
+        m_h, m_w = mask.shape
+        padded = FilterEngine.pad(image, m_h // 2, m_w // 2, border)
+
+        if mask.all():
+            # Rectangle : séparable en deux passes 1D
+            rows = MorphologyEngine._running(padded, m_w, axis=-1, func=func)
+            return MorphologyEngine._running(rows[..., :w], m_h, axis=-2, func=func)[..., :h, :]
+
+        # Segment de longueur L : extremum glissant horizontal calculé une seule fois par L
+        running = {}
+        output = None
+        for row, start, length in MorphologyEngine._runs(mask):
+            if length not in running:
+                running[length] = MorphologyEngine._running(padded, length, axis=-1, func=func)
+            window = running[length][..., row:row + h, start:start + w]
+            output = window.copy() if output is None else func(output, window, out=output)
+        return output
+
+    @staticmethod
+    def _running(src: np.ndarray, k: int, axis: int, func) -> np.ndarray:
+        """
+        Extremum glissant de longueur k (van Herk / Gil-Werman) le long d'un axe.
+        out[j] = func(src[j], ..., src[j + k - 1]), de longueur n - k + 1.
+        """
+        if k == 1:
+            return src
+        a = np.moveaxis(src, axis, 0)
+        n = a.shape[0]
+        n_blocks = -(-n // k)
+
+        # Complétion par l'élément neutre jusqu'à un multiple de k
+        info = np.iinfo(a.dtype) if np.issubdtype(a.dtype, np.integer) else np.finfo(a.dtype)
+        neutral = info.max if func is np.minimum else info.min
+        blocks = np.full((n_blocks * k,) + a.shape[1:], neutral, dtype=a.dtype)
+        blocks[:n] = a
+        blocks = blocks.reshape((n_blocks, k) + a.shape[1:])
+
+        # g : cumul depuis le début de chaque bloc, h : cumul depuis la fin
+        g = func.accumulate(blocks, axis=1).reshape((n_blocks * k,) + a.shape[1:])
+        h = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape((n_blocks * k,) + a.shape[1:])
+
+        out_len = n - k + 1
+        result = func(h[:out_len], g[k - 1:k - 1 + out_len])
+        return np.moveaxis(result, 0, axis)
+
+    # --- CHEMIN BINAIRE COMPACTÉ ---
+
+    @staticmethod
+    def _apply_binary(image: np.ndarray, operation: str, mask: np.ndarray) -> np.ndarray:
+        h, w = image.shape[-2:]
+        high = image.max()
+        m_h, m_w = mask.shape
+
+        # Marges de zéros autour de l'image compactée : les fenêtres qui débordent
+        # lisent des zéros (bord 'zero') au lieu de sortir du tableau.
+        pad_rows, pad_bytes = m_h, -(-m_w // 8)
+        packed = np.packbits(image != 0, axis=-1)
+        n_bytes = packed.shape[-1]
+        bits = np.pad(packed, ((0, 0),) * (packed.ndim - 2) + ((pad_rows, pad_rows), (pad_bytes, pad_bytes)))
+
+        # Cadre des bits valides, réappliqué après chaque opération élémentaire (commun aux plans)
+        frame = np.zeros(bits.shape[-2:], dtype=bits.dtype)
+        frame[pad_rows:pad_rows + h, pad_bytes:pad_bytes + n_bytes] = 0xFF
+        if w % 8:
+            frame[pad_rows:pad_rows + h, pad_bytes + n_bytes - 1] = (0xFF << (8 - w % 8)) & 0xFF
+
+        erode = lambda b: MorphologyEngine._binary_extremum(b, frame, mask, np.bitwise_and)
+        dilate = lambda b: MorphologyEngine._binary_extremum(b, frame, mask[::-1, ::-1], np.bitwise_or)
+
+        if operation == "erosion":
+            result = erode(bits)
+        elif operation == "dilation":
+            result = dilate(bits)
+        elif operation == "opening":
+            result = dilate(erode(bits))
+        elif operation == "closing":
+            result = erode(dilate(bits))
+        elif operation == "gradient":
+            result = dilate(bits) & ~erode(bits)
+        elif operation == "tophat":
+            result = bits & ~dilate(erode(bits))
+        else: # blackhat
+            result = erode(dilate(bits)) & ~bits
+
+        result = result[..., pad_rows:pad_rows + h, pad_bytes:pad_bytes + n_bytes]
+        unpacked = np.unpackbits(result, axis=-1, count=w)
+        return (unpacked * high).astype(image.dtype)
+
+    @staticmethod
+    def _binary_extremum(bits: np.ndarray, frame: np.ndarray, mask: np.ndarray, func) -> np.ndarray:
+        """ET (érosion) ou OU (dilatation) sur le voisinage, 8 pixels par opération."""
+        m_h, m_w = mask.shape
+        origin_y, origin_x = m_h // 2, m_w // 2
+
+        if mask.all():
+            # Rectangle : doublements horizontaux puis verticaux
+            rows = MorphologyEngine._binary_running(bits, m_w, func, MorphologyEngine._shift_columns)
+            rows = MorphologyEngine._shift_columns(rows, -origin_x)
+            output = MorphologyEngine._binary_running(rows, m_h, func, MorphologyEngine._shift_rows)
+            output = MorphologyEngine._shift_rows(output, -origin_y)
+        else:
+            running = {}
+            output = None
+            for row, start, length in MorphologyEngine._runs(mask):
+                if length not in running:
+                    running[length] = MorphologyEngine._binary_running(bits, length, func,
+                                                                       MorphologyEngine._shift_columns)
+                line = MorphologyEngine._shift_columns(running[length], start - origin_x)
+                line = MorphologyEngine._shift_rows(line, row - origin_y)
+                output = line if output is None else func(output, line, out=output)
+
+        # Les marges et les bits au-delà de la largeur doivent rester nuls (bord 'zero')
+        output &= frame
+        return output
+
+    @staticmethod
+    def _binary_running(bits: np.ndarray, k: int, func, shift) -> np.ndarray:
+        """
+        out[j] = func(in[j], ..., in[j + k - 1]) le long de l'axe parcouru par `shift`
+        (_shift_columns ou _shift_rows), par doublements successifs : O(log k) passes.
+        """
+        powers = {1: bits} # powers[p][j] = func(in[j], ..., in[j + p - 1])
+        p = 1
+        while 2 * p <= k:
+            powers[2 * p] = func(powers[p], shift(powers[p], p))
+            p *= 2
+
+        result, offset = None, 0
+        for p in sorted(powers, reverse=True):
+            if k - offset >= p:
+                part = shift(powers[p], offset)
+                result = part if result is None else func(result, part)
+                offset += p
+        return result
+
+    @staticmethod
+    def _shift_columns(bits: np.ndarray, s: int) -> np.ndarray:
+        """Décalage horizontal en pixels sur l'image compactée : out[j] = in[j + s], zéros ailleurs."""
+        if s == 0:
+            return bits
+        out = np.zeros_like(bits)
+        n_bytes = bits.shape[-1]
+        q, b = divmod(abs(s), 8)
+        if q >= n_bytes:
+            return out
+        if s > 0:
+            src = bits[..., q:]
+            out[..., :n_bytes - q] = src << b
+            if b:
+                out[..., :n_bytes - q - 1] |= src[..., 1:] >> (8 - b)
+        else:
+            src = bits[..., :n_bytes - q]
+            out[..., q:] = src >> b
+            if b:
+                out[..., q + 1:] |= src[..., :-1] << (8 - b)
+        return out
+
+    @staticmethod
+    def _shift_rows(bits: np.ndarray, s: int) -> np.ndarray:
+        """Décalage vertical : out[i] = in[i + s], lignes nulles ailleurs."""
+        if s == 0:
+            return bits.copy()
+        out = np.zeros_like(bits)
+        h = bits.shape[-2]
+        if abs(s) >= h:
+            return out
+        if s > 0:
+            out[..., :h - s, :] = bits[..., s:, :]
+        else:
+            out[..., -s:, :] = bits[..., :h + s, :]
+        return out
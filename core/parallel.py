@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.layout import ImageLayout
+
+class ParallelExecutor:
+    """
+    Exécution multi-cœurs des filtres de voisinage par bandes horizontales.
+    Chaque bande est lue avec `halo` lignes de recouvrement (rayon du noyau), traitée
+    indépendamment, puis recadrée et écrite directement à sa place dans la sortie
+    pré-allouée : pas de concaténation finale. Le résultat est identique quel que
+    soit le nombre de workers. Une pile (N, H, W[, C]) est découpée par groupes
+    d'images entières, sans recouvrement.
+    - backend 'thread' : NumPy relâche le GIL dans ses boucles internes.
+    - backend 'process' : entrée et sortie en mémoire partagée (multiprocessing.shared_memory).
+    """
+
+    BACKENDS = ("thread", "process")
+
+    # Backend utilisé quand l'appelant n'en précise pas (backend=None) ; les méthodes
+    # d'ImageProcessor exposent backend= à côté de workers=
+    DEFAULT_BACKEND = "thread"
+
+    # Nombre de bandes par worker (équilibrage de charge) et hauteur minimale d'une bande
+    STRIPS_PER_WORKER = 4
+    MIN_STRIP_ROWS = 64
+
+    @staticmethod
+    def resolve_workers(workers: int = None) -> int:
+        """None ou 0 : tous les cœurs disponibles."""
+        if not workers:
+            return os.cpu_count() or 1
+        return max(1, int(workers))
+
+    @staticmethod
+    def run(func, image: np.ndarray, halo: int, workers: int = None, dtype=np.uint8,
+            border: str = None, backend: str = None, args: tuple = (), kwargs: dict = None) -> np.ndarray:
+        """
+        Applique func(bande, *args, **kwargs) sur des bandes de l'image en parallèle.
+
+        Args:
+            func: Fonction image -> image de même forme (picklable pour le backend 'process').
+            image (np.ndarray): Matrice 2D, image multicanal ou pile (voir ImageLayout).
+            halo (int): Lignes de recouvrement nécessaires au-dessus et en dessous.
+            workers (int): Nombre de workers (None : tous les cœurs).
+            dtype: Type de la sortie produite par func.
+            border (str): Mode de bord de func ; 'wrap' relie le haut et le bas de l'image,
+                ce qu'un découpage en bandes ne peut pas reproduire : exécution directe.
+            backend (str): 'thread' ou 'process' (DEFAULT_BACKEND si None).
+
+        Returns:
+            np.ndarray: Résultat assemblé, de la forme de l'image.
+        """
+        kwargs = kwargs or {}
+        backend = backend or ParallelExecutor.DEFAULT_BACKEND
+        workers = ParallelExecutor.resolve_workers(workers)
+        min_rows = None
+        if ImageLayout.is_stack(image):
+            # Le premier axe énumère des images indépendantes : bandes d'images entières
+            halo, min_rows = 0, 1
+        strips = ParallelExecutor.strips(image.shape[0], workers, halo, min_rows)
+        if workers == 1 or len(strips) == 1 or border == "wrap":
+            return func(image, *args, **kwargs)
+
+        if backend == "thread":
+            output = np.empty(image.shape, dtype=dtype)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(ParallelExecutor._run_strip, func, image, output, y0, y1, halo,
+                                       args, kwargs)
+                           for y0, y1 in strips]
+                for future in futures:
+                    future.result() # Propage les exceptions des workers
+            return output
+        if backend == "process":
+            return ParallelExecutor._run_processes(func, image, halo, workers, dtype, strips, args, kwargs)
+        raise ValueError(f"Backend inconnu : {backend} (attendu : {', '.join(ParallelExecutor.BACKENDS)})")
+
+    @staticmethod
+    def strips(height: int, workers: int, halo: int, min_rows: int = None) -> list:
+        """Découpage en bandes (y0, y1) : plusieurs par worker, assez hautes devant le halo."""
+        if min_rows is None:
+            min_rows = max(ParallelExecutor.MIN_STRIP_ROWS, 2 * halo)
+        count = max(1, min(workers * ParallelExecutor.STRIPS_PER_WORKER, height // min_rows))
+        bounds = np.linspace(0, height, count + 1).astype(int)
+        return [(int(y0), int(y1)) for y0, y1 in zip(bounds[:-1], bounds[1:]) if y1 > y0]
+
+    @staticmethod
+    def _run_strip(func, image, output, y0, y1, halo, args, kwargs):
+        """Traite une bande avec son halo (tronqué aux bords) et écrit sa partie utile."""
+        ry0, ry1 = max(0, y0 - halo), min(image.shape[0], y1 + halo)
+        result = func(image[ry0:ry1], *args, **kwargs)
+        output[y0:y1] = result[y0 - ry0:y1 - ry0]
+
+    @staticmethod
+    def _run_processes(func, image, halo, workers, dtype, strips, args, kwargs) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        shm_in = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        shm_out = shared_memory.SharedMemory(create=True, size=max(1, image.size * dtype.itemsize))
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm_in.buf)[:] = image
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_process_strip, func, shm_in.name, image.shape, image.dtype.str,
+                                       shm_out.name, dtype.str, y0, y1, halo, args, kwargs)
+                           for y0, y1 in strips]
+                for future in futures:
+                    future.result()
+            # Copie unique hors de la mémoire partagée avant sa libération
+            return np.ndarray(image.shape, dtype=dtype, buffer=shm_out.buf).copy()
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+def _process_strip(func, in_name, shape, in_dtype, out_name, out_dtype, y0, y1, halo, args, kwargs):
+    """Point d'entrée d'un processus worker : s'attache à la mémoire partagée et traite une bande."""
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        image = np.ndarray(shape, dtype=np.dtype(in_dtype), buffer=shm_in.buf)
+        output = np.ndarray(shape, dtype=np.dtype(out_dtype), buffer=shm_out.buf)
+        ParallelExecutor._run_strip(func, image, output, y0, y1, halo, args, kwargs)
+        del image, output # Libère les vues avant de fermer les segments
+    finally:
+        shm_in.close()
+        shm_out.close()
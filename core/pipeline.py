@@ -0,0 +1,118 @@
+import numpy as np
+
+from core.layout import ImageLayout
+from core.lut import PointLUT
+from core.processor import ImageProcessor
+from core.threshold import ThresholdEngine
+
+class Pipeline:
+    """
+    Chaîne d'opérations paresseuse sur une image.
+    Les opérations sont enregistrées sans être exécutées. Au moment du calcul, les
+    transformations ponctuelles consécutives (négatif, gamma, étirement, égalisation,
+    seuillage) sont composées en une seule LUT uint8 appliquée en une passe. Les étapes
+    dépendant des données lisent leurs statistiques dans l'histogramme propagé à
+    travers les LUT précédentes, sans relire l'image. Sur une pile (N, H, W[, C]), ces
+    étapes dépendant des données s'exécutent trame par trame via ImageProcessor (une LUT
+    par trame) ; les autres transformations ponctuelles restent fusionnées.
+
+    Exemple :
+        result = Pipeline(image).apply_gamma(0.8).stretch_contrast().inverse().compute()
+    """
+
+    # Transformations ponctuelles : (construction de la LUT, besoin de l'histogramme d'entrée)
+    # Chaque nom correspond aussi à une méthode d'ImageProcessor (exécution directe si besoin).
+    POINT_OPERATIONS = {
+        "inverse": (lambda hist: PointLUT.inverse(), False),
+        "apply_gamma": (lambda hist, gamma: PointLUT.gamma(gamma), False),
+        "stretch_contrast": (lambda hist: PointLUT.stretch(hist), True),
+        "equalize_histogram": (lambda hist: PointLUT.equalize(hist), True),
+        "threshold": (lambda hist, value: PointLUT.threshold(value), False),
+        "threshold_otsu": (lambda hist: PointLUT.threshold(PointLUT.otsu_threshold(hist)), True),
+        "threshold_multiotsu": (lambda hist, classes=3: PointLUT.classes(ThresholdEngine.multiotsu_thresholds(hist, classes)),
+                                True),
+    }
+
+    def __init__(self, image: np.ndarray):
+        self._source = image
+        self._steps = []
+        self._result = None
+
+    # --- ENREGISTREMENT DES ÉTAPES ---
+
+    def apply(self, name: str, *args, **kwargs) -> "Pipeline":
+        """
+        Ajoute une étape : transformation ponctuelle de POINT_OPERATIONS ou
+        n'importe quelle méthode d'ImageProcessor (appliquée telle quelle).
+        """
+        if name not in Pipeline.POINT_OPERATIONS and not callable(getattr(ImageProcessor, name, None)):
+            raise ValueError(f"Opération inconnue : {name}")
+        self._steps.append((name, args, kwargs))
+        self._result = None
+        return self
+
+    def inverse(self) -> "Pipeline":
+        return self.apply("inverse")
+
+    def apply_gamma(self, gamma: float) -> "Pipeline":
+        return self.apply("apply_gamma", gamma)
+
+    def stretch_contrast(self) -> "Pipeline":
+        return self.apply("stretch_contrast")
+
+    def equalize_histogram(self) -> "Pipeline":
+        return self.apply("equalize_histogram")
+
+    def threshold(self, value: int) -> "Pipeline":
+        return self.apply("threshold", value)
+
+    def threshold_otsu(self) -> "Pipeline":
+        return self.apply("threshold_otsu")
+
+    def threshold_multiotsu(self, classes: int = 3) -> "Pipeline":
+        return self.apply("threshold_multiotsu", classes)
+
+    @property
+    def steps(self) -> list:
+        """Noms des étapes enregistrées, dans l'ordre."""
+        return [name for name, _, _ in self._steps]
+
+    # --- EXÉCUTION ---
+
+    def compute(self) -> np.ndarray:
+        """Matérialise le résultat (calculé une seule fois, puis mis en cache)."""
+        if self._result is None:
+            self._result = self._run()
+        return self._result
+
+    def _run(self) -> np.ndarray:
+        image = self._source
+        lut, hist = None, None
+
+        for name, args, kwargs in self._steps:
+            fusable = name in Pipeline.POINT_OPERATIONS and image.dtype == np.uint8
+            if fusable and Pipeline.POINT_OPERATIONS[name][1] and ImageLayout.is_stack(image):
+                fusable = False # Histogramme par trame : voir ImageProcessor._per_frame
+            if fusable:
+                build, needs_hist = Pipeline.POINT_OPERATIONS[name]
+                if lut is None:
+                    lut = PointLUT.identity()
+                if needs_hist and hist is None:
+                    # Une seule lecture de l'image pour tout le segment ponctuel
+                    hist = PointLUT.remap_histogram(PointLUT.histogram(image), lut)
+
+                step_lut = build(hist, *args, **kwargs)
+                lut = PointLUT.compose(lut, step_lut)
+                if hist is not None:
+                    hist = PointLUT.remap_histogram(hist, step_lut)
+                continue
+
+            # Étape spatiale (image non uint8, pile) : on matérialise le segment ponctuel en cours
+            if lut is not None:
+                image = lut[image]
+                lut, hist = None, None
+            image = getattr(ImageProcessor, name)(image, *args, **kwargs)
+
+        if lut is not None:
+            image = lut[image]
+        return image
@@ -1,24 +1,39 @@
 import numpy as np
 
+from core.components import ComponentEngine
+from core.filters import FilterEngine
+from core.gradient import GradientEngine
+from core.layout import ImageLayout
+from core.lut import PointLUT
+from core.median import MedianEngine
+from core.morphology import MorphologyEngine
+from core.parallel import ParallelExecutor
+from core.profiling import Profiler
+from core.stats import ImageStats
+from core.threshold import ThresholdEngine
+
 class ImageProcessor:
     """
     Contient les algorithmes de traitement d'image 'From Scratch'.
     Utilise NumPy pour la performance vectorielle.
+
+    Chaque méthode accepte une image (H, W), une image multicanal (H, W, C), une pile
+    (N, H, W) ou une pile multicanal (N, H, W, C) (voir ImageLayout) et traite tout le
+    lot en un seul appel : les filtres n'opèrent que sur les axes spatiaux, les
+    transformations dépendant de l'histogramme (étirement, égalisation, Otsu) construisent
+    une LUT par trame d'une pile (les canaux d'une même image partagent la leur) : chaque
+    trame est traitée comme si elle était seule. Seules les composantes connexes exigent
+    un masque 2D.
     """
 
     @staticmethod
     def get_stats(image: np.ndarray) -> dict:
         """
-        Calcule les statistiques de base de l'image.
+        Calcule les statistiques de l'image en une seule lecture (voir ImageStats) :
+        dimensions, min/max, luminance moyenne, écart-type, mais aussi histogramme,
+        variance, percentiles, entropie et seuil d'Otsu.
         """
-        return {
-            "dimensions": image.shape, # (Hauteur, Largeur)
-            "pixels_total": image.size,
-            "min_val": np.min(image),
-            "max_val": np.max(image),
-            "moyenne_luminance": float(np.mean(image)),
-            "std_dev": float(np.std(image)) # Écart-type (contraste RMS)
-        }
+        return ImageStats.compute(image)
 
     @staticmethod
     def inverse(image: np.ndarray) -> np.ndarray:
@@ -33,158 +48,270 @@ class ImageProcessor:
     def get_histogram(image: np.ndarray) -> np.ndarray:
         """Calcule l'histogramme (fréquence de chaque niveau de gris)."""
         # counts sera un tableau de 256 éléments (pour 0-255)
+        if image.dtype == np.uint8:
+            return PointLUT.histogram(image) # Un seul passage, sans tri ni recherche de classe
         counts, _ = np.histogram(image, bins=256, range=(0, 256))
         return counts
     
     @staticmethod
     def apply_gamma(image: np.ndarray, gamma: float) -> np.ndarray:
-        # Normalisation, Puissance, Dénormalisation
-        inv_gamma = 1.0 / gamma
-        table = np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8")
-        return np.take(table, image)
+        # Normalisation, Puissance, Dénormalisation (LUT 256 entrées)
+        return np.take(PointLUT.gamma(gamma), image)
     
     @staticmethod
     def stretch_contrast(image: np.ndarray) -> np.ndarray:
-        """Étirement linéaire de la dynamique (Contrast Stretching)."""
-        i_min = np.min(image)
-        i_max = np.max(image)
-        
-        if i_max == i_min: return image # Image unie
-        
-        # Formule : s = 255 * (r - min) / (max - min)
-        stretched = (255 * (image - i_min) / (i_max - i_min)).astype(np.uint8)
-        return stretched
+        """Étirement linéaire de la dynamique (Contrast Stretching), trame par trame d'une pile."""
+        if ImageLayout.is_stack(image):
+            return ImageProcessor._per_frame(image, ImageProcessor.stretch_contrast, PointLUT.stretch)
+        if image.dtype != np.uint8:
+            # Image non uint8 (ex. gradient float32, uint16) : formule directe sur les valeurs exactes
+            i_min, i_max = image.min(), image.max()
+            if i_max == i_min: return image # Image unie
+            return (255.0 * (image.astype(np.float64) - i_min) / (i_max - i_min)).astype(np.uint8)
+        # Formule : s = 255 * (r - min) / (max - min), évaluée sur 256 niveaux seulement
+        # (Image unie : LUT identité)
+        lut = PointLUT.stretch(PointLUT.histogram(image))
+        return lut[image]
 
     @staticmethod
     def equalize_histogram(image: np.ndarray) -> np.ndarray:
-        """Égalisation d'histogramme basée sur la fonction de répartition (CDF)."""
-        # 1. Calcul de l'histogramme
-        hist, _ = np.histogram(image.flatten(), 256, [0, 256])
-        
-        # 2. Calcul de la fonction de répartition cumulative (CDF)
-        cdf = hist.cumsum()
-        
-        # 3. Normalisation de la CDF pour qu'elle tienne entre 0 et 255
-        # On ignore les valeurs à 0 pour éviter les artefacts
-        cdf_m = np.ma.masked_equal(cdf, 0)
-        cdf_m = (cdf_m - cdf_m.min()) * 255 / (cdf_m.max() - cdf_m.min())
-        cdf = np.ma.filled(cdf_m, 0).astype('uint8')
-        
-        # 4. Application de la LUT (Look-Up Table) via la CDF
-        return cdf[image]
+        """Égalisation d'histogramme basée sur la fonction de répartition (CDF), trame par trame d'une pile."""
+        if ImageLayout.is_stack(image):
+            return ImageProcessor._per_frame(image, ImageProcessor.equalize_histogram, PointLUT.equalize)
+        if image.dtype != np.uint8:
+            # Niveaux 0..255 des classes de l'histogramme (mêmes classes que np.histogram)
+            image = np.clip(image, 0, 255).astype(np.uint8)
+        # Application de la LUT (Look-Up Table) via la CDF normalisée
+        lut = PointLUT.equalize(PointLUT.histogram(image))
+        return lut[image]
     
     @staticmethod
-    def apply_filter(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    def _per_frame(image: np.ndarray, method, build) -> np.ndarray:
+        """
+        Transformation dépendant de l'histogramme appliquée à chaque trame d'une pile :
+        histogrammes des N trames en un seul passage, puis une LUT par trame (build)
+        appliquée en un seul accès indexé. Hors uint8, method est appelée trame par trame.
+        """
+        if image.dtype != np.uint8:
+            return np.stack([method(frame) for frame in image])
+        levels = PointLUT.frame_levels(image)
+        luts = np.stack([build(hist) for hist in PointLUT.frame_histograms(levels)])
+        return np.take(luts.ravel(), levels)
+
+    @staticmethod
+    def apply_filter(image: np.ndarray, kernel: np.ndarray, border: str = "zero",
+                     method: str = "auto", workers: int = 1, backend: str = None) -> np.ndarray:
         """
         Applique un filtre par convolution 2D générique.
-        Gère les bords par 'padding' (ajout de bordures noires).
-        """
-        # 1. Dimensions du noyau
-        k_h, k_w = kernel.shape
-        pad_h, pad_w = k_h // 2, k_w // 2
-        
-        # 2. Ajout d'une bordure de zéros (Zero-padding) pour garder la même taille
-        padded_img = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='constant')
-        
-        # 3. Préparation de l'image de sortie
-        output = np.zeros_like(image, dtype=np.float32)
-        
-        # 4. Convolution (Somme des produits pondérés)
-        # Pour chaque position du noyau
-        for i in range(image.shape[0]):
-            for j in range(image.shape[1]):
-                # Extraction de la zone d'intérêt (fenêtre de voisinage)
-                region = padded_img[i:i+k_h, j:j+k_w]
-                # Multiplication élément par élément et somme
-                output[i, j] = np.sum(region * kernel)
-        
-        # 5. Normalisation et conversion en uint8
+        Gère les bords par 'padding' (zéros par défaut, ou 'edge', 'reflect', 'wrap').
+        Le calcul est délégué au FilterEngine (tranches décalées ou FFT selon le noyau).
+        workers > 1 (ou None : tous les cœurs) répartit l'image en bandes sur plusieurs cœurs,
+        traitées par des threads (backend 'thread', défaut) ou des processus ('process').
+        """
+        if workers != 1:
+            return ParallelExecutor.run(ImageProcessor.apply_filter, image, max(np.shape(kernel)) // 2,
+                                        workers, border=border, backend=backend,
+                                        kwargs=dict(kernel=kernel, border=border, method=method))
+        output = FilterEngine.correlate(ImageLayout.planes(image), kernel, border=border, method=method)
+
+        # Normalisation et conversion en uint8
         # On s'assure que les valeurs restent entre 0 et 255
-        return np.clip(output, 0, 255).astype(np.uint8)
+        with Profiler.stage("clip"):
+            return ImageLayout.restore(np.clip(output, 0, 255).astype(np.uint8), image)
     
     @staticmethod
-    def blur_gaussian(image: np.ndarray) -> np.ndarray:
-        """Filtre de lissage (Flou) - Noyau Gaussien 3x3."""
-        kernel = np.array([[1, 2, 1],
-                           [2, 4, 2],
-                           [1, 2, 1]], dtype=np.float32) / 16.0
-        return ImageProcessor.apply_filter(image, kernel)
-
-    @staticmethod
-    def detect_edges_sobel(image: np.ndarray) -> np.ndarray:
-        """Détection de contours (Sobel)."""
-        # Sobel Horizontal
-        kx = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float32)
-        # Sobel Vertical
-        ky = np.array([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=np.float32)
-        
-        gx = ImageProcessor.apply_filter(image, kx)
-        gy = ImageProcessor.apply_filter(image, ky)
-        
-        # Norme du gradient : sqrt(gx² + gy²)
-        # Simplifié ici par la somme des valeurs absolues pour la rapidité
-        return np.clip(np.abs(gx) + np.abs(gy), 0, 255).astype(np.uint8)
+    def apply_separable_filter(image: np.ndarray, row: np.ndarray, column: np.ndarray,
+                               border: str = "zero", workers: int = 1, backend: str = None) -> np.ndarray:
+        """
+        Applique un noyau séparable np.outer(column, row) en deux passes 1D.
+        Coût O(2k) par pixel au lieu de O(k²).
+        """
+        if workers != 1:
+            return ParallelExecutor.run(ImageProcessor.apply_separable_filter, image, np.size(column) // 2,
+                                        workers, border=border, backend=backend,
+                                        kwargs=dict(row=row, column=column, border=border))
+        output = FilterEngine.correlate_separable(ImageLayout.planes(image), row, column, border=border)
+        with Profiler.stage("clip"):
+            return ImageLayout.restore(np.clip(output, 0, 255).astype(np.uint8), image)
+
+    @staticmethod
+    def blur_gaussian(image: np.ndarray, sigma: float = None, border: str = "zero",
+                      workers: int = 1, backend: str = None) -> np.ndarray:
+        """
+        Filtre de lissage (Flou) Gaussien.
+        Sans sigma : noyau binomial 3x3 historique. Avec sigma : noyau généré
+        de rayon ceil(3*sigma), appliqué en deux passes 1D (séparabilité).
+        """
+        if sigma is None:
+            # [1, 2, 1]^T x [1, 2, 1] / 16 : le noyau 3x3 d'origine
+            taps = np.array([1, 2, 1], dtype=np.float32) / 4.0
+        else:
+            taps = FilterEngine.gaussian_kernel_1d(sigma)
+        return ImageProcessor.apply_separable_filter(image, taps, taps, border=border, workers=workers,
+                                                     backend=backend)
+
+    @staticmethod
+    def filter_mean(image: np.ndarray, size: int = 3, border: str = "zero", workers: int = 1,
+                    backend: str = None) -> np.ndarray:
+        """
+        Filtre moyenneur (Box filter) par table de sommes cumulées.
+        Le coût par pixel ne dépend pas de la taille de la fenêtre.
+        """
+        if workers != 1:
+            return ParallelExecutor.run(ImageProcessor.filter_mean, image, size // 2, workers, border=border,
+                                        backend=backend, kwargs=dict(size=size, border=border))
+        sums = FilterEngine.box_sum(ImageLayout.planes(image), size, border=border)
+        with Profiler.stage("clip"):
+            return ImageLayout.restore(np.clip(sums / (size * size), 0, 255).astype(np.uint8), image)
+
+    @staticmethod
+    def detect_edges_sobel(image: np.ndarray, mode: str = "l1", operator: str = "sobel",
+                           border: str = "zero", quantize: bool = True, workers: int = 1,
+                           backend: str = None) -> np.ndarray:
+        """
+        Détection de contours (Sobel, Scharr ou Prewitt).
+        Gx et Gy sont calculés ensemble en float32 par le GradientEngine : les gradients
+        négatifs ne sont plus tronqués avant la norme.
+
+        Args:
+            mode (str): 'l1' (|gx| + |gy|), 'l2' (sqrt(gx² + gy²)), 'orientation' ou 'nms'.
+            quantize (bool): Conversion finale en uint8 ; False renvoie le float32 brut.
+            workers (int): Nombre de cœurs (1 : séquentiel, None : tous).
+            backend (str): 'thread' (défaut) ou 'process' (voir ParallelExecutor).
+        """
+        if workers != 1:
+            # Suppression des non-maxima : un voisin de plus autour du gradient
+            halo = 2 if mode == "nms" else 1
+            return ParallelExecutor.run(ImageProcessor.detect_edges_sobel, image, halo, workers,
+                                        dtype=np.uint8 if quantize else np.float32, border=border,
+                                        backend=backend, kwargs=dict(mode=mode, operator=operator, border=border,
+                                                    quantize=quantize))
+        result = GradientEngine.compute(ImageLayout.planes(image), operator=operator, modes=(mode,),
+                                        border=border)[mode]
+        if quantize:
+            # Angle dans [-pi, pi] ramené sur [0, 255]
+            value_range = (-np.pi, np.pi) if mode == "orientation" else None
+            result = GradientEngine.quantize(result, value_range=value_range)
+        return ImageLayout.restore(result, image)
     
     @staticmethod
-    def filter_median(image: np.ndarray, size: int = 3) -> np.ndarray:
-        """Filtre non-linéaire pour supprimer le bruit impulsionnel."""
-        pad = size // 2
-        padded = np.pad(image, pad, mode='edge')
-        output = np.zeros_like(image)
-        
-        for i in range(image.shape[0]):
-            for j in range(image.shape[1]):
-                # Extraction du voisinage et tri pour trouver la médiane
-                window = padded[i:i+size, j:j+size]
-                output[i, j] = np.median(window)
-        return output
+    def filter_median(image: np.ndarray, size: int = 3, border: str = "edge", workers: int = 1,
+                      backend: str = None) -> np.ndarray:
+        """
+        Filtre non-linéaire pour supprimer le bruit impulsionnel.
+        Délégué au MedianEngine : np.partition pour les petites fenêtres,
+        histogrammes glissants (coût constant en fonction du rayon) pour les grandes.
+        """
+        if workers != 1:
+            return ParallelExecutor.run(ImageProcessor.filter_median, image, size // 2, workers,
+                                        dtype=image.dtype, border=border, backend=backend,
+                                        kwargs=dict(size=size, border=border))
+        result = MedianEngine.median(ImageLayout.planes(image), size=size, border=border)
+        return ImageLayout.restore(result, image)
+
+    @staticmethod
+    def threshold(image: np.ndarray, value: int) -> np.ndarray:
+        """Binarisation par un seuil fixe : 255 au-dessus du seuil, 0 sinon."""
+        return (image > value).astype(np.uint8) * 255
 
     @staticmethod
     def threshold_otsu(image: np.ndarray) -> np.ndarray:
-        """Segmentation automatique par la méthode d'Otsu."""
-        hist = ImageProcessor.get_histogram(image)
-        total = image.size
-        
-        current_max = 0
-        threshold = 0
-        sum_total = np.dot(np.arange(256), hist)
-        
-        sum_back, weight_back = 0, 0
-        
-        for t in range(256):
-            weight_back += hist[t]
-            if weight_back == 0: continue
-            
-            weight_fore = total - weight_back
-            if weight_fore == 0: break
-            
-            sum_back += t * hist[t]
-            mean_back = sum_back / weight_back
-            mean_fore = (sum_total - sum_back) / weight_fore
-            
-            # Variance inter-classe (Formule d'Otsu)
-            var_between = weight_back * weight_fore * (mean_back - mean_fore)**2
-            
-            if var_between > current_max:
-                current_max = var_between
-                threshold = t
-                
-        # Application du seuil
-        return (image > threshold).astype(np.uint8) * 255
-
-    @staticmethod
-    def morpho_operation(image: np.ndarray, op_type: str = "erosion") -> np.ndarray:
-        """Opérations morphologiques de base sur image binaire."""
-        size = 3
-        pad = size // 2
-        padded = np.pad(image, pad, mode='constant', constant_values=0)
-        output = np.zeros_like(image)
-        
-        for i in range(image.shape[0]):
-            for j in range(image.shape[1]):
-                window = padded[i:i+size, j:j+size]
-                if op_type == "erosion":
-                    output[i, j] = np.min(window)
-                else: # dilatation
-                    output[i, j] = np.max(window)
-        return output
\ No newline at end of file
+        """Segmentation automatique par la méthode d'Otsu (un seuil par trame d'une pile)."""
+        if ImageLayout.is_stack(image):
+            return ImageProcessor._per_frame(image, ImageProcessor.threshold_otsu,
+                                             lambda hist: PointLUT.threshold(PointLUT.otsu_threshold(hist)))
+        threshold = ImageStats.compute(image)["otsu_threshold"]
+        # Application du seuil (comparaison directe sur les valeurs d'une image non uint8)
+        if image.dtype != np.uint8:
+            return ImageProcessor.threshold(image, threshold)
+        return PointLUT.threshold(threshold)[image]
+
+    @staticmethod
+    def threshold_multiotsu(image: np.ndarray, classes: int = 3) -> np.ndarray:
+        """
+        Otsu multi-niveaux : `classes` (2 à 4) niveaux répartis sur [0, 255].
+        Seuils exacts par programmation dynamique sur l'histogramme (ThresholdEngine),
+        calculés trame par trame d'une pile.
+        """
+        if ImageLayout.is_stack(image):
+            return ImageProcessor._per_frame(
+                image, lambda frame: ImageProcessor.threshold_multiotsu(frame, classes),
+                lambda hist: PointLUT.classes(ThresholdEngine.multiotsu_thresholds(hist, classes)))
+        thresholds = ThresholdEngine.multiotsu_thresholds(ImageProcessor.get_histogram(image), classes)
+        return ThresholdEngine.classify(image, thresholds)
+
+    @staticmethod
+    def threshold_adaptive(image: np.ndarray, method: str = "sauvola", size: int = 15, k: float = None,
+                           c: float = 5.0, r: float = 128.0) -> np.ndarray:
+        """
+        Seuillage local (documents mal éclairés) : un seuil par pixel calculé sur la
+        fenêtre size x size qui l'entoure, à coût constant grâce aux tables de sommes
+        cumulées de l'image et de son carré.
+
+        Args:
+            method (str): 'mean' (moyenne - c), 'niblack' (m + k.s) ou 'sauvola' (m.(1 + k.(s / r - 1))) ;
+                'otsu' et 'multiotsu' donnent un seuil global par image d'une pile.
+            size (int): Côté impair de la fenêtre (tronquée aux bords de l'image).
+            k (float): Poids de l'écart-type (-0.2 pour Niblack, 0.2 pour Sauvola par défaut).
+            c (float): Décalage de la méthode 'mean'.
+            r (float): Dynamique de l'écart-type (Sauvola).
+        """
+        prepared = ThresholdEngine.prepare(ImageLayout.planes(image), frames=ImageLayout.is_stack(image))
+        return ImageLayout.restore(ThresholdEngine.binarize(prepared, method, size=size, k=k, c=c, r=r), image)
+
+    @staticmethod
+    def morpho_operation(image: np.ndarray, op_type: str = "erosion", size: int = 3,
+                         shape: str = "rect", border: str = "zero", workers: int = 1,
+                         backend: str = None) -> np.ndarray:
+        """
+        Opérations morphologiques (érosion, dilatation, ouverture, fermeture,
+        gradient, top-hat, black-hat) déléguées au MorphologyEngine.
+        Les masques binaires (ex. sortie d'Otsu) passent par le chemin compacté bit à bit.
+
+        Args:
+            op_type (str): Une des MorphologyEngine.OPERATIONS (ou 'dilatation').
+            size (int): Côté de l'élément structurant.
+            shape (str): 'rect', 'cross' ou 'disk'.
+            workers (int): Nombre de cœurs (1 : séquentiel, None : tous).
+            backend (str): 'thread' (défaut) ou 'process' (voir ParallelExecutor).
+        """
+        if workers != 1:
+            halo = size // 2
+            if op_type in MorphologyEngine.CHAINED_OPERATIONS:
+                halo *= 2
+            return ParallelExecutor.run(ImageProcessor.morpho_operation, image, halo, workers,
+                                        dtype=image.dtype, border=border, backend=backend,
+                                        kwargs=dict(op_type=op_type, size=size, shape=shape, border=border))
+        element = MorphologyEngine.structuring_element(shape, size)
+        result = MorphologyEngine.apply(ImageLayout.planes(image), op_type, element, border=border)
+        return ImageLayout.restore(result, image)
+
+    @staticmethod
+    def label_components(image: np.ndarray, connectivity: int = 8, min_area: int = 0) -> np.ndarray:
+        """
+        Étiquetage des composantes connexes d'un masque (pixels non nuls), ex. après Otsu
+        et une ouverture : 0 pour le fond, 1..N dans l'ordre de balayage (int32).
+        Les composantes de moins de min_area pixels sont écartées.
+        """
+        return ComponentEngine.analyze(image, connectivity=connectivity, min_area=min_area)["labels"]
+
+    @staticmethod
+    def region_stats(image: np.ndarray, intensity: np.ndarray = None, connectivity: int = 8,
+                     min_area: int = 0) -> dict:
+        """
+        Mesures des objets d'un masque, calculées pendant l'étiquetage (plages + union-find).
+
+        Args:
+            intensity (np.ndarray): Image en niveaux de gris d'origine pour l'intensité moyenne.
+
+        Returns:
+            dict: count, area, bbox (haut, gauche, bas, droite exclus), centroid (ligne, colonne)
+                et mean_intensity si intensity est fourni (un élément par objet).
+        """
+        return ComponentEngine.analyze(image, intensity, connectivity=connectivity, min_area=min_area,
+                                       with_labels=False)
+
+    @staticmethod
+    def remove_small_components(image: np.ndarray, min_area: int = 16, connectivity: int = 8) -> np.ndarray:
+        """Nettoyage d'un masque binaire : supprime les objets de moins de min_area pixels (0 / 255)."""
+        return ComponentEngine.remove_small(image, min_area, connectivity=connectivity)
@@ -0,0 +1,279 @@
+import collections
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+class _Metric:
+    """Mesures cumulées d'une opération ou d'une étape."""
+
+    # Nombre de durées conservées pour les percentiles (les plus récentes)
+    SAMPLES = 2048
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = collections.deque(maxlen=_Metric.SAMPLES)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.peak = 0
+
+    def add(self, seconds: float, bytes_in: int, bytes_out: int, peak: int):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.peak = max(self.peak, peak)
+
+    def summary(self) -> dict:
+        p50, p90, p99 = np.percentile(np.asarray(self.samples), (50, 90, 99)) if self.samples else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": float(p50),
+            "p90_seconds": float(p90),
+            "p99_seconds": float(p99),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "peak_bytes": self.peak,
+        }
+
+class _Frame:
+    """Opération ou étape en cours (pile par thread)."""
+
+    def __init__(self, key: str, start_memory: int):
+        self.key = key
+        self.start_memory = start_memory
+        self.max_memory = 0 # Pic absolu observé par les sous-étapes (reset_peak est global)
+        self.stages = {}
+
+class _NullStage:
+    """Contexte vide renvoyé par stage() quand le profilage est désactivé."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class Profiler:
+    """
+    Instrumentation optionnelle des opérations d'ImageProcessor et d'ImageLoader.
+
+    enable() remplace les méthodes publiques de ces classes par des versions mesurées
+    (nombre d'appels, durée cumulée et percentiles, octets en entrée et en sortie, pic
+    mémoire via tracemalloc si memory=True) ; disable() restaure les originales : aucun
+    coût quand le profilage est désactivé. Les étapes internes (bordures, convolution,
+    saturation...) sont déclarées par `with Profiler.stage("pad"):` dans les moteurs et
+    enregistrées sous 'Opération/étape' ; désactivé, stage() renvoie un contexte vide
+    partagé.
+
+    Les mesures mémoire reposent sur tracemalloc, global au processus : avec plusieurs
+    threads de calcul simultanés, les pics se mélangent.
+    """
+
+    enabled = False
+    track_memory = False
+
+    _metrics = {}
+    _originals = {}
+    _last = None
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    # --- ACTIVATION ---
+
+    @staticmethod
+    def targets() -> list:
+        """Classes instrumentées (import tardif : les moteurs importent ce module)."""
+        from core.image_loader import ImageLoader
+        from core.processor import ImageProcessor
+        return [ImageProcessor, ImageLoader]
+
+    @staticmethod
+    def enable(memory: bool = False):
+        """Active l'instrumentation (memory=True : pic mémoire par tracemalloc, plus coûteux)."""
+        if Profiler.enabled:
+            return
+        Profiler.track_memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for cls in Profiler.targets():
+            for name, member in list(vars(cls).items()):
+                if name.startswith("_") or not isinstance(member, staticmethod):
+                    continue
+                Profiler._originals[(cls, name)] = member
+                setattr(cls, name, staticmethod(Profiler._wrap(f"{cls.__name__}.{name}", member.__func__)))
+        Profiler.enabled = True
+
+    @staticmethod
+    def disable():
+        """Restaure les méthodes d'origine (les mesures sont conservées)."""
+        for (cls, name), member in Profiler._originals.items():
+            setattr(cls, name, member)
+        Profiler._originals.clear()
+        if Profiler.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        Profiler.enabled = False
+        Profiler.track_memory = False
+
+    @staticmethod
+    def reset():
+        with Profiler._lock:
+            Profiler._metrics.clear()
+            Profiler._last = None
+
+    @staticmethod
+    def _wrap(key: str, func):
+        @functools.wraps(func)
+        def measured(*args, **kwargs):
+            with Profiler.operation(key, args) as measure:
+                result = func(*args, **kwargs)
+                if measure is not None:
+                    measure.result = result
+            return result
+        return measured
+
+    # --- MESURE ---
+
+    @staticmethod
+    def operation(key: str, inputs: tuple = ()):
+        """
+        Contexte mesurant une opération (utilisable hors des classes instrumentées) :
+        `with Profiler.operation("nom", (image,)) as m:` ; affecter m.result (si m n'est
+        pas None) pour compter les octets produits.
+        """
+        if not Profiler.enabled:
+            return _NULL_STAGE
+        return _Measure(key, inputs)
+
+    @staticmethod
+    def stage(name: str):
+        """Contexte mesurant une étape interne de l'opération en cours."""
+        if not Profiler.enabled:
+            return _NULL_STAGE
+        return _Measure(name, stage=True)
+
+    @staticmethod
+    def _stack() -> list:
+        stack = getattr(Profiler._local, "stack", None)
+        if stack is None:
+            stack = Profiler._local.stack = []
+        return stack
+
+    @staticmethod
+    def _nbytes(value) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sum(Profiler._nbytes(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(Profiler._nbytes(v) for v in value)
+        return 0
+
+    # --- EXPORT ---
+
+    @staticmethod
+    def snapshot() -> dict:
+        """Mesures par opération et par étape ('Opération/étape')."""
+        with Profiler._lock:
+            return {key: metric.summary() for key, metric in sorted(Profiler._metrics.items())}
+
+    @staticmethod
+    def last() -> dict:
+        """Dernière opération de premier niveau terminée : nom, durée et durée par étape."""
+        return Profiler._last
+
+    @staticmethod
+    def to_json(path: str = None) -> str:
+        text = json.dumps(Profiler.snapshot(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    @staticmethod
+    def to_prometheus(prefix: str = "visioncore") -> str:
+        """Format texte d'exposition Prometheus (une série par opération et par étape)."""
+        lines = []
+
+        def metric(name, kind, help_text, values):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(values)
+
+        snapshot = Profiler.snapshot()
+        label = lambda key: 'operation="' + key.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        seconds = []
+        for key, s in snapshot.items():
+            for quantile, field in (("0.5", "p50_seconds"), ("0.9", "p90_seconds"), ("0.99", "p99_seconds")):
+                seconds.append(f"{prefix}_operation_seconds{{{label(key)},quantile=\"{quantile}\"}} {s[field]:.9f}")
+            seconds.append(f"{prefix}_operation_seconds_sum{{{label(key)}}} {s['total_seconds']:.9f}")
+            seconds.append(f"{prefix}_operation_seconds_count{{{label(key)}}} {s['count']}")
+        metric("operation_seconds", "summary", "Durée des opérations et étapes.", seconds)
+        metric("operation_bytes_in_total", "counter", "Octets reçus en entrée.",
+               [f"{prefix}_operation_bytes_in_total{{{label(k)}}} {s['bytes_in']}" for k, s in snapshot.items()])
+        metric("operation_bytes_out_total", "counter", "Octets produits en sortie.",
+               [f"{prefix}_operation_bytes_out_total{{{label(k)}}} {s['bytes_out']}" for k, s in snapshot.items()])
+        metric("operation_peak_bytes", "gauge", "Pic d'allocation observé (tracemalloc).",
+               [f"{prefix}_operation_peak_bytes{{{label(k)}}} {s['peak_bytes']}" for k, s in snapshot.items()])
+        return "\n".join(lines) + "\n"
+
+class _Measure:
+    """Contexte de mesure d'une opération (ou d'une étape) quand le profilage est actif."""
+
+    def __init__(self, name: str, inputs: tuple = (), stage: bool = False):
+        self.name = name
+        self.inputs = inputs
+        self.stage = stage
+        self.result = None
+        self.seconds = None # Renseignés à la sortie du contexte
+        self.stages = None
+
+    def __enter__(self):
+        stack = Profiler._stack()
+        parent = stack[-1] if stack else None
+        key = f"{parent.key}/{self.name}" if parent is not None else self.name
+        start_memory = 0
+        if Profiler.track_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.max_memory = max(parent.max_memory, peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        self.frame = _Frame(key, start_memory)
+        stack.append(self.frame)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = self.seconds = time.perf_counter() - self.start
+        self.stages = dict(self.frame.stages)
+        stack = Profiler._stack()
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        peak = 0
+        if Profiler.track_memory and tracemalloc.is_tracing():
+            absolute = max(tracemalloc.get_traced_memory()[1], self.frame.max_memory)
+            peak = absolute - self.frame.start_memory
+            if parent is not None:
+                parent.max_memory = max(parent.max_memory, absolute)
+
+        bytes_in = 0 if self.stage else Profiler._nbytes(self.inputs)
+        bytes_out = 0 if self.stage else Profiler._nbytes(self.result)
+        with Profiler._lock:
+            Profiler._metrics.setdefault(self.frame.key, _Metric()).add(seconds, bytes_in, bytes_out, peak)
+            if parent is not None:
+                parent.stages[self.name] = parent.stages.get(self.name, 0.0) + seconds
+            elif exc_type is None:
+                Profiler._last = {"operation": self.frame.key, "seconds": seconds,
+                                  "stages": dict(self.frame.stages), "peak_bytes": peak}
+        return False
@@ -0,0 +1,608 @@
+import asyncio
+import collections
+import json
+import logging
+import tempfile
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from core.batch import BatchProcessor
+from core.image_loader import ImageLoader
+from core.layout import ImageLayout
+from core.parallel import ParallelExecutor
+from core.pipeline import Pipeline
+from core.threshold import ThresholdEngine
+
+logger = logging.getLogger(__name__)
+
+class ServiceError(Exception):
+    """Erreur renvoyée au client avec son code HTTP (et d'éventuels en-têtes, ex. Retry-After)."""
+
+    def __init__(self, status: int, message: str, headers: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class _Latency:
+    """Durées récentes d'une étape (fenêtre glissante) pour les percentiles."""
+
+    SAMPLES = 2048
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = collections.deque(maxlen=_Latency.SAMPLES)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> dict:
+        p50, p90, p99 = np.percentile(np.asarray(self.samples), (50, 90, 99)) if self.samples else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": float(p50),
+            "p90_seconds": float(p90),
+            "p99_seconds": float(p99),
+        }
+
+class _Job:
+    """Une image admise : attend son tour (éventuellement dans un micro-lot) sur le pool de calcul."""
+
+    __slots__ = ("image", "operations", "key", "future", "queued")
+
+    def __init__(self, image: np.ndarray, operations: list, key, future):
+        self.image = image
+        self.operations = operations
+        self.key = key
+        self.future = future
+        self.queued = time.perf_counter()
+
+class ProcessingService:
+    """
+    Service HTTP local (asyncio, bibliothèque standard) exposant les opérations d'ImageProcessor.
+
+        POST /process?op=filter_median:size=5&op=threshold_otsu&format=png
+             corps : image encodée (PNG, JPEG, TIFF..., ou .npy) -> réponse : image traitée
+        GET  /health     état du service (503 pendant l'arrêt)
+        GET  /metrics    compteurs, profondeur de file, latences p50/p90/p99 par étape
+                         (JSON, ou format Prometheus avec ?format=prometheus)
+
+    Les opérations s'écrivent comme pour batch.py ('nom:arg,cle=valeur'). Options de
+    /process : format (sortie, PNG par défaut), mode ('L' ou 'RGB'), frames (1 : pile
+    multi-trames), quality, compress_level.
+
+    - Flux : le corps est reçu par morceaux (Content-Length ou Transfer-Encoding: chunked)
+      dans un fichier temporaire gardé en mémoire jusqu'à SPOOL_BYTES puis sur disque ;
+      la réponse est envoyée par morceaux de CHUNK_BYTES en attendant le client (drain).
+    - Décodage et encodage tournent dans des pools de threads : la boucle asyncio ne fait
+      que des entrées / sorties.
+    - Calcul : `workers` tâches consomment une file de lots et délèguent à un pool de
+      threads de même taille (NumPy relâche le GIL). Contre-pression : au-delà de
+      queue_size requêtes admises et pas encore en calcul, la requête est refusée
+      (503 + Retry-After) avant même la lecture de son corps ; la mémoire reste bornée.
+    - Micro-lots : les petites images de même forme avec la même chaîne d'opérations,
+      arrivées à moins de batch_window secondes d'intervalle, sont empilées (N, H, W[, C])
+      et traitées en un seul appel vectorisé (au plus max_batch images). Les chaînes dont
+      le résultat dépend de l'histogramme de l'image (étirement, égalisation, Otsu, y compris
+      threshold_adaptive en 'otsu' / 'multiotsu') ou qui exigent un masque 2D ne sont
+      jamais regroupées : le résultat est toujours celui d'un traitement isolé.
+    """
+
+    STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+                   503: "Service Unavailable"}
+
+    CONTENT_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "TIFF": "image/tiff", "GIF": "image/gif",
+                     "WEBP": "image/webp", "BMP": "image/bmp", "PPM": "image/x-portable-anymap",
+                     "NPY": "application/x-npy"}
+
+    # Étapes mesurées pour chaque requête /process
+    STAGES = ("read", "decode", "queue", "compute", "encode", "write", "total")
+
+    # Méthodes d'ImageProcessor qui renvoient des mesures et non une image
+    NON_IMAGE_OPERATIONS = ("get_stats", "get_histogram", "region_stats")
+
+    # Méthodes qui exigent une image 2D : jamais empilées
+    UNBATCHED_OPERATIONS = ("label_components", "remove_small_components")
+
+    DEFAULT_QUEUE_SIZE = 64
+    DEFAULT_MAX_BATCH = 16
+    DEFAULT_BATCH_WINDOW = 0.002
+
+    # Taille maximale (en pixels) d'une image regroupée en micro-lot
+    BATCH_MAX_PIXELS = 512 * 512
+
+    # Corps et réponses gardés en mémoire jusqu'à cette taille, puis sur disque
+    SPOOL_BYTES = 8 << 20
+
+    # Taille des morceaux lus et écrits sur la connexion
+    CHUNK_BYTES = 64 << 10
+
+    DEFAULT_MAX_BODY = 512 << 20
+
+    # Attente maximale d'une nouvelle requête sur une connexion persistante (secondes)
+    KEEP_ALIVE_TIMEOUT = 15.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, workers: int = None, decoders: int = 2,
+                 encoders: int = 2, queue_size: int = DEFAULT_QUEUE_SIZE, max_batch: int = DEFAULT_MAX_BATCH,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, max_body: int = DEFAULT_MAX_BODY):
+        """
+        Args:
+            host, port (str, int): Adresse d'écoute (port 0 : choisi par le système, lu dans self.port).
+            workers (int): Calculs simultanés (None : tous les cœurs).
+            decoders, encoders (int): Threads de décodage et d'encodage.
+            queue_size (int): Requêtes admises en attente de calcul au-delà desquelles le service répond 503.
+            max_batch (int): Taille maximale d'un micro-lot (1 : pas de regroupement).
+            batch_window (float): Attente maximale (secondes) d'autres images pour compléter un lot.
+            max_body (int): Taille maximale d'un corps de requête en octets (413 au-delà).
+        """
+        self.host = host
+        self.port = port
+        self.workers = ParallelExecutor.resolve_workers(workers)
+        self.decoders = decoders
+        self.encoders = encoders
+        self.queue_size = queue_size
+        self.max_batch = max(1, max_batch)
+        self.batch_window = batch_window
+        self.max_body = max_body
+
+        self._server = None
+        self._tasks = []
+        self._pending = {} # clé de lot -> (images en attente, minuterie de la fenêtre)
+        self._batches = None
+        self._started = None
+        self._stopping = False
+
+        self._admitted = 0 # Requêtes admises, pas encore en calcul (borne de la contre-pression)
+        self._queued = 0 # Images dans les micro-lots en formation et la file de calcul
+        self._busy = 0
+        self._in_flight = 0
+        self._latency = {stage: _Latency() for stage in ProcessingService.STAGES}
+        self._counters = collections.Counter()
+        self._responses = collections.Counter()
+        self._batch_sizes = collections.Counter()
+
+    # --- CYCLE DE VIE ---
+
+    async def start(self):
+        """Crée les pools et les tâches de calcul, puis ouvre le port d'écoute."""
+        self._started = time.monotonic()
+        self._batches = asyncio.Queue()
+        self._decode_pool = ThreadPoolExecutor(max_workers=self.decoders, thread_name_prefix="decode")
+        self._compute_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compute")
+        self._encode_pool = ThreadPoolExecutor(max_workers=self.encoders, thread_name_prefix="encode")
+        self._tasks = [asyncio.create_task(self._compute_loop()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Service VisionCore en écoute sur http://%s:%d", self.host, self.port)
+
+    async def stop(self, timeout: float = 10.0):
+        """Arrêt propre : plus de nouvelle connexion, les calculs admis se terminent (au plus timeout s)."""
+        self._stopping = True
+        if self._server is not None:
+            self._server.close()
+        deadline = time.monotonic() + timeout
+        while (self._admitted or self._queued or self._busy) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for pool in (self._decode_pool, self._compute_pool, self._encode_pool):
+            pool.shutdown(wait=False)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # --- CALCUL ---
+
+    async def process(self, image: np.ndarray, operations: list) -> tuple:
+        """
+        Soumet une image décodée et sa chaîne d'opérations (nom, args, kwargs) au pool de calcul.
+
+        Returns:
+            tuple: (résultat, taille du micro-lot dans lequel l'image a été traitée)
+        """
+        job = _Job(image, operations, self._batch_key(image, operations),
+                   asyncio.get_running_loop().create_future())
+        self._queued += 1
+        if job.key is None:
+            self._batches.put_nowait([job])
+        elif job.key in self._pending:
+            jobs, timer = self._pending[job.key]
+            jobs.append(job)
+            if len(jobs) >= self.max_batch:
+                timer.cancel()
+                self._flush(job.key)
+        else:
+            timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush, job.key)
+            self._pending[job.key] = ([job], timer)
+        return await job.future
+
+    def _batch_key(self, image: np.ndarray, operations: list):
+        """Clé de regroupement, ou None si l'image doit être traitée seule."""
+        if self.max_batch == 1 or image.size > ProcessingService.BATCH_MAX_PIXELS:
+            return None
+        # Empiler doit produire une pile sans ambiguïté (une image de 4 pixels de large serait lue comme RGBA)
+        if ImageLayout.classify(image.shape) not in ("image", "channels") or \
+                ImageLayout.classify((2,) + image.shape) not in ("stack", "stack_channels"):
+            return None
+        for name, args, kwargs in operations:
+            if name in ProcessingService.UNBATCHED_OPERATIONS:
+                return None
+            if name in Pipeline.POINT_OPERATIONS and Pipeline.POINT_OPERATIONS[name][1]:
+                return None # Une trame sans seuil multi-Otsu possible ferait échouer tout le lot
+            if name == "threshold_adaptive" and \
+                    kwargs.get("method", args[0] if args else None) in ThresholdEngine.GLOBAL_METHODS:
+                return None # Seuil global : même règle que les transformations ponctuelles ci-dessus
+        return repr(operations), image.shape, image.dtype.str
+
+    def _flush(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            self._batches.put_nowait(entry[0])
+
+    async def _compute_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._batches.get()
+            started = time.perf_counter()
+            self._queued -= len(batch)
+            self._busy += 1
+            for job in batch:
+                self._latency["queue"].add(started - job.queued)
+            try:
+                results = await loop.run_in_executor(self._compute_pool, ProcessingService._run,
+                                                     batch[0].operations, [job.image for job in batch])
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            else:
+                for job, result in zip(batch, results):
+                    if not job.future.done():
+                        job.future.set_result((result, len(batch)))
+            finally:
+                self._busy -= 1
+            elapsed = time.perf_counter() - started
+            for _ in batch:
+                self._latency["compute"].add(elapsed)
+            self._counters["batches"] += 1
+            self._counters["images"] += len(batch)
+            self._batch_sizes[len(batch)] += 1
+
+    @staticmethod
+    def _run(operations: list, images: list) -> list:
+        """Exécute la chaîne sur une image, ou sur la pile d'un micro-lot en un seul appel."""
+        source = images[0] if len(images) == 1 else np.stack(images)
+        pipeline = Pipeline(source)
+        for name, args, kwargs in operations:
+            pipeline.apply(name, *args, **kwargs)
+        result = pipeline.compute()
+        if not isinstance(result, np.ndarray):
+            raise ValueError("La chaîne d'opérations ne produit pas une image.")
+        return [result] if len(images) == 1 else list(result)
+
+    # --- HTTP ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Connexion HTTP/1.1 persistante : requêtes traitées l'une après l'autre."""
+        try:
+            while not self._stopping:
+                try:
+                    head = await asyncio.wait_for(self._read_head(reader), ProcessingService.KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError, ValueError):
+                    break
+                if head is None:
+                    break
+                method, target, version, headers = head
+                keep_alive = headers.get("connection", "").lower() != "close" if version == "HTTP/1.1" \
+                    else headers.get("connection", "").lower() == "keep-alive"
+
+                self._in_flight += 1
+                path = urllib.parse.urlsplit(target).path
+                try:
+                    status = await self._dispatch(method, target, headers, reader, writer, keep_alive)
+                except ServiceError as e:
+                    # Le corps n'a peut-être pas été lu : la connexion est fermée après la réponse
+                    keep_alive = False
+                    status = e.status
+                    if status == 503:
+                        self._counters["rejected"] += 1
+                    await self._send_json(writer, status, {"error": str(e)}, False, e.headers)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    logger.exception("Erreur interne sur %s %s", method, target)
+                    keep_alive = False
+                    status = 500
+                    await self._send_json(writer, 500, {"error": f"Erreur interne : {e}"}, False)
+                finally:
+                    self._in_flight -= 1
+                self._responses[(path, status)] += 1
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, headers: dict, reader, writer, keep_alive: bool) -> int:
+        parts = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qs(parts.query)
+        routes = {"/process": ("POST", self._handle_process), "/health": ("GET", self._handle_health),
+                  "/metrics": ("GET", self._handle_metrics)}
+        if parts.path not in routes:
+            raise ServiceError(404, f"Ressource inconnue : {parts.path}")
+        expected, handler = routes[parts.path]
+        if method != expected:
+            raise ServiceError(405, f"{parts.path} attend la méthode {expected}.", {"Allow": expected})
+        return await handler(query, headers, reader, writer, keep_alive)
+
+    async def _handle_health(self, query, headers, reader, writer, keep_alive) -> int:
+        health = self.health()
+        status = 503 if health["status"] == "stopping" else 200
+        await self._send_json(writer, status, health, keep_alive)
+        return status
+
+    async def _handle_metrics(self, query, headers, reader, writer, keep_alive) -> int:
+        if query.get("format", ["json"])[0] == "prometheus":
+            body = self.to_prometheus().encode()
+            await self._send(writer, 200, {"Content-Type": "text/plain; version=0.0.4"}, body, keep_alive)
+        else:
+            await self._send_json(writer, 200, self.metrics(), keep_alive)
+        return 200
+
+    async def _handle_process(self, query, headers, reader, writer, keep_alive) -> int:
+        start = time.perf_counter()
+        options = self._parse_options(query)
+        if self._stopping:
+            raise ServiceError(503, "Service en cours d'arrêt.")
+        if self._admitted + self._queued >= self.queue_size:
+            # Contre-pression : refus avant de lire le corps (mémoire bornée)
+            raise ServiceError(503, "File de calcul pleine, réessayer plus tard.", {"Retry-After": "1"})
+
+        loop = asyncio.get_running_loop()
+        self._admitted += 1
+        admitted = True
+        try:
+            if headers.get("expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            body, received = await self._read_body(reader, headers)
+            read_done = time.perf_counter()
+            self._latency["read"].add(read_done - start)
+            try:
+                image = await loop.run_in_executor(self._decode_pool, ImageLoader.decode, body, None,
+                                                   options["mode"], options["frames"], False)
+            except ValueError as e:
+                raise ServiceError(400, str(e))
+            finally:
+                body.close()
+            decode_done = time.perf_counter()
+            self._latency["decode"].add(decode_done - read_done)
+            self._counters["bytes_in"] += received
+
+            self._admitted -= 1
+            admitted = False
+            try:
+                result, batch_size = await self.process(image, options["operations"])
+            except (ValueError, TypeError) as e:
+                raise ServiceError(400, str(e))
+            compute_done = time.perf_counter()
+
+            output = tempfile.SpooledTemporaryFile(max_size=ProcessingService.SPOOL_BYTES)
+            try:
+                try:
+                    await loop.run_in_executor(self._encode_pool, ProcessingService._encode, result, output, options)
+                except ValueError as e:
+                    raise ServiceError(400, str(e))
+                encode_done = time.perf_counter()
+                self._latency["encode"].add(encode_done - compute_done)
+
+                size = output.tell()
+                output.seek(0)
+                timing = ", ".join(f"{stage};dur={seconds * 1e3:.2f}" for stage, seconds in (
+                    ("read", read_done - start), ("decode", decode_done - read_done),
+                    ("compute", compute_done - decode_done), ("encode", encode_done - compute_done)))
+                head = {"Content-Type": ProcessingService.CONTENT_TYPES.get(options["format"], "application/octet-stream"),
+                        "Content-Length": str(size), "X-Batch-Size": str(batch_size), "Server-Timing": timing}
+                writer.write(self._head(200, head, keep_alive))
+                # Envoi par morceaux : drain() suspend la requête tant que le client ne lit pas
+                while True:
+                    chunk = output.read(ProcessingService.CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    await writer.drain()
+            finally:
+                output.close()
+            self._latency["write"].add(time.perf_counter() - encode_done)
+            self._latency["total"].add(time.perf_counter() - start)
+            self._counters["bytes_out"] += size
+            return 200
+        finally:
+            if admitted:
+                self._admitted -= 1
+
+    def _parse_options(self, query: dict) -> dict:
+        try:
+            operations = [BatchProcessor.parse_operation(spec) for spec in query.get("op", [])]
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+        for name, _, _ in operations:
+            if name in ProcessingService.NON_IMAGE_OPERATIONS:
+                raise ServiceError(400, f"{name} renvoie des mesures, pas une image.")
+
+        image_format = query.get("format", ["png"])[0].upper()
+        image_format = Image.registered_extensions().get("." + image_format.lower(), image_format)
+        if image_format != "NPY" and image_format not in Image.SAVE:
+            raise ServiceError(400, f"Format de sortie inconnu : {image_format}")
+        mode = query.get("mode", ["L"])[0].upper()
+        if mode not in ImageLoader.MODES:
+            raise ServiceError(400, f"Mode inconnu : {mode} (attendu : {', '.join(ImageLoader.MODES)})")
+        try:
+            quality = int(query["quality"][0]) if "quality" in query else None
+            compress_level = int(query["compress_level"][0]) if "compress_level" in query else None
+        except ValueError:
+            raise ServiceError(400, "quality et compress_level doivent être des entiers.")
+        return {"operations": operations, "format": image_format, "mode": mode,
+                "frames": query.get("frames", ["0"])[0].lower() in ("1", "true", "yes"),
+                "quality": quality, "compress_level": compress_level}
+
+    @staticmethod
+    def _encode(result: np.ndarray, output, options: dict):
+        ImageLoader.encode(result, output, options["format"], quality=options["quality"],
+                           compress_level=options["compress_level"])
+
+    async def _read_head(self, reader: asyncio.StreamReader):
+        """(méthode, cible, version, en-têtes en minuscules), ou None si le client a fermé la connexion."""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, version = line.decode("latin-1").split()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version.upper(), headers
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict) -> tuple:
+        """
+        Corps reçu par morceaux dans un fichier temporaire (mémoire, puis disque au-delà de
+        SPOOL_BYTES), rembobiné : (fichier, taille en octets).
+        """
+        body = tempfile.SpooledTemporaryFile(max_size=ProcessingService.SPOOL_BYTES)
+        try:
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                total = 0
+                while True:
+                    size = int((await reader.readline()).split(b";")[0], 16)
+                    if size == 0:
+                        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                            pass # En-têtes de fin ignorés
+                        break
+                    total += size
+                    if total > self.max_body:
+                        raise ServiceError(413, f"Corps de requête supérieur à {self.max_body} octets.")
+                    await self._copy(reader, body, size)
+                    await reader.readexactly(2) # CRLF de fin de morceau
+            else:
+                if "content-length" not in headers:
+                    raise ServiceError(411, "Content-Length ou Transfer-Encoding: chunked requis.")
+                length = int(headers["content-length"])
+                if length > self.max_body:
+                    raise ServiceError(413, f"Corps de requête supérieur à {self.max_body} octets.")
+                await self._copy(reader, body, length)
+        except ValueError:
+            body.close()
+            raise ServiceError(400, "Corps de requête mal formé.")
+        except BaseException:
+            body.close()
+            raise
+        size = body.tell()
+        body.seek(0)
+        return body, size
+
+    @staticmethod
+    async def _copy(reader: asyncio.StreamReader, body, length: int):
+        while length > 0:
+            chunk = await reader.readexactly(min(length, ProcessingService.CHUNK_BYTES))
+            body.write(chunk)
+            length -= len(chunk)
+
+    def _head(self, status: int, headers: dict, keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {ProcessingService.STATUS_TEXT.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer, status: int, headers: dict, body: bytes, keep_alive: bool):
+        headers = dict(headers, **{"Content-Length": str(len(body))})
+        writer.write(self._head(status, headers, keep_alive) + body)
+        await writer.drain()
+
+    async def _send_json(self, writer, status: int, payload: dict, keep_alive: bool, headers: dict = None):
+        body = json.dumps(payload, indent=2, ensure_ascii=False).encode()
+        await self._send(writer, status, dict(headers or {}, **{"Content-Type": "application/json; charset=utf-8"}), body, keep_alive)
+
+    # --- SUPERVISION ---
+
+    def health(self) -> dict:
+        """État du service : 'ok', 'saturated' (file pleine : les requêtes sont refusées) ou 'stopping'."""
+        if self._stopping:
+            status = "stopping"
+        elif self._admitted + self._queued >= self.queue_size:
+            status = "saturated"
+        else:
+            status = "ok"
+        return {"status": status, "uptime_seconds": time.monotonic() - self._started if self._started else 0.0,
+                "workers": self.workers, "queue_depth": self._admitted + self._queued,
+                "queue_capacity": self.queue_size}
+
+    def metrics(self) -> dict:
+        """Compteurs, jauges et latences par étape (secondes), pour les tests de charge."""
+        batches = self._counters["batches"]
+        return {
+            "requests": {f"{path} {status}": count for (path, status), count in sorted(self._responses.items())},
+            "rejected": self._counters["rejected"],
+            "in_flight": self._in_flight,
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "busy_workers": self._busy,
+            "workers": self.workers,
+            "queue_capacity": self.queue_size,
+            "images": self._counters["images"],
+            "batches": batches,
+            "mean_batch_size": self._counters["images"] / batches if batches else 0.0,
+            "batch_sizes": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+            "bytes_in": self._counters["bytes_in"],
+            "bytes_out": self._counters["bytes_out"],
+            "latency": {stage: latency.summary() for stage, latency in self._latency.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "visioncore_service") -> str:
+        """Format texte d'exposition Prometheus des métriques."""
+        lines = []
+
+        def metric(name, kind, help_text, values):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(values)
+
+        m = self.metrics()
+        metric("requests_total", "counter", "Réponses par ressource et code HTTP.",
+               [f'{prefix}_requests_total{{path="{path}",status="{status}"}} {count}'
+                for (path, status), count in sorted(self._responses.items())])
+        metric("rejected_total", "counter", "Requêtes refusées par contre-pression (503).",
+               [f"{prefix}_rejected_total {m['rejected']}"])
+        for name, help_text in (("in_flight", "Requêtes en cours."),
+                                ("admitted", "Requêtes admises en lecture ou décodage."),
+                                ("queued", "Images en attente de calcul (micro-lots et file)."),
+                                ("busy_workers", "Calculs en cours."),
+                                ("queue_capacity", "Requêtes admises au-delà desquelles le service répond 503.")):
+            metric(name, "gauge", help_text, [f"{prefix}_{name} {m[name]}"])
+        metric("images_total", "counter", "Images calculées.", [f"{prefix}_images_total {m['images']}"])
+        metric("batches_total", "counter", "Appels de calcul (micro-lots).", [f"{prefix}_batches_total {m['batches']}"])
+        seconds = []
+        for stage, s in m["latency"].items():
+            for quantile, field in (("0.5", "p50_seconds"), ("0.9", "p90_seconds"), ("0.99", "p99_seconds")):
+                seconds.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {s[field]:.9f}')
+            seconds.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {s["total_seconds"]:.9f}')
+            seconds.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        metric("stage_seconds", "summary", "Latence des requêtes /process par étape.", seconds)
+        return "\n".join(lines) + "\n"
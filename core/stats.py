@@ -0,0 +1,94 @@
+import numpy as np
+
+from core.lut import PointLUT
+
+class ImageStats:
+    """
+    Analyse complète d'une image en une seule lecture.
+    Sur une image uint8, toutes les statistiques (min, max, moyenne, variance,
+    percentiles, entropie, seuil d'Otsu) se déduisent de l'histogramme 256 niveaux,
+    obtenu en un seul passage (np.bincount) : plus aucun parcours ni temporaire
+    float64 de la taille de l'image.
+    Après une transformation ponctuelle, l'analyse se met à jour à partir de la LUT
+    appliquée (remap de l'histogramme) sans relire l'image.
+    """
+
+    PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+    @staticmethod
+    def compute(image: np.ndarray) -> dict:
+        """
+        Analyse d'une image.
+
+        Returns:
+            dict: dimensions, pixels_total, min_val, max_val, moyenne_luminance, std_dev
+                (mêmes clés que ImageProcessor.get_stats), plus histogram, variance,
+                percentiles, entropy et otsu_threshold.
+        """
+        if image.dtype == np.uint8:
+            return ImageStats.from_histogram(PointLUT.histogram(image), image.shape)
+
+        # Image non uint8 (ex. gradient float32) : l'histogramme ne porte pas les valeurs exactes
+        hist, _ = np.histogram(image, bins=256, range=(0, 256))
+        stats = ImageStats.from_histogram(hist, image.shape)
+        stats.update({
+            "min_val": image.min(),
+            "max_val": image.max(),
+            "moyenne_luminance": float(np.mean(image)),
+            "variance": float(np.var(image)),
+            "std_dev": float(np.std(image)),
+        })
+        return stats
+
+    @staticmethod
+    def from_histogram(hist: np.ndarray, shape: tuple) -> dict:
+        """Toutes les statistiques déduites d'un histogramme 256 niveaux (256 opérations)."""
+        hist = np.asarray(hist, dtype=np.int64)
+        total = int(hist.sum())
+        stats = {
+            "dimensions": tuple(shape), # (Hauteur, Largeur)
+            "pixels_total": total,
+            "histogram": hist,
+            "otsu_threshold": PointLUT.otsu_threshold(hist),
+        }
+        present = np.flatnonzero(hist)
+        if present.size == 0:
+            # Image vide : mêmes valeurs par défaut que les réductions NumPy sans élément
+            stats.update({"min_val": 0, "max_val": 0, "moyenne_luminance": float("nan"),
+                          "variance": float("nan"), "std_dev": float("nan"), "entropy": 0.0,
+                          "percentiles": {p: 0 for p in ImageStats.PERCENTILES}})
+            return stats
+
+        # Sommes entières exactes (entiers Python : pas de dépassement même sur des gigapixels)
+        s1 = int(np.dot(PointLUT.LEVELS, hist))
+        s2 = int(np.dot(PointLUT.LEVELS ** 2, hist))
+        mean = s1 / total
+        variance = (s2 * total - s1 * s1) / (total * total)
+
+        p = hist[present] / total
+        stats.update({
+            "min_val": int(present[0]),
+            "max_val": int(present[-1]),
+            "moyenne_luminance": mean,
+            "variance": variance,
+            "std_dev": variance ** 0.5, # Écart-type (contraste RMS)
+            "entropy": float(-np.sum(p * np.log2(p))), # En bits par pixel
+            "percentiles": ImageStats.percentiles(hist, ImageStats.PERCENTILES),
+        })
+        return stats
+
+    @staticmethod
+    def percentiles(hist: np.ndarray, q) -> dict:
+        """
+        Percentiles lus sur la CDF : plus petit niveau dont la fréquence cumulée
+        atteint q% des pixels (méthode 'inverted_cdf' de np.percentile).
+        """
+        cdf = np.cumsum(hist)
+        ranks = np.ceil(np.asarray(q, dtype=np.float64) / 100.0 * cdf[-1]).clip(1, None)
+        levels = np.searchsorted(cdf, ranks, side="left")
+        return {p: int(level) for p, level in zip(q, levels)}
+
+    @staticmethod
+    def update(stats: dict, lut: np.ndarray) -> dict:
+        """Analyse de lut[image] déduite de l'analyse de image, sans relire les pixels."""
+        return ImageStats.from_histogram(PointLUT.remap_histogram(stats["histogram"], lut), stats["dimensions"])
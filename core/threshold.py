@@ -0,0 +1,247 @@
+import numpy as np
+
+from core.lut import PointLUT
+from core.profiling import Profiler
+
+class ThresholdEngine:
+    """
+    Seuillages global (Otsu, Otsu multi-niveaux) et local (moyenne - C, Niblack, Sauvola).
+
+    Les seuils locaux se lisent dans deux tables de sommes cumulées (image et image au
+    carré) : moyenne et écart-type d'une fenêtre quelconque coûtent quatre lectures par
+    pixel, quelle que soit sa taille. Au bord, la fenêtre est tronquée à l'image.
+    Les seuils globaux se lisent dans l'histogramme.
+    Une pile (..., H, W) est seuillée d'un bloc : tables et fenêtres par plan. Les seuils
+    globaux sont communs à tous les plans (canaux d'une même image), ou calculés image par
+    image si le premier axe énumère des images indépendantes (prepare(..., frames=True)),
+    comme ImageProcessor.threshold_otsu.
+
+    prepare() calcule ces données une fois ; binarize() les réutilise (et les complète
+    au besoin) : comparer plusieurs méthodes sur une image ne coûte qu'un prétraitement.
+
+        prepared = ThresholdEngine.prepare(image)
+        for method in ("otsu", "mean", "sauvola"):
+            masks[method] = ThresholdEngine.binarize(prepared, method, size=31)
+    """
+
+    LOCAL_METHODS = ("mean", "niblack", "sauvola")
+    GLOBAL_METHODS = ("otsu", "multiotsu")
+
+    # k par défaut : Niblack (T = m + k.s) et Sauvola (T = m.(1 + k.(s / r - 1)))
+    DEFAULT_K = {"niblack": -0.2, "sauvola": 0.2}
+
+    # Nombre de classes accepté par l'Otsu multi-niveaux
+    MAX_CLASSES = 4
+
+    # --- PRÉCALCULS PARTAGÉS ---
+
+    @staticmethod
+    def prepare(image: np.ndarray, frames: bool = False) -> dict:
+        """
+        Données partagées par toutes les méthodes, calculées à la première utilisation :
+        histogram, integral / integral_sq (tables (..., H+1, W+1)), otsu_table, local[size].
+        frames=True : le premier axe énumère des images indépendantes (un seuil global par image).
+        """
+        if image.ndim < 2 or (frames and image.ndim < 3):
+            raise ValueError("Le seuillage attend une image 2D ou une pile (..., H, W).")
+        return {"image": image, "frames": frames, "local": {}}
+
+    @staticmethod
+    def histogram(prepared: dict) -> np.ndarray:
+        if "histogram" not in prepared:
+            image = prepared["image"]
+            if image.dtype == np.uint8:
+                prepared["histogram"] = PointLUT.histogram(image)
+            else:
+                prepared["histogram"] = np.histogram(image, bins=256, range=(0, 256))[0]
+        return prepared["histogram"]
+
+    @staticmethod
+    def integrals(prepared: dict) -> tuple:
+        """Tables de sommes cumulées de l'image et de son carré, bordées d'une ligne et d'une colonne de zéros."""
+        if "integral" not in prepared:
+            image = prepared["image"]
+            # Entiers exacts pour une image entière (pas d'erreur d'arrondi sur les différences)
+            acc_type = np.int64 if np.issubdtype(image.dtype, np.integer) else np.float64
+            with Profiler.stage("integral"):
+                h, w = image.shape[-2:]
+                # Carrés d'une image uint8 sur 16 bits (255² < 2^16) : temporaire 4 fois plus petit
+                squares = np.square(image, dtype=np.uint16 if image.dtype == np.uint8 else acc_type)
+                for key, values in (("integral", image), ("integral_sq", squares)):
+                    table = np.zeros(image.shape[:-2] + (h + 1, w + 1), dtype=acc_type)
+                    np.cumsum(values, axis=-2, dtype=acc_type, out=table[..., 1:, 1:])
+                    np.cumsum(table[..., 1:, 1:], axis=-1, out=table[..., 1:, 1:])
+                    prepared[key] = table
+        return prepared["integral"], prepared["integral_sq"]
+
+    @staticmethod
+    def local_stats(prepared: dict, size: int) -> tuple:
+        """Moyenne et écart-type (float64) sur la fenêtre size x size centrée en chaque pixel."""
+        if size < 1 or size % 2 == 0:
+            raise ValueError(f"La taille de la fenêtre doit être un entier impair >= 1 (reçu : {size}).")
+        if size not in prepared["local"]:
+            integral, integral_sq = ThresholdEngine.integrals(prepared)
+            with Profiler.stage("window"):
+                # Effectifs des fenêtres tronquées : produit d'un facteur ligne et d'un facteur colonne
+                sums, rows, cols = ThresholdEngine._window_sums(integral, size)
+                spread, _, _ = ThresholdEngine._window_sums(integral_sq, size)
+                mean = sums / rows[:, None]
+                mean /= cols
+
+                # n.S2 - S1² : exact en entiers, puis une seule division (opérations en place)
+                spread *= rows[:, None]
+                spread *= cols
+                spread -= np.multiply(sums, sums, out=sums)
+                std = np.maximum(spread, 0, out=spread) / (rows * rows)[:, None]
+                std /= cols * cols
+                np.sqrt(std, out=std)
+            prepared["local"][size] = (mean, std)
+        return prepared["local"][size]
+
+    # --- SEUILS ---
+
+    @staticmethod
+    def local_threshold(prepared: dict, method: str = "mean", size: int = 15, k: float = None,
+                        c: float = 5.0, r: float = 128.0) -> np.ndarray:
+        """
+        Carte des seuils (float64, un par pixel).
+
+        Args:
+            method (str): 'mean' (m - c), 'niblack' (m + k.s) ou 'sauvola' (m.(1 + k.(s / r - 1))).
+            size (int): Côté de la fenêtre.
+            k (float): Poids de l'écart-type (défaut : DEFAULT_K de la méthode).
+            c (float): Décalage de la méthode 'mean'.
+            r (float): Dynamique de l'écart-type pour Sauvola (128 pour du uint8).
+        """
+        if method not in ThresholdEngine.LOCAL_METHODS:
+            raise ValueError(f"Méthode locale inconnue : {method} "
+                             f"(attendu : {', '.join(ThresholdEngine.LOCAL_METHODS)})")
+        mean, std = ThresholdEngine.local_stats(prepared, size)
+        if method == "mean":
+            return mean - c
+        if k is None:
+            k = ThresholdEngine.DEFAULT_K[method]
+        if method == "niblack":
+            return mean + k * std
+        return mean * (1.0 + k * (std / r - 1.0))
+
+    @staticmethod
+    def otsu_table(prepared_or_hist) -> np.ndarray:
+        """
+        Contribution S²/N de chaque classe [a, b] de niveaux (matrice 256 x 256, -inf si
+        b < a ou classe vide) : maximiser leur somme maximise la variance inter-classes.
+        """
+        prepared = prepared_or_hist if isinstance(prepared_or_hist, dict) else None
+        if prepared is not None and "otsu_table" in prepared:
+            return prepared["otsu_table"]
+        hist = ThresholdEngine.histogram(prepared) if prepared is not None else prepared_or_hist
+        hist = np.asarray(hist, dtype=np.int64)
+
+        weights = np.concatenate(([0], np.cumsum(hist)))
+        moments = np.concatenate(([0], np.cumsum(PointLUT.LEVELS * hist)))
+        count = (weights[None, 1:] - weights[:-1, None]).astype(np.float64)
+        total = (moments[None, 1:] - moments[:-1, None]).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table = np.where(count > 0, total * total / count, -np.inf)
+        table[np.tril_indices(256, -1)] = -np.inf
+        if prepared is not None:
+            prepared["otsu_table"] = table
+        return table
+
+    @staticmethod
+    def multiotsu_thresholds(prepared_or_hist, classes: int = 3) -> list:
+        """
+        Seuils d'Otsu multi-niveaux (classes - 1 seuils croissants, la classe i regroupant
+        les niveaux de ]t(i-1), t(i)]). Recherche exacte par programmation dynamique sur
+        les 256 niveaux : O(classes x 256²) au lieu de 256^(classes - 1) combinaisons.
+        """
+        if not 2 <= classes <= ThresholdEngine.MAX_CLASSES:
+            raise ValueError(f"Le nombre de classes doit être compris entre 2 et {ThresholdEngine.MAX_CLASSES}.")
+        hist = ThresholdEngine.histogram(prepared_or_hist) if isinstance(prepared_or_hist, dict) else prepared_or_hist
+        if np.count_nonzero(hist) < classes:
+            raise ValueError(f"L'image compte moins de {classes} niveaux distincts.")
+        if classes == 2:
+            return [PointLUT.otsu_threshold(hist)]
+
+        table = ThresholdEngine.otsu_table(prepared_or_hist)
+        # best[b] : meilleure somme pour les niveaux [0, b] découpés en c + 1 classes
+        best = table[0].copy()
+        choices = []
+        for _ in range(classes - 1):
+            # candidates[t, b] = best[t] + contribution de la classe ]t, b]
+            candidates = best[:-1, None] + table[1:, :]
+            choice = np.argmax(candidates, axis=0)
+            choices.append(choice)
+            best = candidates[choice, PointLUT.LEVELS]
+
+        thresholds, end = [], 255
+        for choice in reversed(choices):
+            end = int(choice[end])
+            thresholds.append(end)
+        return thresholds[::-1]
+
+    # --- BINARISATION ---
+
+    @staticmethod
+    def binarize(prepared: dict, method: str = "otsu", size: int = 15, k: float = None,
+                 c: float = 5.0, r: float = 128.0, classes: int = 3) -> np.ndarray:
+        """
+        Image seuillée (uint8) : 255 au-dessus du seuil, 0 sinon. 'multiotsu' renvoie
+        `classes` niveaux répartis sur [0, 255].
+        """
+        image = prepared["image"]
+        if method in ThresholdEngine.GLOBAL_METHODS and prepared["frames"]:
+            # Un histogramme (et donc un seuil) par image de la pile
+            return np.stack([ThresholdEngine.binarize(ThresholdEngine.prepare(frame), method, classes=classes)
+                             for frame in image])
+        if method == "otsu":
+            threshold = PointLUT.otsu_threshold(ThresholdEngine.histogram(prepared))
+            return ThresholdEngine.classify(image, [threshold])
+        if method == "multiotsu":
+            return ThresholdEngine.classify(image, ThresholdEngine.multiotsu_thresholds(prepared, classes))
+
+        thresholds = ThresholdEngine.local_threshold(prepared, method, size=size, k=k, c=c, r=r)
+        with Profiler.stage("compare"):
+            return (image > thresholds).astype(np.uint8) * 255
+
+    @staticmethod
+    def classify(image: np.ndarray, thresholds) -> np.ndarray:
+        """
+        Image quantifiée en len(thresholds) + 1 classes réparties sur [0, 255] (0 / 255 pour
+        un seuil unique) : LUT 256 entrées sur une image uint8, comparaison directe aux
+        seuils sur les valeurs exactes sinon (gradient float32, uint16...).
+        """
+        if image.dtype == np.uint8:
+            return PointLUT.classes(thresholds)[image]
+        index = np.searchsorted(np.asarray(thresholds), image, side="left")
+        return (index * 255 // max(1, len(thresholds))).astype(np.uint8)
+
+    @staticmethod
+    def _window_sums(table: np.ndarray, size: int) -> tuple:
+        """
+        Sommes sur les fenêtres tronquées à l'image (4 lectures par pixel), avec la hauteur
+        (par ligne) et la largeur (par colonne) de ces fenêtres.
+        """
+        h, w = table.shape[-2] - 1, table.shape[-1] - 1
+        radius = size // 2
+        band, rows = ThresholdEngine._window_diff(table, radius, h, axis=-2)
+        sums, cols = ThresholdEngine._window_diff(band, radius, w, axis=-1)
+        return sums, rows, cols
+
+    @staticmethod
+    def _window_diff(table: np.ndarray, radius: int, n: int, axis: int) -> tuple:
+        """
+        out[i] = table[min(i + r + 1, n)] - table[max(i - r, 0)] le long de l'axe donné :
+        simple soustraction de deux tranches au centre, indexation seulement sur les bords.
+        """
+        table = np.moveaxis(table, axis, 0)
+        index = np.arange(n)
+        high, low = np.minimum(index + radius + 1, n), np.maximum(index - radius, 0)
+        out = np.empty((n,) + table.shape[1:], dtype=table.dtype)
+        if n > 2 * radius:
+            np.subtract(table[2 * radius + 1:n + 1], table[:n - 2 * radius], out=out[radius:n - radius])
+            edges = np.r_[0:radius, n - radius:n]
+        else:
+            edges = index
+        out[edges] = table[high[edges]] - table[low[edges]]
+        return np.moveaxis(out, 0, axis), high - low
@@ -0,0 +1,188 @@
+import inspect
+import numpy as np
+from PIL import Image
+
+from core.image_loader import ImageLoader
+from core.lut import PointLUT
+from core.morphology import MorphologyEngine
+from core.pipeline import Pipeline
+from core.processor import ImageProcessor
+
+class ArrayTileSource:
+    """Source de tuiles adossée à un tableau NumPy ou à un np.memmap (lecture à la demande)."""
+
+    def __init__(self, array: np.ndarray):
+        if array.ndim != 2:
+            raise ValueError("La source de tuiles doit être une matrice 2D.")
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+
+    def read(self, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        # np.asarray : seule la région demandée est lue depuis le disque
+        return np.asarray(self.array[y0:y1, x0:x1])
+
+class PILTileSource:
+    """
+    Source de tuiles décodée par Pillow, région par région (Image.crop).
+    Pillow décode l'image complète au premier accès pour les formats compressés :
+    pour borner la mémoire sur de très grandes images, préférer une source .npy / brute
+    (ImageLoader.open_memmap).
+    """
+
+    def __init__(self, filepath: str):
+        self._image = Image.open(filepath)
+        if self._image.mode != 'L':
+            self._image = self._image.convert('L')
+        w, h = self._image.size
+        self.shape = (h, w)
+        self.dtype = np.dtype(np.uint8)
+
+    def read(self, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        return np.asarray(self._image.crop((x0, y0, x1, y1)), dtype=np.uint8)
+
+    def close(self):
+        self._image.close()
+
+class TiledExecutor:
+    """
+    Exécution tuile par tuile d'une opération d'ImageProcessor.
+    Chaque tuile est lue avec une marge (halo) égale au rayon d'influence de l'opération,
+    traitée, puis recadrée et écrite directement dans la sortie (souvent un np.memmap).
+    La mémoire de travail est bornée par la taille des tuiles et le résultat est
+    identique au traitement de l'image entière.
+    """
+
+    DEFAULT_TILE_SIZE = 1024
+
+    @staticmethod
+    def open_source(filepath: str, shape: tuple = None, dtype=np.uint8, offset: int = 0):
+        """
+        Ouvre une source de tuiles : .npy, PGM binaire ou brute (shape requis) en np.memmap,
+        tout autre format par décodage Pillow.
+        """
+        ext = filepath.lower().rsplit('.', 1)[-1]
+        if ext in ("npy", "pgm", "raw"):
+            try:
+                return ArrayTileSource(ImageLoader.open_memmap(filepath, shape=shape, dtype=dtype, offset=offset))
+            except ValueError:
+                if ext != "pgm": # PGM ASCII : décodage Pillow
+                    raise
+        return PILTileSource(filepath)
+
+    @staticmethod
+    def halo(name: str, *args, **kwargs) -> int:
+        """Rayon d'influence (en pixels) de l'opération, déduit de ses paramètres."""
+        if name in Pipeline.POINT_OPERATIONS:
+            return 0
+        method = getattr(ImageProcessor, name, None)
+        if method is None:
+            raise ValueError(f"Opération inconnue : {name}")
+        params = inspect.signature(method).bind(None, *args, **kwargs)
+        params.apply_defaults()
+        p = params.arguments
+
+        if p.get("border") == "wrap":
+            raise ValueError("Le mode de bord 'wrap' n'est pas compatible avec le traitement par tuiles.")
+
+        if name == "apply_filter":
+            return max(np.shape(p["kernel"])) // 2
+        if name == "apply_separable_filter":
+            return max(np.size(p["row"]), np.size(p["column"])) // 2
+        if name == "blur_gaussian":
+            return 1 if p["sigma"] is None else max(1, int(np.ceil(3 * p["sigma"])))
+        if name == "detect_edges_sobel":
+            # Suppression des non-maxima : un voisin de plus autour du gradient
+            return 2 if p["mode"] == "nms" else 1
+        if name in ("filter_median", "filter_mean", "threshold_adaptive"):
+            return p["size"] // 2
+        if name == "morpho_operation":
+            radius = p["size"] // 2
+            # Ouverture, fermeture, top-hat et black-hat enchaînent deux passes
+            return 2 * radius if p["op_type"] in MorphologyEngine.CHAINED_OPERATIONS else radius
+        raise ValueError(f"Rayon d'influence inconnu pour l'opération : {name} (préciser halo=)")
+
+    @staticmethod
+    def process(source, name: str, *args, output: np.ndarray = None, output_path: str = None,
+                tile_size: int = DEFAULT_TILE_SIZE, halo: int = None, **kwargs) -> np.ndarray:
+        """
+        Applique ImageProcessor.<name>(image, *args, **kwargs) tuile par tuile.
+
+        Args:
+            source: ArrayTileSource, PILTileSource ou tableau 2D (éventuellement np.memmap).
+            name (str): Nom de l'opération d'ImageProcessor.
+            output (np.ndarray): Tableau de sortie déjà alloué (ex. np.memmap).
+            output_path (str): Sinon, fichier .npy créé en np.memmap pour la sortie.
+            tile_size (int): Côté des tuiles (hors halo).
+            halo (int): Force le rayon d'influence au lieu de le déduire des paramètres.
+
+        Returns:
+            np.ndarray: La sortie (tableau en mémoire, ou np.memmap si fichier).
+        """
+        if isinstance(source, np.ndarray):
+            source = ArrayTileSource(source)
+        if name in Pipeline.POINT_OPERATIONS:
+            return TiledExecutor._process_point(source, name, args, kwargs, output, output_path, tile_size)
+
+        if halo is None:
+            halo = TiledExecutor.halo(name, *args, **kwargs)
+        operation = getattr(ImageProcessor, name)
+        h, w = source.shape
+
+        for y0, y1, x0, x1 in TiledExecutor.tiles(source.shape, tile_size):
+            # Le halo est tronqué aux bords de l'image : l'opération y complète elle-même
+            # la tuile exactement comme elle complèterait l'image entière.
+            ry0, ry1 = max(0, y0 - halo), min(h, y1 + halo)
+            rx0, rx1 = max(0, x0 - halo), min(w, x1 + halo)
+            result = operation(source.read(ry0, ry1, rx0, rx1), *args, **kwargs)
+
+            if output is None:
+                output = TiledExecutor._allocate(source.shape, result.dtype, output_path)
+            output[y0:y1, x0:x1] = result[y0 - ry0:y1 - ry0, x0 - rx0:x1 - rx0]
+
+        TiledExecutor._flush(output)
+        return output
+
+    @staticmethod
+    def tiles(shape: tuple, tile_size: int):
+        """Générateur des tuiles (y0, y1, x0, x1) couvrant l'image, ligne par ligne."""
+        h, w = shape
+        for y0 in range(0, h, tile_size):
+            for x0 in range(0, w, tile_size):
+                yield y0, min(y0 + tile_size, h), x0, min(x0 + tile_size, w)
+
+    @staticmethod
+    def _process_point(source, name, args, kwargs, output, output_path, tile_size) -> np.ndarray:
+        """
+        Transformation ponctuelle : pas de halo, mais les statistiques sont globales.
+        Première passe : histogramme cumulé tuile par tuile. Seconde passe : LUT.
+        """
+        if source.dtype != np.uint8:
+            raise ValueError("Les transformations ponctuelles par tuiles attendent une image uint8.")
+        build, needs_hist = Pipeline.POINT_OPERATIONS[name]
+
+        hist = None
+        if needs_hist:
+            hist = np.zeros(256, dtype=np.int64)
+            for y0, y1, x0, x1 in TiledExecutor.tiles(source.shape, tile_size):
+                hist += PointLUT.histogram(source.read(y0, y1, x0, x1))
+        lut = build(hist, *args, **kwargs)
+
+        if output is None:
+            output = TiledExecutor._allocate(source.shape, np.uint8, output_path)
+        for y0, y1, x0, x1 in TiledExecutor.tiles(source.shape, tile_size):
+            output[y0:y1, x0:x1] = lut[source.read(y0, y1, x0, x1)]
+
+        TiledExecutor._flush(output)
+        return output
+
+    @staticmethod
+    def _allocate(shape: tuple, dtype, output_path: str) -> np.ndarray:
+        if output_path is None:
+            return np.empty(shape, dtype=dtype)
+        return ImageLoader.create_memmap(output_path, shape, dtype)
+
+    @staticmethod
+    def _flush(output: np.ndarray):
+        if isinstance(output, np.memmap):
+            output.flush()
@@ -1,7 +1,11 @@
+import time
+
+STARTED = time.perf_counter() # Avant les imports : le temps d'ouverture les inclut
+
 from ui.app import VisionCoreApp
 
 if __name__ == "__main__":
-    app = VisionCoreApp()
+    app = VisionCoreApp(started=STARTED)
     
     # Lancement de la boucle événementielle (bloquant)
     app.mainloop()
\ No newline at end of file
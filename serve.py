@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from core.service import ProcessingService
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Service HTTP local VisionCore (traitement d'images à la demande).",
+        epilog="Exemple : curl --data-binary @photo.jpg "
+               "'http://127.0.0.1:8080/process?op=filter_median:size=5&op=threshold_otsu' -o sortie.png")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (localhost par défaut).")
+    parser.add_argument("--port", type=int, default=8080, help="Port d'écoute.")
+    parser.add_argument("--workers", type=int, default=None, help="Calculs simultanés (défaut : tous les cœurs).")
+    parser.add_argument("--decoders", type=int, default=2, help="Threads de décodage.")
+    parser.add_argument("--encoders", type=int, default=2, help="Threads d'encodage.")
+    parser.add_argument("--queue", type=int, default=ProcessingService.DEFAULT_QUEUE_SIZE,
+                        help="Requêtes en attente au-delà desquelles le service répond 503.")
+    parser.add_argument("--max-batch", type=int, default=ProcessingService.DEFAULT_MAX_BATCH,
+                        help="Images regroupées au plus par micro-lot (1 : pas de regroupement).")
+    parser.add_argument("--batch-window-ms", type=float, default=ProcessingService.DEFAULT_BATCH_WINDOW * 1e3,
+                        help="Attente maximale d'autres images pour compléter un micro-lot (ms).")
+    parser.add_argument("--max-body-mb", type=int, default=ProcessingService.DEFAULT_MAX_BODY >> 20,
+                        help="Taille maximale d'une image envoyée (Mo).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    service = ProcessingService(host=args.host, port=args.port, workers=args.workers, decoders=args.decoders,
+                                encoders=args.encoders, queue_size=args.queue, max_batch=args.max_batch,
+                                batch_window=args.batch_window_ms / 1e3, max_body=args.max_body_mb << 20)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Service arrêté.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,30 @@
 import customtkinter as ctk
-from tkinter import filedialog
+from tkinter import filedialog, messagebox
 from PIL import Image
+import logging
 import numpy as np
 import os
+import time
 
+from core.cache import ResultCache
 from core.image_loader import ImageLoader
+from core.pipeline import Pipeline
 from core.processor import ImageProcessor
+from core.profiling import Profiler
+from core.stats import ImageStats
+from ui.histogram import HistogramView
+from ui.worker import BackgroundWorker
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+logger = logging.getLogger(__name__)
 
 class VisionCoreApp(ctk.CTk):
-    def __init__(self):
+    # Délai d'immobilité du curseur avant le rendu pleine résolution (ms)
+    COMMIT_DELAY_MS = 250
+
+    def __init__(self, started: float = None):
+        # Instant de lancement (main.py le relève avant les imports) pour mesurer l'ouverture
+        self._started = started if started is not None else time.perf_counter()
+        self.startup_seconds = None
         super().__init__()
 
         # 1. Configuration de la fenêtre principale
@@ -29,8 +42,37 @@ class VisionCoreApp(ctk.CTk):
         self.original_matrix = None
         self.current_matrix = None
 
+        # Filtres de voisinage répartis sur tous les cœurs (None), 1 pour du séquentiel
+        self.workers = None
+
+        # Analyse (histogramme + statistiques) de l'image affichée et de l'originale
+        self.analysis = None
+        self.original_analysis = None
+
+        # Calculs hors du thread Tk : un worker pour la pleine résolution, un pour les aperçus
+        self.worker = BackgroundWorker(self)
+        self.preview_worker = BackgroundWorker(self)
+        self._head = self._origin = self._proxy = None
+        self._loading = None # Fichier en cours de chargement (aperçu draft encore valable)
+        self._gamma_commit = None
+
+        # Résultats mémoïsés (clé : contenu + opération + paramètres) et historique
+        # annuler / rétablir : chaque étape ne garde que sa clé et sa recette, l'image est
+        # relue dans le cache ou recalculée depuis l'étape parente si elle a été évincée.
+        self.cache = ResultCache()
+
+        # Durée de la dernière opération affichée avec les statistiques. Le profilage
+        # détaillé (méthodes d'ImageProcessor / ImageLoader) reste optionnel :
+        # VISIONCORE_PROFILE=1 python main.py
+        if os.environ.get("VISIONCORE_PROFILE"):
+            Profiler.enable()
+        self.last_timing = None
+        self._history = []
+        self._position = 0
+
         self._create_sidebar()
         self._create_main_area()
+        self.bind("<Map>", self._on_shown, add="+")
 
     def _create_sidebar(self):
         """Crée une barre latérale défilante et organisée."""
@@ -45,6 +87,12 @@ class VisionCoreApp(ctk.CTk):
                       command=self.save_image).pack(pady=5, fill="x")
         ctk.CTkButton(self.file_section, text="Réinitialiser", fg_color="transparent", border_width=1, 
                       command=self.reset_image).pack(pady=5, fill="x")
+        history_frame = ctk.CTkFrame(self.file_section, fg_color="transparent")
+        history_frame.pack(pady=5, fill="x")
+        ctk.CTkButton(history_frame, text="Annuler", width=110, command=self.undo).pack(side="left", expand=True, padx=(0, 2))
+        ctk.CTkButton(history_frame, text="Rétablir", width=110, command=self.redo).pack(side="left", expand=True, padx=(2, 0))
+        self.bind("<Control-z>", lambda event: self.undo())
+        self.bind("<Control-y>", lambda event: self.redo())
 
         # --- SECTION : RÉGLAGES DE BASE ---
         self.basic_section = self._create_section("Réglages de Base")
@@ -67,11 +115,40 @@ class VisionCoreApp(ctk.CTk):
         ctk.CTkButton(self.filter_section, text="Contours (Sobel)", command=self.apply_sobel).pack(pady=5, fill="x")
         ctk.CTkButton(self.filter_section, text="Filtre Médian", command=self.apply_median).pack(pady=5, fill="x")
 
+        self.median_label = ctk.CTkLabel(self.filter_section, text="Taille Médian : 3x3", font=("Arial", 12))
+        self.median_label.pack(pady=(10, 0))
+        # Tailles impaires de 3 à 15 (6 pas de 2)
+        self.median_slider = ctk.CTkSlider(self.filter_section, from_=3, to=15, number_of_steps=6,
+                                           command=self.update_median_size)
+        self.median_slider.set(3)
+        self.median_slider.pack(pady=5, fill="x")
+
         # --- SECTION : SEGMENTATION ---
         self.seg_section = self._create_section("Segmentation & Morpho")
         ctk.CTkButton(self.seg_section, text="Seuillage Otsu", command=self.apply_otsu).pack(pady=5, fill="x")
+        ctk.CTkButton(self.seg_section, text="Otsu 3 Classes", command=self.apply_multiotsu).pack(pady=5, fill="x")
+        ctk.CTkButton(self.seg_section, text="Seuillage Adaptatif (Sauvola)", command=self.apply_adaptive).pack(pady=5, fill="x")
         ctk.CTkButton(self.seg_section, text="Érosion (Nettoyage)", command=lambda: self.apply_morpho("erosion")).pack(pady=5, fill="x")
         ctk.CTkButton(self.seg_section, text="Dilatation (Expansion)", command=lambda: self.apply_morpho("dilatation")).pack(pady=5, fill="x")
+        ctk.CTkButton(self.seg_section, text="Ouverture", command=lambda: self.apply_morpho("opening")).pack(pady=5, fill="x")
+        ctk.CTkButton(self.seg_section, text="Fermeture", command=lambda: self.apply_morpho("closing")).pack(pady=5, fill="x")
+
+        self.morpho_label = ctk.CTkLabel(self.seg_section, text="Élément Structurant : 3x3", font=("Arial", 12))
+        self.morpho_label.pack(pady=(10, 0))
+        # Tailles impaires de 3 à 51 (24 pas de 2)
+        self.morpho_slider = ctk.CTkSlider(self.seg_section, from_=3, to=51, number_of_steps=24,
+                                           command=self.update_morpho_size)
+        self.morpho_slider.set(3)
+        self.morpho_slider.pack(pady=5, fill="x")
+
+        # Nettoyage du masque puis comptage et mesure des objets (composantes 8-connexes)
+        self.area_label = ctk.CTkLabel(self.seg_section, text="Aire Minimale : 16 px", font=("Arial", 12))
+        self.area_label.pack(pady=(10, 0))
+        self.area_slider = ctk.CTkSlider(self.seg_section, from_=0, to=500, number_of_steps=50,
+                                         command=self.update_min_area)
+        self.area_slider.set(16)
+        self.area_slider.pack(pady=5, fill="x")
+        ctk.CTkButton(self.seg_section, text="Compter les Objets", command=self.apply_components).pack(pady=5, fill="x")
 
     def _create_section(self, title):
         """Utilitaire pour créer des sections visuelles dans la sidebar."""
@@ -105,113 +182,347 @@ class VisionCoreApp(ctk.CTk):
                                       font=("Consolas", 12), padx=15, pady=15)
         self.stats_label.grid(row=0, column=0, sticky="nsew")
 
-        # Sous-zone Histogramme
-        self.fig = Figure(figsize=(4, 1.5), dpi=80, facecolor='#2b2b2b')
-        self.ax = self.fig.add_subplot(111)
-        self.ax.set_facecolor('#2b2b2b')
-        self.ax.tick_params(colors='white', labelsize=7)
-        
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.analysis_frame)
-        self.canvas.get_tk_widget().grid(row=0, column=1, sticky="nsew", padx=10, pady=5)
+        # Sous-zone Histogramme (matplotlib chargé au premier affichage)
+        self.histogram = HistogramView(self.analysis_frame, row=0, column=1, sticky="nsew", padx=10, pady=5)
 
-    # --- LOGIQUE DE TRAITEMENT ---
+    def _on_shown(self, event):
+        """Première apparition de la fenêtre : mesure du démarrage, préchargement de matplotlib."""
+        if event.widget is not self or self.startup_seconds is not None:
+            return
+        self.startup_seconds = time.perf_counter() - self._started
+        logger.info("Fenêtre affichée en %.0f ms", self.startup_seconds * 1e3)
+        self.stats_label.configure(text=f"Stats : --\nDÉMARRAGE  : {self.startup_seconds * 1e3:.0f} ms")
+        HistogramView.preload()
 
-    def display_image(self, matrix: np.ndarray):
-        """Affiche la matrice et met à jour les analyses."""
-        image_pil = Image.fromarray(matrix)
-        
-        # Redimensionnement dynamique
+    # --- LOGIQUE DE TRAITEMENT ---
+    # Les calculs tournent sur les workers (ui/worker.py). L'état de la chaîne de
+    # traitement (_head : image, analyse et clé de cache en entrée de la prochaine
+    # opération, _origin, _proxy, _history) n'est lu et modifié que par les tâches,
+    # exécutées dans l'ordre :
+    # plusieurs clics rapides s'enchaînent correctement. Les attributs current_* et
+    # original_* sont ceux affichés, mis à jour sur le thread Tk à l'arrivée des résultats.
+
+    def _viewport(self) -> tuple:
+        """Taille de la zone d'affichage (lue sur le thread Tk)."""
         w, h = self.image_label.winfo_width(), self.image_label.winfo_height()
         if w < 100: w, h = 800, 500 # Valeurs par défaut au démarrage
-        
-        image_pil.thumbnail((w, h), Image.Resampling.LANCZOS)
+        return w, h
+
+    @staticmethod
+    def _render(matrix: np.ndarray, analysis: dict, viewport: tuple, committed: bool = True) -> dict:
+        """Prépare l'affichage hors du thread Tk : analyse et vignette à la taille de la zone."""
+        if analysis is None:
+            analysis = ImageStats.compute(matrix)
+        image_pil = Image.fromarray(matrix)
+        # reducing_gap : réduction entière rapide avant le LANCZOS final
+        image_pil.thumbnail(viewport, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return {"matrix": matrix if committed else None, "analysis": analysis, "image": image_pil}
+
+    def _run(self, compute, key=None, step=None, label=None):
+        """
+        Soumet compute() -> (matrice, analysis, clé) ; le résultat devient la nouvelle tête
+        de chaîne et, si `step` (recette de l'étape) est fourni, une entrée de l'historique.
+        """
+        viewport = self._viewport()
+        label = label or (step["name"] if step is not None and step["name"] else "reset")
+
+        def job():
+            start = time.perf_counter()
+            with Profiler.operation(f"VisionCoreApp.{label}"):
+                matrix, analysis, result_key = compute()
+            seconds = time.perf_counter() - start
+            self._head = (matrix, analysis, result_key)
+            if step is not None:
+                self._record(dict(step, key=result_key))
+            rendered = self._render(matrix, analysis, viewport)
+            rendered["timing"] = (label, seconds)
+            return rendered
+
+        self.worker.submit(job, on_done=self.show_result, on_error=self.show_error, key=key)
+
+    def _run_operation(self, name: str, *args, **kwargs):
+        """Opération d'ImageProcessor en pleine résolution sur la tête de chaîne (mémoïsée)."""
+        if self.original_matrix is None:
+            return
+
+        def compute():
+            matrix, result_key = self.cache.run(name, self._head[0], *args, key=self._head[2], **kwargs)
+            return matrix, None, result_key
+
+        self._run(compute, step=dict(name=name, args=args, kwargs=kwargs, from_original=False))
+
+    def _point_lut(self, name: str, args: tuple, source: tuple):
+        """LUT de la transformation ponctuelle, construite sur l'histogramme déjà connu."""
+        build, _ = Pipeline.POINT_OPERATIONS[name]
+        return build(source[1]["histogram"], *args)
+
+    def apply_point_operation(self, name: str, *args, from_original: bool = False):
+        """
+        Transformation ponctuelle par LUT : la LUT est construite sur l'histogramme déjà
+        connu et l'analyse du résultat s'en déduit, sans relire l'image.
+        """
+        if self.original_matrix is None:
+            return
+
+        def compute():
+            source = self._origin if from_original else self._head
+            if source[0].dtype != np.uint8:
+                matrix, result_key = self.cache.run(name, source[0], *args, key=source[2])
+                return matrix, None, result_key
+            lut = self._point_lut(name, args, source)
+            result_key = ResultCache.key(source[2], name, *args)
+            matrix = self.cache.get(result_key)
+            if matrix is None:
+                matrix = self.cache.put(result_key, lut[source[0]])
+            return matrix, ImageStats.update(source[1], lut), result_key
+
+        # Une transformation depuis l'originale remplace la précédente (ex. gamma) : coalescence
+        self._run(compute, key=name if from_original else None,
+                  step=dict(name=name, args=args, kwargs={}, from_original=from_original))
+
+    def preview_point_operation(self, name: str, *args):
+        """
+        Aperçu immédiat sur le proxy basse résolution de l'originale (taille de la zone
+        d'affichage). Les statistiques restent exactes : elles se déduisent de l'analyse
+        pleine résolution et de la LUT.
+        """
+        if self.original_matrix is None:
+            return
+        viewport = self._viewport()
+
+        def job():
+            lut = self._point_lut(name, args, self._origin)
+            return self._render(lut[self._proxy], ImageStats.update(self._origin[1], lut), viewport,
+                                committed=False)
+
+        self.preview_worker.submit(job, on_done=self.show_result, on_error=self.show_error, key="preview")
+
+    def show_result(self, rendered: dict):
+        """Publie un résultat (thread Tk)."""
+        if rendered["matrix"] is not None:
+            self.current_matrix = rendered["matrix"]
+        if "timing" in rendered:
+            self.last_timing = rendered["timing"]
+        image_pil = rendered["image"]
         tk_image = ctk.CTkImage(light_image=image_pil, dark_image=image_pil, size=image_pil.size)
-        
         self.image_label.configure(image=tk_image, text="")
-        self.update_analysis()
+        self.update_analysis(rendered["analysis"])
 
-    def update_analysis(self):
-        """Met à jour l'histogramme et les chiffres clés."""
+    def show_error(self, error: Exception):
+        messagebox.showerror("VisionCore", str(error))
+
+    def update_analysis(self, analysis: dict = None):
+        """Met à jour l'histogramme et les chiffres clés (une seule lecture de l'image)."""
         if self.current_matrix is not None:
+            if analysis is None:
+                analysis = ImageStats.compute(self.current_matrix)
+            self.analysis = analysis
+
             # 1. Histogramme
-            hist = ImageProcessor.get_histogram(self.current_matrix)
-            self.ax.clear()
-            self.ax.bar(range(256), hist, width=1.0, color='#1f538d')
-            self.ax.set_xlim([0, 255])
-            self.ax.get_yaxis().set_visible(False)
-            self.canvas.draw()
+            self.histogram.update(analysis["histogram"])
 
             # 2. Statistiques
-            stats = ImageProcessor.get_stats(self.current_matrix)
+            stats = analysis
+            cache = self.cache.stats()
             txt = (f"DIMENSIONS : {stats['dimensions'][1]}x{stats['dimensions'][0]}\n"
                    f"LUMINANCE  : {stats['moyenne_luminance']:.2f}\n"
                    f"CONTRASTE  : {stats['std_dev']:.2f}\n"
-                   f"MIN / MAX  : {stats['min_val']} / {stats['max_val']}")
+                   f"MIN / MAX  : {stats['min_val']} / {stats['max_val']}\n"
+                   f"ENTROPIE   : {stats['entropy']:.2f} bits\n"
+                   f"SEUIL OTSU : {stats['otsu_threshold']}\n"
+                   f"CACHE      : {cache['hits']} succès / {cache['misses']} échecs / {cache['evictions']} évictions")
+            if "regions" in stats:
+                regions = stats["regions"]
+                mean_area = regions["area"].mean() if regions["count"] else 0
+                txt += f"\nOBJETS     : {regions['count']} (aire moy. {mean_area:.0f} px)"
+                if regions["count"] and "mean_intensity" in regions:
+                    txt += f"\nINTENSITÉ  : {regions['mean_intensity'].mean():.1f} (moy. objets)"
+            if self.last_timing is not None:
+                name, seconds = self.last_timing
+                txt += f"\nDERNIÈRE OP: {name} ({seconds * 1e3:.1f} ms)"
+            if self.histogram.last_seconds is not None:
+                txt += f"\nHISTOGRAMME: {self.histogram.last_seconds * 1e3:.1f} ms"
             self.stats_label.configure(text=txt)
 
+    # --- HISTORIQUE (tâches du worker) ---
+
+    def _record(self, step: dict):
+        """Ajoute une étape après la position courante (l'historique rétablissable est abandonné)."""
+        del self._history[self._position + 1:]
+        top = self._history[-1]
+        if step["from_original"] and step["name"] is not None and top["name"] == step["name"] and top["from_original"]:
+            # Réglages successifs du même curseur : une seule étape à annuler
+            self._history[-1] = step
+        else:
+            self._history.append(step)
+        self._position = len(self._history) - 1
+
+    def _materialize(self, index: int) -> tuple:
+        """(matrice, clé) de l'étape : lue dans le cache, sinon recalculée depuis sa parente."""
+        step = self._history[index]
+        if step["name"] is None:
+            return self._origin[0], self._origin[2]
+        matrix = self.cache.get(step["key"])
+        if matrix is not None:
+            return matrix, step["key"]
+        if step["from_original"]:
+            parent, parent_key = self._origin[0], self._origin[2]
+        else:
+            parent, parent_key = self._materialize(index - 1)
+        return self.cache.run(step["name"], parent, *step["args"], key=parent_key, **step["kwargs"])
+
+    def _move_history(self, offset: int):
+        if self.original_matrix is None:
+            return
+
+        def compute():
+            self._position = min(max(self._position + offset, 0), len(self._history) - 1)
+            matrix, result_key = self._materialize(self._position)
+            return matrix, None, result_key
+
+        self._run(compute, label="undo" if offset < 0 else "redo")
+
+    def undo(self):
+        self._move_history(-1)
+
+    def redo(self):
+        self._move_history(1)
+
     # --- CALLBACKS DES BOUTONS ---
 
     def load_image(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Images", "*.jpg;*.jpeg;*.png;*.bmp;*.pgm")])
+        file_path = filedialog.askopenfilename(filetypes=[("Images", "*.jpg;*.jpeg;*.png;*.bmp;*.pgm;*.ppm;*.npy")])
         if file_path:
-            self.current_matrix = ImageLoader.load(file_path)
-            self.original_matrix = self.current_matrix.copy()
+            self.worker.cancel()
+            self.preview_worker.cancel()
             self.gamma_slider.set(1.0)
-            self.display_image(self.current_matrix)
+            viewport = self._viewport()
+            self._loading = file_path
+
+            # Aperçu immédiat : décodage réduit (JPEG en mode draft), remplacé par le chargement complet
+            def preview():
+                thumbnail = ImageLoader.load(file_path, target_size=viewport, writable=False)
+                return self._render(thumbnail, None, viewport, committed=False)
+
+            def on_preview(rendered):
+                if self._loading == file_path:
+                    self.show_result(rendered)
+
+            self.preview_worker.submit(preview, on_done=on_preview, on_error=lambda e: None, key="preview")
+
+            def job():
+                matrix = ImageLoader.load(file_path)
+                analysis = ImageStats.compute(matrix)
+                proxy = Image.fromarray(matrix)
+                proxy.thumbnail(viewport, Image.Resampling.LANCZOS, reducing_gap=2.0)
+                self._origin = self._head = (matrix, analysis, ResultCache.fingerprint(matrix))
+                self._proxy = np.asarray(proxy)
+                self._history = [dict(key=self._origin[2], name=None, args=(), kwargs={}, from_original=True)]
+                self._position = 0
+                return self._render(matrix, analysis, viewport)
+
+            def on_done(rendered):
+                self._loading = None
+                self.original_matrix = rendered["matrix"]
+                self.original_analysis = rendered["analysis"]
+                self.show_result(rendered)
+
+            def on_error(error):
+                self._loading = None
+                self.show_error(error)
+
+            self.worker.submit(job, on_done=on_done, on_error=on_error)
 
     def save_image(self):
         if self.current_matrix is not None:
             file_path = filedialog.asksaveasfilename(defaultextension=".png")
-            if file_path: ImageLoader.save(self.current_matrix, file_path)
+            if file_path:
+                try:
+                    ImageLoader.save(self.current_matrix, file_path)
+                except ValueError as e:
+                    messagebox.showerror("Sauvegarde", str(e))
 
     def apply_inverse(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.inverse(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self.apply_point_operation("inverse")
 
     def update_gamma(self, value):
         self.gamma_label.configure(text=f"Correction Gamma : {value:.1f}")
-        if self.original_matrix is not None:
-            self.current_matrix = ImageProcessor.apply_gamma(self.original_matrix, value)
-            self.display_image(self.current_matrix)
+        # Aperçu à chaque mouvement ; rendu pleine résolution une fois le curseur immobile
+        self.preview_point_operation("apply_gamma", value)
+        if self._gamma_commit is not None:
+            self.after_cancel(self._gamma_commit)
+        self._gamma_commit = self.after(self.COMMIT_DELAY_MS, self._commit_gamma)
+
+    def _commit_gamma(self):
+        self._gamma_commit = None
+        self.preview_worker.cancel("preview")
+        self.apply_point_operation("apply_gamma", self.gamma_slider.get(), from_original=True)
 
     def apply_stretch(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.stretch_contrast(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self.apply_point_operation("stretch_contrast")
 
     def apply_equalization(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.equalize_histogram(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self.apply_point_operation("equalize_histogram")
 
     def apply_blur(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.blur_gaussian(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self._run_operation("blur_gaussian", workers=self.workers)
 
     def apply_sobel(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.detect_edges_sobel(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self._run_operation("detect_edges_sobel", workers=self.workers)
 
     def reset_image(self):
         if self.original_matrix is not None:
-            self.current_matrix = self.original_matrix.copy()
+            if self._gamma_commit is not None:
+                self.after_cancel(self._gamma_commit)
+                self._gamma_commit = None
+            self.preview_worker.cancel()
             self.gamma_slider.set(1.0)
-            self.display_image(self.current_matrix)
+            self._run(lambda: self._origin, step=dict(name=None, args=(), kwargs={}, from_original=True))
+
+    def update_median_size(self, value):
+        size = int(round(value))
+        self.median_label.configure(text=f"Taille Médian : {size}x{size}")
 
     def apply_median(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.filter_median(self.current_matrix)
-            self.display_image(self.current_matrix)
+        size = int(round(self.median_slider.get()))
+        self._run_operation("filter_median", size, workers=self.workers)
 
     def apply_otsu(self):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.threshold_otsu(self.current_matrix)
-            self.display_image(self.current_matrix)
+        self.apply_point_operation("threshold_otsu")
+
+    def apply_multiotsu(self):
+        self.apply_point_operation("threshold_multiotsu", 3)
+
+    def apply_adaptive(self):
+        # Fenêtre de l'ordre d'un caractère de texte numérisé ; coût indépendant de sa taille
+        self._run_operation("threshold_adaptive", "sauvola", 31)
+
+    def update_morpho_size(self, value):
+        size = int(round(value))
+        self.morpho_label.configure(text=f"Élément Structurant : {size}x{size}")
 
     def apply_morpho(self, mode):
-        if self.current_matrix is not None:
-            self.current_matrix = ImageProcessor.morpho_operation(self.current_matrix, mode)
-            self.display_image(self.current_matrix)
\ No newline at end of file
+        size = int(round(self.morpho_slider.get()))
+        self._run_operation("morpho_operation", mode, size, workers=self.workers)
+
+    def update_min_area(self, value):
+        self.area_label.configure(text=f"Aire Minimale : {int(round(value))} px")
+
+    def apply_components(self):
+        """Supprime les objets trop petits du masque courant puis les compte et les mesure."""
+        if self.original_matrix is None:
+            return
+        min_area = int(round(self.area_slider.get()))
+        intensity = self.original_matrix
+
+        def compute():
+            matrix, result_key = self.cache.run("remove_small_components", self._head[0], min_area,
+                                                key=self._head[2])
+            analysis = ImageStats.compute(matrix)
+            # Intensité moyenne des objets lue dans l'image d'origine
+            analysis["regions"] = ImageProcessor.region_stats(
+                matrix, intensity if intensity.shape == matrix.shape else None)
+            return matrix, analysis, result_key
+
+        self._run(compute, step=dict(name="remove_small_components", args=(min_area,), kwargs={},
+                                     from_original=False))
@@ -0,0 +1,93 @@
+import collections
+import threading
+import time
+
+import numpy as np
+
+from core.profiling import Profiler
+
+class HistogramView:
+    """
+    Histogramme 256 niveaux du panneau d'analyse.
+
+    Les artistes sont créés une seule fois (un unique StepPatch `ax.stairs`, axes fixes) ;
+    une mise à jour ne change que ses données, normalisées sur [0, 1] pour ne jamais
+    toucher aux limites des axes, puis redessine ce seul artiste par-dessus le fond
+    mémorisé (blitting). Un histogramme identique au précédent ne provoque aucun rendu.
+
+    matplotlib n'est importé qu'au premier affichage (ou par preload() en arrière-plan
+    une fois la fenêtre visible) : il ne pèse pas sur le démarrage.
+    """
+
+    BACKGROUND = '#2b2b2b'
+    COLOR = '#1f538d'
+
+    # Durées de rendu conservées (les plus récentes)
+    SAMPLES = 256
+
+    def __init__(self, master, **grid):
+        self.master = master
+        self.grid = grid
+        self.figure = self.ax = self.canvas = None
+        self._stairs = None
+        self._background = None
+        self._last = None
+        self.timings = collections.deque(maxlen=HistogramView.SAMPLES)
+        self.last_seconds = None
+        self.skipped = 0
+
+    @staticmethod
+    def preload():
+        """Importe matplotlib et son backend Tk dans un thread (aucun appel Tk)."""
+        def load():
+            import matplotlib.figure # noqa: F401
+            import matplotlib.backends.backend_tkagg # noqa: F401
+        threading.Thread(target=load, daemon=True).start()
+
+    def update(self, hist: np.ndarray) -> bool:
+        """Affiche l'histogramme (thread Tk). Renvoie False si rien n'a changé."""
+        hist = np.asarray(hist)
+        if self._last is not None and np.array_equal(hist, self._last):
+            self.skipped += 1
+            return False
+
+        with Profiler.operation("HistogramView.update"):
+            start = time.perf_counter()
+            if self.canvas is None:
+                self._build()
+            peak = hist.max(initial=0)
+            self._stairs.set_data(hist / peak if peak else np.zeros(256))
+            if self._background is None:
+                self.canvas.draw() # Premier rendu : _on_draw mémorise le fond
+            else:
+                self.canvas.restore_region(self._background)
+                self.ax.draw_artist(self._stairs)
+                self.canvas.blit(self.ax.bbox)
+            self.last_seconds = time.perf_counter() - start
+        self.timings.append(self.last_seconds)
+        self._last = hist.copy()
+        return True
+
+    def _build(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.figure = Figure(figsize=(4, 1.5), dpi=80, facecolor=HistogramView.BACKGROUND)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_facecolor(HistogramView.BACKGROUND)
+        self.ax.tick_params(colors='white', labelsize=7)
+        self.ax.set_xlim([0, 255])
+        self.ax.set_ylim([0, 1.05])
+        self.ax.get_yaxis().set_visible(False)
+        # Une marche par niveau, centrée sur l'entier (comme les barres de largeur 1)
+        self._stairs = self.ax.stairs(np.zeros(256), np.arange(257) - 0.5, fill=True,
+                                      color=HistogramView.COLOR, animated=True)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.master)
+        self.canvas.get_tk_widget().grid(**self.grid)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        """Rendu complet (premier affichage, redimensionnement) : nouveau fond pour le blitting."""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._stairs)
@@ -0,0 +1,110 @@
+import collections
+import queue
+import threading
+
+class _Job:
+    """Une tâche soumise au worker : fonction à exécuter et callbacks de retour."""
+
+    def __init__(self, func, on_done, on_error, key):
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.key = key
+        self.cancelled = False
+
+class BackgroundWorker:
+    """
+    Exécute les traitements hors du thread Tk, dans l'ordre de soumission.
+    Les résultats reviennent au thread de l'interface par after() : les callbacks
+    on_done / on_error y sont appelés, jamais depuis le thread de calcul.
+
+    Une clé (key) regroupe les tâches interchangeables (ex. les aperçus d'un curseur) :
+    soumettre une tâche annule celles de même clé encore en attente, et le résultat
+    d'une tâche de même clé déjà en cours est ignoré à son arrivée. Un calcul NumPy
+    en cours ne peut pas être interrompu : seule sa publication est annulée.
+    """
+
+    # Période de relève des résultats (ms), uniquement tant que des tâches sont en vol
+    POLL_MS = 15
+
+    def __init__(self, widget):
+        self._widget = widget
+        self._jobs = collections.deque()
+        self._condition = threading.Condition()
+        self._results = queue.Queue()
+        self._running = None
+        self._in_flight = 0
+        self._polling = False
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    @property
+    def busy(self) -> bool:
+        """Vrai tant qu'une tâche est en attente, en cours ou non encore publiée."""
+        return self._in_flight > 0
+
+    def submit(self, func, on_done=None, on_error=None, key=None) -> _Job:
+        """Planifie func() ; on_done(résultat) ou on_error(exception) sur le thread Tk."""
+        job = _Job(func, on_done, on_error, key)
+        with self._condition:
+            if key is not None:
+                self._cancel_locked(key)
+            self._jobs.append(job)
+            self._in_flight += 1
+            self._condition.notify()
+        if not self._polling:
+            self._polling = True
+            self._widget.after(self.POLL_MS, self._poll)
+        return job
+
+    def cancel(self, key=None):
+        """Annule les tâches de cette clé (toutes si None), en attente ou en cours."""
+        with self._condition:
+            self._cancel_locked(key)
+
+    def _cancel_locked(self, key):
+        for job in self._jobs:
+            if key is None or job.key == key:
+                job.cancelled = True
+        if self._running is not None and (key is None or self._running.key == key):
+            self._running.cancelled = True
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                job = self._jobs.popleft()
+                self._running = job
+            result, error = None, None
+            if not job.cancelled:
+                try:
+                    result = job.func()
+                except Exception as e:
+                    error = e
+            with self._condition:
+                self._running = None
+            self._results.put((job, result, error))
+
+    def _poll(self):
+        """Publie les résultats arrivés (thread Tk), puis se replanifie s'il en reste à venir."""
+        try:
+            while True:
+                try:
+                    job, result, error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._in_flight -= 1
+                if job.cancelled:
+                    continue
+                if error is not None:
+                    if job.on_error is None:
+                        raise error
+                    job.on_error(error)
+                elif job.on_done is not None:
+                    job.on_done(result)
+        finally:
+            # Replanifié même si un callback échoue : les tâches suivantes restent publiées
+            if self._in_flight > 0:
+                self._widget.after(self.POLL_MS, self._poll)
+            else:
+                self._polling = False